@@ -0,0 +1,148 @@
+"""
+Orchestrator 동작 확인 (카메라/센서/모델 없이 가짜 소스와 핸들러로 실행).
+
+- 상태 전환 취소: STOPPED 추론이 도는 중에 MOVING 으로 바뀌면 그 결과는 출력되지 않고(cancelled),
+  MOVING 첫 결과는 느린 STOPPED 추론을 기다리지 않고 바로 나오는지
+- 최신 우선: 추론보다 캡처가 빠르면 밀린 프레임은 버려지고(dropped_frames) 지연이 쌓이지 않는지
+- 나이 초과: 핸들러가 FramePolicy 로 낡은 프레임을 None 으로 버리면 출력되지 않고 버림으로 집계되는지
+- 캡처 시각: 소스가 (프레임, 캡처 시각) 을 내면 받은 시각이 아니라 그 시각이 Packet/Result 에 실리는지
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/async_pipeline_test.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common.async_pipeline import Orchestrator
+from src.common.frame_policy import FramePolicy
+
+# ==========================================
+# [설정]
+# ==========================================
+FRAME_SHAPE = (48, 64, 3)
+SLOW_STOPPED_S = 0.4     # 상태 전환 시점에 진행 중일 STOPPED 추론 시간
+SWITCH_AT_S = 0.2
+FAST_HANDLER_S = 0.005
+BUSY_HANDLER_S = 0.03    # 최신 우선 확인용 (캡처 200 FPS 보다 느림)
+SENSOR_DELAY_S = 0.2     # 센서 노출 ~ 프레임 수신 지연 흉내
+
+
+def fake_frames(fps):
+    """ 일정 속도로 작은 프레임을 내는 블로킹 소스 """
+    interval = 1.0 / fps
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    while True:
+        time.sleep(interval)
+        yield frame
+
+
+def stamped_frames(fps, delay):
+    """ camera_input.get_frame_stamped 처럼 (프레임, 캡처 시각) 을 내고, 캡처 시각은 delay 만큼 과거 """
+    for frame in fake_frames(fps):
+        yield frame, time.monotonic() - delay
+
+
+def sleeper(seconds, tag):
+    def handler(packet, epoch):
+        time.sleep(seconds)
+        return tag, packet.seq
+    return handler
+
+
+def switch_after(seconds, before_moving, after_moving):
+    start = time.monotonic()
+    return lambda: after_moving if time.monotonic() - start >= seconds else before_moving
+
+
+def check_cancel_on_switch():
+    results = []
+    orch = Orchestrator(
+        frames=fake_frames(60),
+        motion=switch_after(SWITCH_AT_S, False, True),   # STOPPED -> MOVING
+        handlers={"STOPPED": sleeper(SLOW_STOPPED_S, "STOPPED"), "MOVING": sleeper(FAST_HANDLER_S, "MOVING")},
+        sinks=[results.append],
+    )
+    stats = asyncio.run(orch.run(duration=1.0))
+    states = [r.state for r in results]
+    assert "STOPPED" not in states, f"전환 후 STOPPED 결과가 출력됨: {states[:5]}"
+    assert states and set(states) == {"MOVING"}, states
+    assert stats["cancelled"] >= 1, stats
+    assert all(r.epoch == orch.epoch for r in results), [r.epoch for r in results]
+    transition = stats["transition_ms"]["p50"]
+    assert transition < SLOW_STOPPED_S * 1000 / 2, f"MOVING 첫 결과가 STOPPED 추론을 기다림 ({transition:.0f} ms)"
+    print(f"[OK] cancel on switch: cancelled {stats['cancelled']}, {len(results)} MOVING results, "
+          f"transition {transition:.1f} ms")
+
+
+def check_latest_wins():
+    seqs = []
+    orch = Orchestrator(
+        frames=fake_frames(200),
+        motion=lambda: True,
+        handlers={"MOVING": sleeper(BUSY_HANDLER_S, "MOVING"), "STOPPED": sleeper(FAST_HANDLER_S, "STOPPED")},
+        sinks=[lambda r: seqs.append(r.seq)],
+    )
+    stats = asyncio.run(orch.run(duration=1.0))
+    assert stats["dropped_frames"] > 0, stats
+    assert seqs == sorted(seqs) and max(np.diff(seqs)) > 1, seqs[:10]
+    p95 = stats["states"]["MOVING"]["result_latency_ms"]["p95"]
+    # 밀린 프레임이 쌓였다면 지연이 실행 시간만큼 계속 늘어남
+    assert p95 < BUSY_HANDLER_S * 1000 * 3, f"지연이 쌓임: p95 {p95:.1f} ms"
+    print(f"[OK] latest wins: captured {stats['captured_frames']}, dropped {stats['dropped_frames']}, "
+          f"result p95 {p95:.1f} ms")
+
+
+def check_stale_drop():
+    policy = FramePolicy(max_age_s={"STOPPED/tilt": BUSY_HANDLER_S / 2})
+    results = []
+
+    def handler(packet, epoch):
+        time.sleep(BUSY_HANDLER_S)   # 추론이 최대 나이보다 오래 걸림
+        if not policy.fresh("STOPPED/tilt", packet.t_capture):
+            return None
+        return "STOPPED", packet.seq
+
+    orch = Orchestrator(
+        frames=fake_frames(60),
+        motion=lambda: False,
+        handlers={"STOPPED": handler, "MOVING": sleeper(FAST_HANDLER_S, "MOVING")},
+        sinks=[results.append],
+    )
+    asyncio.run(orch.run(duration=0.5))
+    counts = policy.snapshot()["stages"]["STOPPED/tilt"]
+    assert not results, f"낡은 프레임이 출력됨: {len(results)}"
+    assert counts["dropped"] > 0 and counts["passed"] == 0, counts
+    print(f"[OK] stale drop: {counts['dropped']} frames dropped at STOPPED/tilt, none output")
+
+
+def check_source_timestamp():
+    latencies = []
+    orch = Orchestrator(
+        frames=stamped_frames(60, SENSOR_DELAY_S),
+        motion=lambda: True,
+        handlers={"MOVING": sleeper(FAST_HANDLER_S, "MOVING"), "STOPPED": sleeper(FAST_HANDLER_S, "STOPPED")},
+        sinks=[lambda r: latencies.append(r.t_result - r.t_capture)],
+    )
+    asyncio.run(orch.run(duration=0.5))
+    assert latencies, "결과가 없음"
+    assert min(latencies) >= SENSOR_DELAY_S, f"소스의 캡처 시각이 아니라 받은 시각을 씀: {min(latencies) * 1000:.1f} ms"
+    print(f"[OK] source timestamp: result latency min {min(latencies) * 1000:.1f} ms "
+          f"(includes {SENSOR_DELAY_S * 1000:.0f} ms sensor delay)")
+
+
+def main():
+    check_cancel_on_switch()
+    check_latest_wins()
+    check_stale_drop()
+    check_source_timestamp()
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+YOLOE 클래스 프로필별 추론 속도 / 검출 수 비교.
+
+같은 프레임을 프로필마다 run_inference 로 돌려 프레임당 지연(ms)과 검출 수를 측정.
+'all' 프로필 결과 중 비교 대상 프로필에 없는 클래스로 잡힌 검출은
+해당 현장에서는 오검출이므로 'pruned' 로 따로 집계함.
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/class_profile_benchmark.py --data data/testData --profiles all boxes_pallets boxes_only
+    CARGO_BACKEND=onnx python TestCodes/class_profile_benchmark.py
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.models.yoloe_loader import load_yoloe_model, load_class_profile, to_canonical
+from src.common.recorded_frames import iter_frames
+from src.detection.object_detection import run_inference
+
+# ==========================================
+# [설정]
+# ==========================================
+FRAMES = 100
+WARMUP = 5
+SYNTHETIC_SHAPE = (1232, 1640, 3)
+
+
+def bench_profile(profile, frames):
+    model = load_yoloe_model(profile=profile)
+    for frame in frames[:WARMUP]:
+        run_inference(model, frame, 0)
+
+    times, detections = [], []
+    for i, frame in enumerate(frames):
+        t0 = time.perf_counter()
+        result = run_inference(model, frame, i)
+        times.append((time.perf_counter() - t0) * 1000)
+        detections.append(to_canonical(model, result.boxes.cls.cpu().numpy().astype(int)))
+    return np.array(times), detections
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="YOLOE class profile benchmark")
+    parser.add_argument("--data", default="data/testData", help="이미지 폴더 / 영상 / .npy·.npz (없으면 랜덤 프레임)")
+    parser.add_argument("--profiles", nargs="+", default=["all", "boxes_pallets", "boxes_only"])
+    parser.add_argument("--frames", type=int, default=FRAMES)
+    args = parser.parse_args()
+
+    frames = list(iter_frames(args.data, args.frames)) if os.path.exists(args.data) else []
+    if not frames:
+        print("[Bench] 녹화 프레임이 없어 랜덤 프레임으로 속도만 측정합니다 (검출 수는 의미 없음).")
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, SYNTHETIC_SHAPE, dtype=np.uint8) for _ in range(args.frames)]
+
+    results = {p: bench_profile(p, frames) for p in args.profiles}
+    base_times, base_dets = results.get("all", (None, None))
+
+    print(f"\n{'profile':<16}{'classes':>8}{'mean ms':>10}{'p95 ms':>10}{'speedup':>9}{'det/frame':>11}{'pruned':>8}")
+    for profile, (times, dets) in results.items():
+        _, class_ids = load_class_profile(profile)
+        speedup = f"{base_times.mean() / times.mean():.2f}x" if base_times is not None else "-"
+        # 'all' 결과 중 이 프로필에 없는 클래스 검출 수 (= 프로필 적용 시 사라지는 오검출)
+        pruned = "-"
+        if base_dets is not None:
+            pruned = sum(int(np.count_nonzero(~np.isin(d, class_ids))) for d in base_dets)
+        print(f"{profile:<16}{len(class_ids):>8}{times.mean():>10.1f}{np.percentile(times, 95):>10.1f}"
+              f"{speedup:>9}{np.mean([len(d) for d in dets]):>11.2f}{pruned:>8}")
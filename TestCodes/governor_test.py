@@ -0,0 +1,73 @@
+"""
+Governor 확인 (가짜 sysfs 트리로 실행, Pi 없이 가능).
+
+- 한가한 CPU: 50°C, 클럭 40% (ondemand 유휴) 이면 단계가 올라가지 않는지
+- 과거 스로틀 기록(get_throttled 16~19 비트)만 있으면 무시하는지, get_throttled 가 없는 커널에서도 같은지
+- 펌웨어 스로틀(온도는 정상): STOPPED 쪽 단계만 올리고 MOVING 간격은 그대로인지, 풀리면 0 단계로 복구되는지
+- 고온: 마지막 단계(MOVING 간격 조정)까지 갈 수 있고, 식으면 0 단계로 복구되는지
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/governor_test.py
+"""
+import os
+import sys
+import tempfile
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common.governor import Governor, SysfsSensors, LEVELS, LOAD_MAX_LEVEL, THROTTLED_PATH, _write_fake_sysfs
+
+
+def run(root, gov, seconds, start, temp_c, ratio, throttled_bits=0, remove_throttled=False):
+    """ 1초 간격으로 같은 센서 값을 주고 update. 지나간 최대 단계와 마지막 시각 반환 """
+    _write_fake_sysfs(root, temp_c, ratio, throttled_bits=throttled_bits)
+    if remove_throttled:
+        os.remove(os.path.join(root, THROTTLED_PATH))
+    peak = gov.level
+    for t in range(start, start + seconds):
+        gov.update(now=float(t))
+        peak = max(peak, gov.level)
+    return peak, start + seconds
+
+
+def check_idle_clock():
+    for bits, remove, tag in ((0, False, "get_throttled=0"), (0x50000, False, "sticky bits only"),
+                              (0, True, "no get_throttled")):
+        with tempfile.TemporaryDirectory() as root:
+            gov = Governor(SysfsSensors(root))
+            peak, _ = run(root, gov, 600, 0, 50.0, 0.4, bits, remove)
+            assert peak == 0, f"{tag}: 유휴 클럭으로 단계가 {peak} 까지 올라감"
+            assert gov.throttled in ((None,) if remove else (False,)), gov.throttled
+        print(f"[OK] idle clock 40% at 50°C ({tag}) -> level 0")
+
+
+def check_firmware_throttle():
+    with tempfile.TemporaryDirectory() as root:
+        gov = Governor(SysfsSensors(root))
+        peak, t = run(root, gov, 300, 0, 60.0, 0.6, throttled_bits=0x6)
+        assert 0 < peak <= LOAD_MAX_LEVEL, peak
+        assert gov.knobs.moving_interval == LEVELS[0].moving_interval, gov.knobs
+        _, t = run(root, gov, 600, t, 50.0, 0.4, throttled_bits=0x60000)
+        assert gov.level == 0, f"스로틀이 풀렸는데 단계 {gov.level} 에서 복구되지 않음"
+    print(f"[OK] firmware throttle at 60°C -> up to level {peak} (MOVING untouched), recovered to 0")
+
+
+def check_hot():
+    with tempfile.TemporaryDirectory() as root:
+        gov = Governor(SysfsSensors(root))
+        peak, t = run(root, gov, 300, 0, 85.0, 0.75, throttled_bits=0xE)
+        assert peak == len(LEVELS) - 1, peak
+        _, t = run(root, gov, 600, t, 55.0, 0.5)
+        assert gov.level == 0, gov.level
+    print(f"[OK] 85°C + throttled -> level {peak}, cooled to 55°C -> level 0")
+
+
+def main():
+    check_idle_clock()
+    check_firmware_throttle()
+    check_hot()
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
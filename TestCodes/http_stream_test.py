@@ -0,0 +1,168 @@
+"""
+StatusServer 로컬 확인 (카메라/모델 없이 127.0.0.1 빈 포트로 실행).
+
+- /status.json : update_status 로 넣은 값이 JSON 으로 나오는지
+- /snapshot.jpg: 슬롯에 오래된 프레임만 있으면 그것을 주지 않고 새 프레임을 기다리는지, 없으면 503
+- /stream.mjpg : 접속 전에 있던 프레임이 아니라 접속 후 publish 된 프레임부터 오는지
+- /metrics     : 다른 프로세스 스냅샷(REGISTRY.merge)이 합쳐지는지 (카운터/히스토그램은 합, 게이지는 로컬 우선)
+
+프레임 색(B 채널)에 번호를 넣어 어떤 프레임을 받았는지 구분함.
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/http_stream_test.py
+"""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import cv2
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.common.frame_slot import FrameSlot
+from src.common.http_stream import StatusServer, BOUNDARY
+from src.common import metrics
+
+# ==========================================
+# [설정]
+# ==========================================
+SNAPSHOT_MAX_AGE_S = 0.3
+PUBLISH_INTERVAL_S = 0.05
+TIMEOUT_S = 5.0
+
+
+def make_frame(value):
+    return np.full((48, 64, 3), value, dtype=np.uint8)
+
+
+def frame_value(jpeg):
+    img = cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR)
+    assert img is not None, "JPEG 디코딩 실패"
+    return int(round(float(img.mean())))
+
+
+class Publisher(threading.Thread):
+    """ 실제 파이프라인처럼 클라이언트가 있을 때만 새 프레임을 그림 (값 100, 110, 120, ...) """
+
+    def __init__(self, slot, server):
+        super().__init__(daemon=True)
+        self.slot = slot
+        self.server = server
+        self.value = 100
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while not self.stop_event.wait(PUBLISH_INTERVAL_S):
+            if self.server.has_clients:
+                self.slot.publish(make_frame(self.value))
+                self.value = min(250, self.value + 10)
+
+
+def read_mjpeg_frame(resp):
+    """ multipart 스트림에서 JPEG 한 장 읽기 """
+    line = resp.readline()
+    while line.strip() != f"--{BOUNDARY}".encode("ascii"):
+        line = resp.readline()
+    length = None
+    while True:
+        line = resp.readline().strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return resp.read(length)
+
+
+def check_status(server):
+    server.update_status(state="STOPPED", fps=12.5, detections=[{"cls": 0}])
+    with urllib.request.urlopen(server.url + "/status.json", timeout=TIMEOUT_S) as resp:
+        assert resp.headers["Content-Type"] == "application/json"
+        status = json.loads(resp.read())
+    assert status["state"] == "STOPPED" and status["fps"] == 12.5 and status["detections"] == [{"cls": 0}], status
+    assert "uptime_s" in status and "stream_clients" in status, status
+    print("[OK] /status.json")
+
+
+def check_snapshot(server, slot, publisher):
+    # 프레임이 하나도 없고 그리는 쪽도 멈춰 있으면 503
+    try:
+        urllib.request.urlopen(server.url + "/snapshot.jpg", timeout=TIMEOUT_S)
+        raise AssertionError("프레임이 없는데 스냅샷이 응답함")
+    except urllib.error.HTTPError as e:
+        assert e.code == 503, e.code
+
+    # 오래된 프레임(값 10)만 남아 있으면 새로 그려진 프레임을 받아야 함
+    slot.publish(make_frame(10))
+    time.sleep(SNAPSHOT_MAX_AGE_S * 2)
+    publisher.start()
+    with urllib.request.urlopen(server.url + "/snapshot.jpg", timeout=TIMEOUT_S) as resp:
+        value = frame_value(resp.read())
+    assert value >= 100, f"오래된 프레임을 스냅샷으로 받음 (값 {value})"
+    print(f"[OK] /snapshot.jpg (stale frame skipped, got {value})")
+
+
+def check_stream(server, slot, publisher):
+    # 클라이언트가 없을 때 그려둔 프레임(값 20)은 스트림 첫 프레임이 되면 안 됨
+    time.sleep(PUBLISH_INTERVAL_S * 3)
+    slot.publish(make_frame(20))
+    with urllib.request.urlopen(server.url + "/stream.mjpg", timeout=TIMEOUT_S) as resp:
+        assert resp.headers["Content-Type"].startswith("multipart/x-mixed-replace"), resp.headers["Content-Type"]
+        values = [frame_value(read_mjpeg_frame(resp)) for _ in range(3)]
+    assert values[0] >= 100, f"접속 전 프레임으로 스트림이 시작됨 (값 {values})"
+    assert values == sorted(values), values
+    print(f"[OK] /stream.mjpg (first frame published after connect, got {values})")
+
+
+def metric_value(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.split()[-1])
+    raise AssertionError(f"/metrics 에 {series} 가 없음")
+
+
+def check_metrics(server):
+    # 워커 프로세스 대신 같은 이름의 지표를 가진 별도 Registry 의 스냅샷을 합침
+    remote = metrics.Registry()
+    detections = metrics.Counter(metrics.DETECTIONS.name, "", registry=remote)
+    inference = metrics.Histogram(metrics.INFERENCE_SECONDS.name, "", registry=remote)
+    level = metrics.Gauge(metrics.GOVERNOR_LEVEL.name, "", registry=remote)
+    detections.inc(3)
+    inference.observe(0.02)
+    level.set(4)
+    metrics.REGISTRY.merge("detect", remote.snapshot())
+    detections.inc(2)   # 같은 source 의 새 스냅샷은 이전 것을 대체 (누적값이므로 더하지 않음)
+    metrics.REGISTRY.merge("detect", remote.snapshot())
+
+    base_detections = metrics.DETECTIONS.collect()[()]
+    base_count = metrics.INFERENCE_SECONDS.collect()[()][2]
+    with urllib.request.urlopen(server.url + "/metrics", timeout=TIMEOUT_S) as resp:
+        text = resp.read().decode("utf-8")
+    assert metric_value(text, metrics.DETECTIONS.name) == base_detections + 5, text
+    assert metric_value(text, metrics.INFERENCE_SECONDS.name + "_count") == base_count + 1, text
+    assert metric_value(text, metrics.GOVERNOR_LEVEL.name) == metrics.GOVERNOR_LEVEL.collect()[()], text
+    print("[OK] /metrics (merged remote snapshot: counters/histograms summed, local gauge kept)")
+
+
+def main():
+    slot = FrameSlot()
+    server = StatusServer(slot, port=0, max_fps=0, snapshot_max_age=SNAPSHOT_MAX_AGE_S).start()
+    publisher = Publisher(slot, server)
+    try:
+        check_status(server)
+        check_snapshot(server, slot, publisher)
+        check_stream(server, slot, publisher)
+        check_metrics(server)
+    finally:
+        publisher.stop_event.set()
+        server.stop()
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
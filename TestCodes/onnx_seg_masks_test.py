@@ -0,0 +1,98 @@
+"""
+ONNX 백엔드 seg 마스크 확인 (실제 가중치 없이 작은 합성 ONNX 모델로 실행).
+
+ultralytics seg export 와 같은 형태의 출력(output0: 박스+클래스+마스크 계수, output1: protos)과
+메타데이터(task=segment)를 가진 모델을 만들어 load_yoloe_model(backend="onnx") 로 읽고,
+run_inference(masks=True) 결과에 마스크 폴리곤이 나오는지 확인함.
+
+- 로더가 task 를 덮어쓰지 않고 메타데이터를 따르는지 (model.task == "segment")
+- result.masks 가 None 이 아니고 폴리곤이 박스 안에 있는지
+- masks=False 이면 마스크를 계산하지 않는지
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/onnx_seg_masks_test.py
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+import onnx
+from onnx import helper, TensorProto, numpy_helper
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.models import yoloe_loader
+from src.detection.object_detection import run_inference
+
+# ==========================================
+# [설정]
+# ==========================================
+IMGSZ = 64
+ANCHORS = 8
+NM = 4             # 마스크 계수 수
+PROTO = 16         # proto 해상도
+BOX = (20, 14, 44, 50)   # 검출 박스 xyxy (입력 좌표)
+CLS = 3
+
+
+def make_seg_model(path, nc):
+    """ 입력과 무관하게 고정 출력을 내는 seg 모양 ONNX 모델 """
+    pred = np.zeros((1, 4 + nc + NM, ANCHORS), dtype=np.float32)
+    x1, y1, x2, y2 = BOX
+    pred[0, :4, 0] = ((x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1)
+    pred[0, 4 + CLS, 0] = 0.9
+    pred[0, 4 + nc, 0] = 1.0                 # 첫 번째 proto 만 사용
+
+    protos = np.full((1, NM, PROTO, PROTO), -10.0, dtype=np.float32)
+    g = PROTO / IMGSZ
+    protos[0, 0, int(y1 * g) + 1:int(y2 * g) - 1, int(x1 * g) + 1:int(x2 * g) - 1] = 10.0
+
+    nodes = [
+        helper.make_node("Constant", [], ["output0"], value=numpy_helper.from_array(pred)),
+        helper.make_node("Constant", [], ["output1"], value=numpy_helper.from_array(protos)),
+    ]
+    graph = helper.make_graph(
+        nodes, "seg_stub",
+        [helper.make_tensor_value_info("images", TensorProto.FLOAT, [1, 3, IMGSZ, IMGSZ])],
+        [helper.make_tensor_value_info("output0", TensorProto.FLOAT, list(pred.shape)),
+         helper.make_tensor_value_info("output1", TensorProto.FLOAT, list(protos.shape))],
+    )
+    model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8)
+    meta = {"task": "segment", "imgsz": str([IMGSZ, IMGSZ]),
+            "names": str({i: n for i, n in enumerate(yoloe_loader.names)})}
+    for key, value in meta.items():
+        model.metadata_props.add(key=key, value=value)
+    onnx.save(model, path)
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    path = os.path.join(tmp, "yoloe-seg-stub.onnx")
+    make_seg_model(path, len(yoloe_loader.names))
+    # 로더가 이 모델을 읽도록 경로만 바꿈
+    yoloe_loader.onnx_model_path = lambda profile=None, int8=False: path
+
+    model = yoloe_loader.load_yoloe_model(backend="onnx", profile="all")
+    assert model.task == "segment", f"로더가 task 를 덮어씀: {model.task}"
+
+    frame = np.full((IMGSZ, IMGSZ, 3), 128, dtype=np.uint8)
+    result = run_inference(model, frame, 0, masks=True)
+    assert len(result.boxes) == 1, len(result.boxes)
+    assert int(result.boxes.cls[0]) == CLS
+    assert result.masks is not None, "masks=True 인데 result.masks 가 None"
+    polygon = np.asarray(result.masks.xy[0])
+    x1, y1, x2, y2 = BOX
+    assert len(polygon) >= 4, polygon
+    assert (polygon[:, 0] >= x1 - 1).all() and (polygon[:, 0] <= x2 + 1).all(), polygon
+    assert (polygon[:, 1] >= y1 - 1).all() and (polygon[:, 1] <= y2 + 1).all(), polygon
+    print(f"[OK] masks=True -> {len(polygon)}-point polygon inside box {BOX}")
+
+    result = run_inference(model, frame, 1, masks=False)
+    assert len(result.boxes) == 1 and result.masks is None
+    print("[OK] masks=False -> boxes only")
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
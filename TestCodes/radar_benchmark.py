@@ -0,0 +1,73 @@
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.person_detection.main_system import draw_radar, get_status_info
+
+# ==========================================
+# [설정]
+# ==========================================
+REPEAT = 2000
+OBJECT_COUNTS = [0, 1, 5, 20]
+
+
+def draw_radar_legacy(objects, width=400, height=400, current_alert="Safe"):
+    """ 캐시 적용 전 draw_radar (매 프레임 배경부터 다시 그림) """
+    radar = np.zeros((height, width, 3), dtype=np.uint8)
+    scale_z = height / 5.0
+    cx = width // 2
+
+    for i in range(1, 6):
+        y = height - int(i * scale_z)
+        col = (50, 50, 50)
+        if i == 2: col = (0, 0, 150)
+        cv2.line(radar, (0, y), (width, y), col, 1)
+        cv2.putText(radar, f"{i}m", (10, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150,150,150))
+
+    cv2.circle(radar, (cx, height), 15, (255, 255, 255), -1)
+
+    for (x, z, status) in objects:
+        px = np.clip(int(cx + (x * (width / 4.0))), 0, width)
+        py = np.clip(int(height - (z * scale_z)), 0, height)
+        _, color = get_status_info(z)
+        cv2.circle(radar, (px, py), 10, color, -1)
+
+    if current_alert == "DANGER":
+        cv2.rectangle(radar, (0,0), (width,height), (0,0,255), 10)
+        cv2.putText(radar, "STOP!", (cx-40, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0,0,255), 3)
+    elif current_alert == "WARNING":
+        cv2.rectangle(radar, (0,0), (width,height), (0,165,255), 5)
+
+    return radar
+
+
+def make_objects(n, seed=0):
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(-2.5, 2.5, n)
+    zs = rng.uniform(-0.5, 5.5, n)
+    return [(float(x), float(z), get_status_info(z)[0]) for x, z in zip(xs, zs)]
+
+
+def bench(fn, objects, repeat=REPEAT):
+    fn(objects)  # 캐시 생성 / 워밍업
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(objects)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+if __name__ == "__main__":
+    print(f"{'objects':>8} | {'legacy (us)':>12} | {'cached (us)':>12} | {'speedup':>7} | {'diff px':>7}")
+    for n in OBJECT_COUNTS:
+        objects = make_objects(n)
+        t_old = bench(draw_radar_legacy, objects)
+        t_new = bench(draw_radar, objects)
+
+        # 결과가 기존 구현과 같은지 확인 (겹친 마커의 그리기 순서 차이만 허용)
+        diff = np.count_nonzero(np.any(draw_radar_legacy(objects) != draw_radar(objects), axis=2))
+        print(f"{n:>8} | {t_old:>12.1f} | {t_new:>12.1f} | {t_old / t_new:>6.2f}x | {diff:>7}")
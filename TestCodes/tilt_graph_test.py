@@ -0,0 +1,83 @@
+"""
+기울기 각도 분포 그래프(HistogramPanel) 확인 (카메라/모델 없이 합성 팔레트로 실행).
+
+- TiltTracker(panel=...) 가 분석한 각도를 패널에 누적하는지 (패널 평균 == 트랙 평균 각도)
+- render() 가 같은 버퍼를 재사용하고 평균선을 그리는지, 한 장에 몇 ms 인지
+- decay < 1 이면 각도가 들어오지 않는 동안 이전 분포가 줄어드는지
+
+사용법 (프로젝트 루트에서):
+    python TestCodes/tilt_graph_test.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# 프로젝트 루트를 경로에 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src.benchmark.stubs import draw_pallet
+from src.tilt.tilt_detection import HistogramPanel
+from src.tilt.tilt_tracker import TiltTracker
+
+# ==========================================
+# [설정]
+# ==========================================
+FRAME_SHAPE = (480, 640, 3)
+BOX = (170, 140, 470, 340)
+TILT_DEG = 6.0
+FRAMES = 5
+DECAY = 0.5
+
+
+def make_frame():
+    frame = np.full(FRAME_SHAPE, 180, dtype=np.uint8)
+    x1, y1, x2, y2 = BOX
+    draw_pallet(frame, ((x1 + x2) / 2, (y1 + y2) / 2), (240, 150), TILT_DEG)
+    return frame
+
+
+def check_tracker_feeds_panel():
+    panel = HistogramPanel(decay=1.0)
+    tracker = TiltTracker(panel=panel)
+    frame = make_frame()
+    for _ in range(FRAMES):
+        verdicts = tracker.update(frame, [BOX])
+    angle = verdicts[0][3]
+    assert panel.counts.sum() > 0, "패널에 각도가 누적되지 않음"
+    assert abs(panel.mean - angle) < 1e-6, (panel.mean, angle)
+    print(f"[OK] tracker -> panel: {int(panel.counts.sum())} angles, mean {panel.mean:.2f}° == track {angle:.2f}°")
+    return panel
+
+
+def check_render(panel):
+    first = panel.render()
+    start = time.perf_counter()
+    second = panel.render()
+    ms = (time.perf_counter() - start) * 1000.0
+    assert second is first, "render 가 버퍼를 재사용하지 않음"
+    red = (first[..., 2] == 255) & (first[..., 1] == 0) & (first[..., 0] == 0)
+    assert red.any(), "평균선이 그려지지 않음"
+    print(f"[OK] render {first.shape[1]}x{first.shape[0]} in {ms:.2f} ms (buffer reused)")
+
+
+def check_decay():
+    panel = HistogramPanel(decay=DECAY).update([5.0, 6.0, 7.0])
+    before = panel.counts.sum()
+    for _ in range(3):
+        panel.update([])
+    after = panel.counts.sum()
+    assert abs(after - before * DECAY ** 3) < 1e-9, (before, after)
+    assert abs(panel.mean - 6.0) < 1e-9, panel.mean
+    print(f"[OK] decay {DECAY}: {before:.0f} -> {after:.3f} after 3 empty frames, mean kept {panel.mean:.1f}°")
+
+
+def main():
+    panel = check_tracker_feeds_panel()
+    check_render(panel)
+    check_decay()
+    print("All checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,137 +1,200 @@
 import src.common
 import src.tilt.tilt_detection as td
+import argparse
 import threading
 import time
 from picamera2 import Picamera2, Preview
-<<<<<<< HEAD
 import motion_detector as md
 import cv2
-=======
-# 필요한 경우 BMI160 센서 모듈 임포트
-# [1단계]에서 저장한 파일 이름으로 수정하세요 (예: `motion_detector.py`를 `md`로 임포트)
-import motion_detector as md # <--- 여기에 BMI160 감지 파일 임포트
-
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
+import numpy as np
 
 # YOLOE 및 기능 모듈 임포트
 from src.models.yoloe_loader import load_yoloe_model
-from src.common.camera_input import init_camera, get_frame
+from src.common.camera_input import init_camera, get_frame_stamped
 from src.detection.object_detection import run_inference
-from src.tilt.tilt_detection import analyze_tilt_fast, analyze_tilt_hough
-from src.common.visualization import draw_box, draw_label, show_frame
+from src.tilt.tilt_detection import analyze_tilt_fast, analyze_tilt_hough, HistogramPanel
+from src.common.visualization import show_frame
+from src.common.overlay import Overlay
 
-<<<<<<< HEAD
 # pose 및 기능 모듈 임포트
 from src.models.pose_loader import load_pose_model
-from src.person_detection.distance_estimation import load_calibration_data, process_distance_estimation
+from src.person_detection.distance_estimation import load_calibration_data
+from src.common.model_scheduler import ModelScheduler
+from src.common.frame_slot import FrameSlot
+from src.common.http_stream import StatusServer, RateMeter, DEFAULT_PORT
+from src.common.stage_timer import stage_timer
+from src.common.frame_policy import frame_policy, parse_max_age
+from src.common.governor import Governor
+from src.common.pipeline_stages import StoppedStage, MovingStage, add_stage_arguments, build_detector, make_governor
+from src.common import metrics
 
-=======
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
-# 공유 자원 및 조건 변수 생성
-current_state = "STOPPED" # 상태 저장 변수
-condition = threading.Condition() # Condition 객체 생성
 model = load_yoloe_model()
 
-<<<<<<< HEAD
 pose_model = load_pose_model()
 homography_matrix = load_calibration_data()
 
-# [추가] 화면에 표시할 프레임을 저장할 공유 변수
-global_display_frame = None
-frame_lock = threading.Lock() # 프레임 쓰기/읽기 충돌 방지용
+# 워밍업용 작은 빈 프레임
+WARMUP_FRAME = np.zeros((64, 64, 3), dtype=np.uint8)
+
+def warmup_yoloe(m):
+    run_inference(m, WARMUP_FRAME, 0)
+
+def warmup_pose(m):
+    m(WARMUP_FRAME, verbose=False)
+
+# 두 모델을 소유하고 상태 전환을 관리하는 스케줄러
+scheduler = ModelScheduler(initial_state="STOPPED")
+scheduler.register("MOVING", pose_model, warmup_pose)
+scheduler.register("STOPPED", model, warmup_yoloe)
+
+# 화면에 표시할 프레임 슬롯 (작업 스레드 -> 메인 루프, 복사 없이 전달)
+display_slot = FrameSlot()
+DISPLAY_WAIT_S = 0.03 # 새 프레임 대기 시간 (메인 루프 주기 겸용)
+
+DISPLAY_SIZE = (640, 480)
+
+# 기울기 각도 분포 그래프 (--tilt-graph, 화면 모드 전용). 프레임마다 이전 누적을 줄여 최근 분포 위주로 표시
+TILT_GRAPH_DECAY = 0.9
+tilt_panel = None
+graph_slot = FrameSlot()
+
+# 헤드리스 실행 설정 (__main__ 에서 인자로 덮어씀)
+HEADLESS = False
+status_server = None
+governor = Governor()    # 발열/부하에 따라 정차 작업 강도를 낮춤 (--no-governor 면 단계 0 고정)
+# 상태별 처리 단계 (main_async.py / main_mp.py 와 공용, ROI / 타일 / governor 설정 적용)
+stopped_stage = StoppedStage(model, governor=governor)
+moving_stage = MovingStage(pose_model, homography_matrix, governor=governor)
+fps_meters = {"MOVING": RateMeter(), "STOPPED": RateMeter()}
 
 def set_display_frame(frame):
-    """서브 스레드에서 결과 이미지를 업데이트하는 함수"""
-    global global_display_frame
-    with frame_lock:
-        global_display_frame = frame
+    """서브 스레드에서 결과 이미지를 넘기는 함수 (넘긴 뒤 frame 수정 금지)"""
+    display_slot.publish(frame)
+
+def should_render():
+    """모니터 출력 중이거나 HTTP 스트림 접속자가 있을 때만 그리기"""
+    if not HEADLESS:
+        return True
+    return status_server is not None and status_server.has_clients
+
+def update_status(state, t_capture, **fields):
+    """결과(경보) 게시 + 캡처 시각 기준 glass-to-alert 지연 기록"""
+    latency_ms = frame_policy.alert(state, t_capture)
+    fps = fps_meters[state].tick()
+    metrics.PIPELINE_FPS.labels(state).set(round(fps, 2))
+    if status_server is not None:
+        status_server.update_status(state=state, fps=round(fps, 1), latency_ms=round(latency_ms, 1), **fields)
 
 def car_moved_task(picam2): # [수정] picam2 인자 받도록 통일
     """차가 움직일 때 실행되는 태스크"""
+    overlay = Overlay()
     while True:
-        with condition:
-            condition.wait_for(lambda: current_state == "MOVING")
+        ticket = scheduler.wait_for("MOVING")
+        if ticket is None:   # scheduler.stop() 호출 (종료 중)
+            break
+        moving_stage.begin()
         
         # --- [실제 작업 영역] ---
         # print("car moved: monitoring...") # 로그 너무 많으면 주석 처리
-        frame = get_frame(picam2)
+        with stage_timer.stage("MOVING/capture"):
+            frame, t_capture = get_frame_stamped(picam2)
             
-        # 2. 거리 추정 로직 수행
-        result_frame, objects = process_distance_estimation(pose_model, frame, homography_matrix)
-        
-        # 3. 콘솔 로그 (사람 감지 시)
-        if objects:
-            dist_str = ", ".join([f"{obj[1]:.1f}m" for obj in objects])
-            print(f"[MOVING] Person Detected: {dist_str}")
-
-        # 4. 화면 출력 대신 전역 변수 업데이트 [수정됨]
-        set_display_frame(result_frame)
-        
-        # CPU 과점유 방지 (필요 시 미세 조정)
-        time.sleep(0.01)
-=======
-def car_moved_task():
-    """차가 움직일 때 실행되는 태스크"""
-    while True:
-        with condition:
-            # 상태가 'MOVING'이 아니면 스레드는 여기서 멈춤 (CPU 사용 X)
-            # 상태가 바뀌고 notify가 오면 깨어나서 조건을 다시 확인
-            condition.wait_for(lambda: current_state == "MOVING")
+        # 2. 거리 추정 로직 수행 (추론 중 상태가 바뀌면 결과 폐기)
+        # 방금 캡처한 프레임보다 새 프레임은 없으므로 나이로 버리지 않음 (사람 검출이 멈추지 않도록)
+        overlay.reset(should_render())
+        valid, output = scheduler.run(ticket, moving_stage.detect, frame, overlay)
+        if not valid:
+            continue
+        result_frame, objects = output
+
+        # 3. 콘솔 로그 (사람 감지 시) + 경보는 늦어도 버리지 않고 지연만 기록
+        update_status("MOVING", t_capture, distances=moving_stage.report(objects))
+
+        # 4. 화면 출력 대신 전역 변수 업데이트 [수정됨] (이미 낡은 프레임은 그리지 않음)
+        if frame_policy.fresh("MOVING/render", t_capture):
+            with stage_timer.stage("MOVING/render"):
+                display_frame = overlay.render(result_frame, DISPLAY_SIZE)
+            if display_frame is not None:
+                set_display_frame(display_frame)
+        stage_timer.frame("MOVING")
         
-        # --- [실제 작업 영역] ---
-        print("car moved: monitoring...")
-
-
-
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
+        # CPU 과점유 방지 (필요 시 미세 조정), 발열 마지막 단계에서만 MOVING 간격을 늘림
+        time.sleep(max(0.01, moving_stage.interval_left()))
 
 def car_stopped_task(picam2):
-    frame_count = 0
     """차가 멈췄을 때 실행되는 태스크"""
+    overlay = Overlay()
     while True:
-        with condition:
-<<<<<<< HEAD
-            condition.wait_for(lambda: current_state == "STOPPED")
+        ticket = scheduler.wait_for("STOPPED")
+        if ticket is None:   # scheduler.stop() 호출 (종료 중)
+            break
 
-        # --- [실제 작업 영역] ---
-        # print("car stopped: detecting tilt...")
-=======
-            # 상태가 'STOPPED'가 아니면 여기서 대기 (CPU 사용 X)
-            condition.wait_for(lambda: current_state == "STOPPED")
+        # 정차할 때마다 트래커를 새로 시작 (이동 중 화물이 움직였을 수 있으므로)
+        # 발열/부하 단계에 따른 추론 간격, imgsz, 기울기 분석 방식
+        knobs = stopped_stage.begin(ticket.epoch)
 
         # --- [실제 작업 영역] ---
-        print("car stopped: detecting tilt...")
-
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
-        frame = get_frame(picam2)
-        frame_count += 1
-        result = run_inference(model, frame, frame_count)
-
-        if result:
-            for box, cls in zip(result.boxes.xyxy, result.boxes.cls):
-                x1, y1, x2, y2 = map(int, box)
-                crop = frame[y1:y2, x1:x2]
-
-                if crop.size == 0:
-                    continue
-
-                status, color, angle = analyze_tilt_hough(crop)
-                label = f"{cls} | {status} {angle:.1f}°"
-
-                draw_box(frame, x1, y1, x2, y2, color)
-                draw_label(frame, label, x1, max(10, y1 - 10), color)
+        # print("car stopped: detecting tilt...")
+        with stage_timer.stage("STOPPED/capture"):
+            frame, t_capture = get_frame_stamped(picam2)
+        valid, result = scheduler.run(ticket, stopped_stage.detect, frame, knobs)
+        if not valid:
+            continue
+
+        # 추론이 밀려 프레임이 낡았으면 기울기 분석 없이 다음 최신 프레임으로
+        overlay.reset(should_render())
+        detections = stopped_stage.analyze(frame, t_capture, result, overlay)
+        if detections is None:
+            continue
+
+        update_status("STOPPED", t_capture, detections=detections)
+        if tilt_panel is not None:
+            # render() 는 패널 버퍼를 재사용하므로 복사해서 넘김
+            graph_slot.publish(tilt_panel.render().copy())
 
-<<<<<<< HEAD
         # 화면 출력 대신 전역 변수 업데이트 [수정됨]
-        # show_frame 내부에는 resize 로직이 있으므로 여기서 수동으로 resize 후 넘김
-        display_frame = cv2.resize(frame, (640, 480))
-        set_display_frame(display_frame)
+        # 헤드리스 모드에서 보는 사람이 없으면 resize/그리기 모두 생략
+        if frame_policy.fresh("STOPPED/render", t_capture):
+            with stage_timer.stage("STOPPED/render"):
+                display_frame = overlay.render(frame, DISPLAY_SIZE)
+            if display_frame is not None:
+                set_display_frame(display_frame)
+        stage_timer.frame("STOPPED")
         
-        time.sleep(0.01)
+        time.sleep(max(0.01, stopped_stage.interval_left()))
 
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Smart Forklift System")
+    parser.add_argument("--headless", action="store_true", help="cv2.imshow 없이 실행 (HTTP 스트림으로만 확인)")
+    parser.add_argument("--host", default="127.0.0.1", help="상태 서버 주소")
+    parser.add_argument("--port", type=int, default=None,
+                        help="상태 서버 포트 (기본: --headless 이면 8080, 화면 모드는 서버 끔 / 0: 서버 끔)")
+    parser.add_argument("--timing", action="store_true", help="단계별 지연(p50/p95/p99) 및 모드별 FPS 주기적 출력")
+    parser.add_argument("--tilt-graph", action="store_true", help="기울기 각도 분포 그래프 창 표시 (화면 모드 전용)")
+    add_stage_arguments(parser)   # --mask-tilt, --no-roi, --tiles, --tile-region, --max-age, governor
+    args = parser.parse_args()
+    if args.port is None:
+        args.port = DEFAULT_PORT if args.headless else 0
+
+    HEADLESS = args.headless
+    if args.tilt_graph and not HEADLESS:
+        tilt_panel = HistogramPanel(decay=TILT_GRAPH_DECAY)
+    stage_timer.enabled = stage_timer.enabled or args.timing
+    governor = make_governor(args)
+    # ROI 를 먼저 자르고 (--tiles 이면 ROI 안에서 타일 분할)
+    stopped_detector, cargo_roi = build_detector(model, args)
+    stopped_stage = StoppedStage(model, stopped_detector, cargo_roi, mask_tilt=args.mask_tilt,
+                                 governor=governor, panel=tilt_panel)
+    moving_stage = MovingStage(pose_model, homography_matrix, governor=governor)
+    try:
+        frame_policy.max_age_s.update(parse_max_age(args.max_age))
+    except ValueError as e:
+        parser.error(str(e))
+    if args.port:
+        status_server = StatusServer(display_slot, host=args.host, port=args.port).start()
+
     try:
         md.initialize_bmi160()
     except Exception as e:
@@ -143,101 +206,78 @@ if __name__ == "__main__":
     # 스레드 생성 (인자 통일)
     t1 = threading.Thread(target=car_moved_task, args=(picam2,), daemon=True)
     t2 = threading.Thread(target=car_stopped_task, args=(picam2,), daemon=True)
-=======
-        key = show_frame(frame)
-
-if __name__ == "__main__":
-    # 센서 초기화는 메인 스레드에서 한 번만 수행
-    try:
-        md.initialize_bmi160()
-    except Exception as e:
-        print(f"센서 초기화에 실패하여 ZUPT 기능 없이 시작합니다: {e}")
-        # 센서 초기화에 실패하면 is_moving을 항상 True로 설정하여 동작 감지 로직을 우회할 수 있습니다.
-
-
-    picam2 = init_camera()
-
-    # 👇 Preview 강제 적용
-    # try:
-    #     picam2.start_preview(Preview.OPENCV)
-    # except Exception:
-    #     print("OpenCV preview unavailable, switching to Null")
-    #     picam2.start_preview(Preview.NULL)
-
-    #picam2.start_preview(Preview.NULL)
-
-    picam2.start()
-
-    # 스레드 생성 및 시작
-    t1 = threading.Thread(target=car_moved_task, daemon=True)
-    t2 = threading.Thread(target=car_stopped_task,args=(picam2,), daemon=True)
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
     
     t1.start()
     t2.start()
+    scheduler.start_warmup()
     
-<<<<<<< HEAD
     last_state = None 
+    last_seq = 0
+    last_graph_seq = 0
+    last_tick = time.monotonic()
 
-    print("System Started. Press 'q' to exit.")
+    print("System Started. Press 'q' (or Ctrl+C in headless mode) to exit.")
 
-    while True:
-        # 1. 센서 상태 확인 및 상태 전환
-        try:
-            car_moving = md.check_motion_state()
-        except NameError:
-            car_moving = True
-
-        new_state = "MOVING" if car_moving else "STOPPED"
-
-=======
-    last_result = None
-
-    last_state = None # 상태 변경 감지용
-
-    while True:
-        try:
-            car_moving = md.check_motion_state()
-            #car_moving = state_received() 
-            
-        except NameError:
-            # 센서 오류 등으로 함수 호출에 실패하면 '움직임' 상태로 간주 (안전 모드)
-            car_moving = True
-
-        # 상태 결정
-        new_state = "MOVING" if car_moving else "STOPPED"
-
-        # *** 상태가 바뀌었을 때만 스레드들에게 알림 ***
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
-        if new_state != last_state:
-            with condition:
-                current_state = new_state
-                print(f"\n--- State changed to: {current_state} ---\n")
-<<<<<<< HEAD
-                condition.notify_all()
-            last_state = new_state
-        
-        # 2. [핵심 수정] 메인 스레드에서 화면 출력 (GUI 이벤트 처리)
-        current_display = None
-        with frame_lock:
-            if global_display_frame is not None:
-                current_display = global_display_frame.copy()
-        
-        if current_display is not None:
-            # 창 이름은 하나로 통일하는 것이 좋습니다
-            cv2.imshow("Smart Forklift System", current_display)
+    try:
+        while True:
+            # 1. 센서 상태 확인 및 상태 전환
+            try:
+                car_moving = md.check_motion_state()
+            except NameError:
+                car_moving = True
+
+            new_state = "MOVING" if car_moving else "STOPPED"
+
+            if new_state != last_state:
+                # 첫 판정이 스케줄러 초기 상태와 같으면 전환이 아님
+                if scheduler.set_state(new_state):
+                    print(f"\n--- State changed to: {new_state} ---\n")
+                    metrics.STATE_TRANSITIONS.labels(new_state).inc()
+                for state in ("MOVING", "STOPPED"):
+                    metrics.STATE.labels(state).set(1 if state == new_state else 0)
+                last_state = new_state
+
+            now = time.monotonic()
+            metrics.STATE_SECONDS.labels(last_state).inc(now - last_tick)
+            last_tick = now
+
+            stage_timer.maybe_report()
+            if stage_timer.enabled:
+                frame_policy.maybe_report()
+            if governor.maybe_update(now):
+                scheduler.warmup_paused = not governor.knobs.warmup
+                if status_server is not None:
+                    status_server.update_status(governor=governor.status())
+
+            # 헤드리스 모드: 화면 출력 없이 센서 주기만 유지
+            if HEADLESS:
+                time.sleep(DISPLAY_WAIT_S)
+                continue
+
+            # 2. 메인 스레드에서 화면 출력 (새 시퀀스가 도착했을 때만 렌더링)
+            #    새 프레임이 없으면 DISPLAY_WAIT_S 동안 잠들어 루프가 공회전하지 않음
+            seq, current_display = display_slot.wait_newer(last_seq, timeout=DISPLAY_WAIT_S)
+            if current_display is not None:
+                last_seq = seq
+                # 창 이름은 하나로 통일하는 것이 좋습니다
+                with stage_timer.stage("display"):
+                    cv2.imshow("Smart Forklift System", current_display)
+            if tilt_panel is not None:
+                last_graph_seq, graph = graph_slot.wait_newer(last_graph_seq, timeout=0)
+                if graph is not None:
+                    cv2.imshow("Tilt Graph", graph)
+
+            # waitKey는 메인 스레드에서만 호출! (GUI 이벤트 처리)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+    except KeyboardInterrupt:
+        pass
+
+    scheduler.stop()
+    if status_server is not None:
+        status_server.stop()
+    stage_timer.report(final=True)
+    frame_policy.report()
+    for state, stats in scheduler.transition_stats().items():
+        print(f"[Scheduler] {state} 전환 지연: 평균 {stats['mean']:.1f} ms / 최대 {stats['max']:.1f} ms ({stats['count']}회)")
 
-        
-        # waitKey는 메인 스레드에서만 호출!
-        if cv2.waitKey(1) & 0xFF == ord('q'):
-            break
-        
-        # time.sleep(0.1) -> waitKey(1)이 sleep 역할을 일부 수행하므로 제거하거나 아주 짧게 설정
-=======
-                condition.notify_all() # 대기 중인 모든 스레드를 깨움
-            last_state = new_state
-        
-        # 메인 루프의 과도한 CPU 점유를 막기 위한 최소한의 sleep
-        time.sleep(0.1)
-        # (이건 스레드 제어용이 아니라 상태 체크 주기용입니다)
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
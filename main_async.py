@@ -0,0 +1,235 @@
+"""
+main.py 의 asyncio 실행 버전 (선택 사항).
+
+센서 샘플링, 프레임 소스, 출력은 이벤트 루프의 코루틴으로, 모델 추론과 기울기 분석은 상태별
+executor 스레드에서 실행 (src.common.async_pipeline.Orchestrator 참고).
+단계 사이는 최신 우선 메일박스라 추론이 밀리면 오래된 프레임은 버려지고,
+상태가 바뀌면 이전 상태의 추론 결과는 출력되지 않음. 검출/거리 추정 단계(ROI, --tiles, governor,
+단계별 최대 나이)는 main.py 와 같은 src.common.pipeline_stages 를, glass-to-alert 지연은 frame_policy 를 사용.
+
+사용법:
+    python main_async.py                                   # 카메라 + 실제 모델
+    python main_async.py --headless --port 8080
+    python main_async.py --source synthetic --stub-models --state alternate --duration 30
+"""
+import argparse
+import asyncio
+import json
+import signal
+import time
+
+import cv2
+
+from src.common.async_pipeline import Orchestrator
+from src.common.frame_policy import frame_policy, parse_max_age
+from src.common.frame_slot import FrameSlot
+from src.common.http_stream import StatusServer, RateMeter, DEFAULT_PORT
+from src.common.overlay import Overlay
+from src.common.pipeline_sources import STATES, SWITCH_EVERY_S, load_models, open_source, source_shape
+from src.common.pipeline_stages import StoppedStage, MovingStage, add_stage_arguments, build_detector, make_governor
+from src.common import metrics
+
+# ==========================================
+# [설정]
+# ==========================================
+DISPLAY_SIZE = (640, 480)
+DISPLAY_WAIT_S = 0.03   # 화면 갱신 / 키 입력 확인 주기
+REPORT_INTERVAL_S = 10.0
+
+
+# ==========================================
+# [1] 상태별 핸들러 (추론 executor 스레드에서 실행)
+# ==========================================
+class StoppedHandler:
+    """ STOPPED: YOLOE + TiltTracker (main.py car_stopped_task 와 같은 StoppedStage) """
+
+    def __init__(self, stage, should_render):
+        self.stage = stage
+        self.should_render = should_render
+        self.overlay = Overlay()
+
+    def __call__(self, packet, epoch):
+        stage = self.stage
+        # governor 추론 간격이 남았으면 이 프레임은 건너뜀 (main.py 의 sleep 대신)
+        if stage.interval_left() > 0:
+            return None
+        knobs = stage.begin(epoch)
+        frame = packet.frame
+        result = stage.detect(frame, knobs)
+        overlay = self.overlay
+        overlay.reset(self.should_render())
+        detections = stage.analyze(frame, packet.t_capture, result, overlay)
+        if detections is None:
+            return None
+        display = overlay.render(frame, DISPLAY_SIZE) if frame_policy.fresh("STOPPED/render", packet.t_capture) else None
+        return display, {"detections": detections}
+
+
+class MovingHandler:
+    """ MOVING: pose + 거리 추정 (main.py car_moved_task 와 같은 MovingStage) """
+
+    def __init__(self, stage, should_render):
+        self.stage = stage
+        self.should_render = should_render
+        self.overlay = Overlay()
+
+    def __call__(self, packet, epoch):
+        stage = self.stage
+        if stage.interval_left() > 0:
+            return None
+        stage.begin()
+        # 메일박스에서 꺼낸 최신 프레임이므로 나이로 버리지 않음 (늦어도 거리 경보는 냄), 그리기만 나이 확인
+        overlay = self.overlay
+        overlay.reset(self.should_render())
+        result_frame, objects = stage.detect(packet.frame, overlay)
+        distances = stage.report(objects)
+        display = overlay.render(result_frame, DISPLAY_SIZE) if frame_policy.fresh("MOVING/render", packet.t_capture) else None
+        return display, {"distances": distances}
+
+
+# ==========================================
+# [2] 상태 소스 / 출력
+# ==========================================
+def make_motion(state):
+    """ Orchestrator 용 motion 함수 (True: MOVING). state=None 이면 BMI160 센서 """
+    if state == "alternate":
+        start = time.monotonic()
+        return lambda: int((time.monotonic() - start) // SWITCH_EVERY_S) % 2 == 0
+    if state is not None:
+        return lambda: state == "MOVING"
+    try:
+        import motion_detector as md
+        md.initialize_bmi160()
+        return md.check_motion_state
+    except Exception as e:
+        print(f"센서 초기화 실패, 안전 모드(MOVING)로 시작: {e}")
+        return lambda: True
+
+
+class Publisher:
+    """ 결과 싱크: 표시 프레임을 FrameSlot 에 넘기고 상태 서버 / 지표 갱신 """
+
+    def __init__(self, slot, server):
+        self.slot = slot
+        self.server = server
+        self.meters = {s: RateMeter() for s in STATES}
+
+    def __call__(self, result):
+        display, fields = result.value
+        latency_ms = frame_policy.alert(result.state, result.t_capture)
+        if display is not None:
+            self.slot.publish(display)
+        fps = self.meters[result.state].tick()
+        metrics.PIPELINE_FPS.labels(result.state).set(round(fps, 2))
+        if self.server is not None:
+            self.server.update_status(state=result.state, fps=round(fps, 1), latency_ms=round(latency_ms, 1), **fields)
+
+
+def on_state(new_state):
+    print(f"\n--- State changed to: {new_state} ---\n")
+    metrics.STATE_TRANSITIONS.labels(new_state).inc()
+    for state in STATES:
+        metrics.STATE.labels(state).set(1 if state == new_state else 0)
+
+
+def display_task(slot, headless, governor, server):
+    """
+    화면 출력 + 'q' 종료 + governor 갱신 + 주기적 통계 출력 코루틴 (imshow/waitKey 는 이벤트 루프 스레드에서만)
+    """
+    async def run(orch):
+        last_seq = 0
+        next_report = time.monotonic() + REPORT_INTERVAL_S
+        while True:
+            if not headless:
+                seq, frame = slot.latest()
+                if frame is not None and seq != last_seq:
+                    last_seq = seq
+                    cv2.imshow("Smart Forklift System (async)", frame)
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    orch.stop()
+            if governor.maybe_update() and server is not None:
+                server.update_status(governor=governor.status())
+            if time.monotonic() >= next_report:
+                next_report += REPORT_INTERVAL_S
+                print_summary("Async", orch.stats())
+                frame_policy.report()
+            await asyncio.sleep(DISPLAY_WAIT_S)
+    return run
+
+
+def print_summary(tag, stats):
+    for s, r in stats["states"].items():
+        print(f"[{tag}] {s:<8} {r['fps']:6.1f} FPS | result p50 {r['result_latency_ms']['p50']:6.1f} / "
+              f"p95 {r['result_latency_ms']['p95']:6.1f} ms | output p50 {r['output_latency_ms']['p50']:6.1f} / "
+              f"p95 {r['output_latency_ms']['p95']:6.1f} ms ({r['frames']} frames)")
+    t = stats["transition_ms"]
+    print(f"[{tag}] captured {stats['captured_frames']}, dropped {stats['dropped_frames']}, "
+          f"cancelled {stats['cancelled']}, errors {stats['errors']}"
+          + (f", transition p50 {t['p50']:.1f} / p95 {t['p95']:.1f} ms" if t else ""))
+
+
+async def main(opts):
+    slot = FrameSlot()
+    server = StatusServer(slot, host=opts.host, port=opts.port).start() if opts.port else None
+
+    def should_render():
+        return not opts.headless or (server is not None and server.has_clients)
+
+    model = load_models(opts, "detect")
+    pose, homography = load_models(opts, "pose")
+    governor = make_governor(opts)
+    detector, roi = build_detector(model, opts)
+    stopped = StoppedStage(model, detector, roi, mask_tilt=opts.mask_tilt, governor=governor)
+    moving = MovingStage(pose, homography, governor=governor)
+    orch = Orchestrator(
+        frames=open_source(opts.source, source_shape(opts.source), opts.fps),
+        motion=make_motion(opts.state),
+        handlers={"MOVING": MovingHandler(moving, should_render),
+                  "STOPPED": StoppedHandler(stopped, should_render)},
+        sinks=[Publisher(slot, server)],
+        on_state=on_state,
+    )
+    asyncio.get_running_loop().add_signal_handler(signal.SIGINT, orch.stop)
+
+    print("System Started (asyncio). Press 'q' in the window or Ctrl+C to exit.")
+    try:
+        stats = await orch.run(duration=opts.duration or None, tasks=[display_task(slot, opts.headless, governor, server)])
+    finally:
+        if server is not None:
+            server.stop()
+        if not opts.headless:
+            cv2.destroyAllWindows()
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Smart Forklift System (asyncio runtime)")
+    parser.add_argument("--source", default="camera", help="camera / synthetic / 녹화 영상 경로")
+    parser.add_argument("--fps", type=float, default=30.0, help="녹화/합성 영상 재생 속도 (0: 최대)")
+    parser.add_argument("--state", choices=STATES + ("alternate",), default=None,
+                        help="센서 대신 고정 상태 사용 (alternate: SWITCH_EVERY_S 마다 전환)")
+    parser.add_argument("--stub-models", action="store_true", help="모델 대역 사용 (가중치 없이 실행)")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--headless", action="store_true", help="cv2.imshow 없이 실행 (HTTP 스트림으로만 확인)")
+    parser.add_argument("--host", default="127.0.0.1", help="상태 서버 주소")
+    parser.add_argument("--port", type=int, default=None,
+                        help="상태 서버 포트 (기본: --headless 이면 8080, 화면 모드는 서버 끔 / 0: 서버 끔)")
+    parser.add_argument("--duration", type=float, default=0.0, help="이 시간(초) 후 종료 (0: 계속)")
+    add_stage_arguments(parser)   # --mask-tilt, --no-roi, --tiles, --tile-region, --max-age, governor
+    parser.add_argument("--report", default=None, help="통계 JSON 저장 경로")
+    args = parser.parse_args()
+    if args.port is None:
+        args.port = DEFAULT_PORT if args.headless else 0
+    try:
+        frame_policy.max_age_s.update(parse_max_age(args.max_age))
+    except ValueError as e:
+        parser.error(str(e))
+
+    stats = asyncio.run(main(args))
+    stats["frame_policy"] = frame_policy.snapshot()
+    print_summary("Async", stats)
+    frame_policy.report()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+        print(f"[Report] saved: {args.report}")
@@ -0,0 +1,574 @@
+"""
+main.py 의 멀티프로세스 실행 버전 (선택 사항).
+
+main.py 는 캡처, YOLOE, pose, 화면 출력을 한 프로세스의 스레드로 돌리므로
+파이썬 후처리(keypoint 루프, 기울기 루프, 그리기)가 GIL 때문에 직렬화됨.
+여기서는 역할별로 프로세스를 나눔:
+
+  capture  : 카메라(또는 녹화/합성 영상) -> 공유 메모리 링 버퍼, 현재 상태의 작업 큐에 (epoch, seq, 시각)
+  detect   : STOPPED - YOLOE + TiltTracker (main.py 와 같은 src.common.pipeline_stages.StoppedStage)
+  pose     : MOVING  - pose + 거리 추정 (MovingStage)
+  output   : 결과 메타데이터 + 링 버퍼 프레임으로 화면/HTTP 출력, FPS / 지연 집계, governor 단계 결정
+
+프레임은 src.common.shm_ring.FrameRing 으로만 전달되고, 큐에는 seq, 시각, 박스/라벨
+(Overlay 주석 목록) 같은 작은 메타데이터만 오감. 큐는 가득 차면 오래된 항목을 버림 (최신 우선).
+상태가 바뀔 때마다 epoch 이 올라가고, 워커와 출력은 이전 epoch 의 항목/결과를 버림.
+governor 는 output 워커에 하나만 두고, 워커는 공유 단계 값으로 설정을 읽고 단계 지연은 결과 메시지로 보냄.
+워커 프로세스의 지표(src.common.metrics)도 결과 메시지로 보내 output 워커의 /metrics 에 합침.
+부모 프로세스는 센서로 상태를 바꾸고, 죽은 워커를 다시 띄우며 (RESTART_* 참고),
+Ctrl+C / q / --duration 에서 모든 워커를 멈추고 공유 메모리를 정리함.
+
+사용법:
+    python main_mp.py                                  # 카메라 + 실제 모델
+    python main_mp.py --headless --port 8080
+    python main_mp.py --source synthetic --stub-models --state alternate --duration 30
+    python main_mp.py --source data/testData --stub-models --compare --duration 20   # 이 파일의 스레드 런타임 vs 프로세스
+"""
+import argparse
+import json
+import multiprocessing as mp
+import os
+import queue
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from src.common.frame_policy import frame_policy, parse_max_age
+from src.common.governor import LEVELS
+from src.common.pipeline_sources import STATES, SWITCH_EVERY_S, load_models, open_source, source_shape
+from src.common.pipeline_stages import StoppedStage, MovingStage, add_stage_arguments, build_detector, make_governor
+from src.common.shm_ring import FrameRing, RING_SLOTS
+from src.common.overlay import Overlay
+from src.common import metrics
+
+# ==========================================
+# [설정]
+# ==========================================
+DISPLAY_SIZE = (640, 480)
+WORK_QUEUE_SIZE = 2             # 캡처 -> detect/pose (넘치면 오래된 프레임 버림)
+OUT_QUEUE_SIZE = 4              # detect/pose -> output
+QUEUE_POLL_S = 0.1              # 큐가 비었을 때 stop 확인 주기
+QUEUE_SPIN_S = 0.002            # 큐 폴링 간격
+STATE_POLL_S = 0.03             # 센서 확인 주기 (main.py DISPLAY_WAIT_S 와 같음)
+RESTART_DELAY_S = 1.0           # 워커가 죽은 뒤 다시 띄우기까지 대기
+MAX_RESTARTS = 5                # RESTART_WINDOW_S 안에 이보다 많이 죽으면 전체 종료
+RESTART_WINDOW_S = 60.0
+JOIN_TIMEOUT_S = 3.0
+REPORT_INTERVAL_S = 10.0
+LATENCY_SAMPLES = 5000          # 지연 백분위 계산에 보관할 최근 샘플 수
+METRICS_INTERVAL_S = 1.0        # 워커 프로세스 -> output 지표 스냅샷 전송 간격
+
+
+# ==========================================
+# [1] 공통 도우미
+# ==========================================
+def _worker_init():
+    """ Ctrl+C 는 부모가 받아 stop 이벤트로 정리 (워커가 각자 KeyboardInterrupt 로 죽지 않게) """
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def put_latest(q, item):
+    """ 큐가 가득 차면 가장 오래된 항목을 버리고 넣음. 버린 항목이 있으면 True """
+    try:
+        q.put_nowait(item)
+        return False
+    except queue.Full:
+        pass
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        pass
+    return True
+
+
+class _GovernorLink:
+    """
+    워커용 governor 대리자 (StoppedStage / MovingStage 의 governor 자리).
+    설정은 output 워커의 Governor 가 정한 공유 단계 값에서 읽고, 단계 지연은 모아 두었다가
+    다음 결과 메시지의 "observed" 로 보냄 (output 워커가 Governor.observe 에 넘김)
+    """
+
+    def __init__(self, level):
+        self.level = level
+        self.observed = {}
+
+    @property
+    def knobs(self):
+        return LEVELS[self.level.value]
+
+    def observe(self, stage, seconds):
+        self.observed[stage] = seconds
+
+    def take(self):
+        observed, self.observed = self.observed, {}
+        return observed
+
+
+class _MetricsLink:
+    """
+    워커 프로세스의 지표 스냅샷을 METRICS_INTERVAL_S 마다 결과 메시지("metrics")에 실어 보냄.
+    threads 런타임은 output 워커와 REGISTRY 를 같이 쓰므로 보내지 않음 (None)
+    """
+
+    def __init__(self):
+        self.enabled = mp.parent_process() is not None
+        self._next = 0.0
+
+    def take(self):
+        now = time.monotonic()
+        if not self.enabled or now < self._next:
+            return None
+        self._next = now + METRICS_INTERVAL_S
+        return metrics.REGISTRY.snapshot()
+
+
+def _get(q):
+    """
+    get(timeout) 은 기다리는 동안 큐 내부의 읽기 잠금을 잡고 있어, 그 상태로 워커가 강제 종료되면
+    잠금이 풀리지 않아 재시작한 워커가 큐를 영영 읽지 못함. get_nowait 폴링은 실제로 꺼내는
+    순간에만 잠금을 잡으므로 이 문제를 피함.
+    """
+    deadline = time.monotonic() + QUEUE_POLL_S
+    while True:
+        try:
+            return q.get_nowait()
+        except queue.Empty:
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(QUEUE_SPIN_S)
+
+
+# ==========================================
+# [2] 워커
+# ==========================================
+def capture_worker(ring_spec, work_queues, state, epoch, stop, opts):
+    """ 작업 항목은 (epoch, seq, t_capture). epoch 을 state 보다 먼저 읽음 (부모는 state -> epoch 순으로 갱신) """
+    _worker_init()
+    ring = FrameRing.attach(ring_spec)
+    frames = open_source(opts.source, ring.shape, opts.fps)
+    try:
+        while not stop.is_set():
+            frame, t_capture = next(frames)
+            seq = ring.write(frame)
+            item_epoch = epoch.value
+            put_latest(work_queues[STATES[state.value]], (item_epoch, seq, t_capture))
+    finally:
+        frames.close()
+        ring.close()
+
+
+def detect_worker(ring_spec, in_q, out_q, stop, epoch, level, opts):
+    """ STOPPED: YOLOE + TiltTracker (main.py car_stopped_task 와 같은 StoppedStage) """
+    _worker_init()
+    frame_policy.max_age_s.update(parse_max_age(opts.max_age))
+    ring = FrameRing.attach(ring_spec)
+    model = load_models(opts, "detect")
+    detector, roi = build_detector(model, opts)
+    link = _GovernorLink(level)
+    metrics_link = _MetricsLink()
+    stage = StoppedStage(model, detector, roi, mask_tilt=opts.mask_tilt, governor=link)
+    buf = np.empty(ring.shape, ring.dtype)
+    overlay = Overlay()
+    try:
+        while not stop.is_set():
+            item = _get(in_q)
+            if item is None:
+                continue
+            item_epoch, seq, t_capture = item
+            # 이전 상태에서 넣어 둔 항목, governor 추론 간격 안에 들어온 항목은 처리하지 않음
+            if item_epoch != epoch.value or stage.interval_left() > 0:
+                continue
+            frame = ring.read(seq, out=buf)
+            if frame is None:
+                continue
+
+            # 정차할 때마다(epoch) 트래커를 새로 시작
+            knobs = stage.begin(item_epoch)
+            result = stage.detect(frame, knobs)
+            overlay.reset()
+            detections = stage.analyze(frame, t_capture, result, overlay)
+            if detections is None:
+                continue
+            put_latest(out_q, {"state": "STOPPED", "epoch": item_epoch, "seq": seq, "t_capture": t_capture, "t_result": time.monotonic(),
+                               "items": overlay.items, "coord_size": None, "fields": {"detections": detections},
+                               "observed": link.take(), "metrics": metrics_link.take()})
+    finally:
+        ring.close()
+
+
+def pose_worker(ring_spec, in_q, out_q, stop, epoch, level, opts):
+    """ MOVING: pose + 거리 추정 (main.py car_moved_task 와 같은 MovingStage, 주석 좌표는 640x480 기준) """
+    _worker_init()
+    frame_policy.max_age_s.update(parse_max_age(opts.max_age))
+    ring = FrameRing.attach(ring_spec)
+    pose, H = load_models(opts, "pose")
+    link = _GovernorLink(level)
+    metrics_link = _MetricsLink()
+    stage = MovingStage(pose, H, governor=link)
+    buf = np.empty(ring.shape, ring.dtype)
+    overlay = Overlay()
+    try:
+        while not stop.is_set():
+            item = _get(in_q)
+            if item is None:
+                continue
+            item_epoch, seq, t_capture = item
+            if item_epoch != epoch.value or stage.interval_left() > 0:
+                continue
+            frame = ring.read(seq, out=buf)
+            if frame is None:
+                continue
+
+            stage.begin()
+            overlay.reset()
+            _, objects = stage.detect(frame, overlay)
+            put_latest(out_q, {"state": "MOVING", "epoch": item_epoch, "seq": seq, "t_capture": t_capture, "t_result": time.monotonic(),
+                               "items": overlay.items, "coord_size": (640, 480),
+                               "fields": {"distances": stage.report(objects)}, "observed": link.take(),
+                               "metrics": metrics_link.take()})
+    finally:
+        ring.close()
+
+
+class _OutputStats:
+    """ 상태별 처리 FPS 와 캡처 기준 지연 (결과 생성, 화면 출력) """
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.frames = {s: 0 for s in STATES}
+        self.active_s = {s: 0.0 for s in STATES}   # 해당 상태 결과가 나온 시간 (FPS 분모)
+        self.result_ms = {s: deque(maxlen=LATENCY_SAMPLES) for s in STATES}
+        self.output_ms = {s: deque(maxlen=LATENCY_SAMPLES) for s in STATES}
+        self.stale = 0       # 출력하려는데 링 버퍼 슬롯이 이미 덮어써진 프레임 수
+        self.cancelled = 0   # 추론 도중 상태가 바뀌어 버린 결과 수
+        self._last = None
+
+    def add(self, msg, t_out):
+        state = msg["state"]
+        if self._last is not None and self._last[0] == state:
+            self.active_s[state] += t_out - self._last[1]
+        self._last = (state, t_out)
+        self.frames[state] += 1
+        self.result_ms[state].append((msg["t_result"] - msg["t_capture"]) * 1000.0)
+        self.output_ms[state].append((t_out - msg["t_capture"]) * 1000.0)
+
+    def summary(self):
+        out = {"seconds": time.monotonic() - self.start, "stale_frames": self.stale,
+               "cancelled": self.cancelled, "states": {}}
+        for s in STATES:
+            if not self.frames[s]:
+                continue
+            res, outp = np.asarray(self.result_ms[s]), np.asarray(self.output_ms[s])
+            out["states"][s] = {
+                "frames": self.frames[s],
+                "fps": (self.frames[s] - 1) / self.active_s[s] if self.active_s[s] > 0 else 0.0,
+                "result_latency_ms": {"p50": float(np.percentile(res, 50)), "p95": float(np.percentile(res, 95))},
+                "output_latency_ms": {"p50": float(np.percentile(outp, 50)), "p95": float(np.percentile(outp, 95))},
+            }
+        return out
+
+
+def _print_summary(tag, summary):
+    for s, r in summary["states"].items():
+        print(f"[{tag}] {s:<8} {r['fps']:6.1f} FPS | result p50 {r['result_latency_ms']['p50']:6.1f} / "
+              f"p95 {r['result_latency_ms']['p95']:6.1f} ms | output p50 {r['output_latency_ms']['p50']:6.1f} / "
+              f"p95 {r['output_latency_ms']['p95']:6.1f} ms ({r['frames']} frames)")
+
+
+def output_worker(ring_spec, out_q, stop, state_value, epoch, level, opts):
+    """
+    결과 메타데이터 + 링 버퍼 프레임으로 화면/HTTP 출력, 종료 시 통계를 opts.report 에 저장.
+    워커가 보낸 단계 지연으로 governor 를 갱신하고 단계를 공유 값(level)에 씀.
+    /metrics 는 이 프로세스의 REGISTRY 에 워커 프로세스 스냅샷을 합쳐 노출 (상태 지표는 여기서 기록)
+    """
+    _worker_init()
+    from src.common.frame_slot import FrameSlot
+    from src.common.http_stream import StatusServer, RateMeter
+
+    frame_policy.max_age_s.update(parse_max_age(opts.max_age))
+    governor = make_governor(opts)
+    ring = FrameRing.attach(ring_spec)
+    slot = FrameSlot()
+    server = StatusServer(slot, host=opts.host, port=opts.port).start() if opts.port else None
+    meters = {s: RateMeter() for s in STATES}
+    stats = _OutputStats()
+    overlay = Overlay()
+    next_report = time.monotonic() + REPORT_INTERVAL_S
+    current, current_epoch, last_tick = None, 0, time.monotonic()
+    try:
+        while not stop.is_set():
+            # 상태 지표 (부모는 state -> epoch 순으로 갱신하므로 epoch 먼저 읽음, epoch 0 은 첫 판정 전)
+            new_epoch = epoch.value
+            if new_epoch != current_epoch:
+                new_state = STATES[state_value.value]
+                if current is not None and new_state != current:
+                    metrics.STATE_TRANSITIONS.labels(new_state).inc()
+                for s in STATES:
+                    metrics.STATE.labels(s).set(1 if s == new_state else 0)
+                current, current_epoch = new_state, new_epoch
+            now = time.monotonic()
+            if current is not None:
+                metrics.STATE_SECONDS.labels(current).inc(now - last_tick)
+            last_tick = now
+
+            msg = _get(out_q)
+            if msg is not None:
+                # 상태가 바뀌어 버리는 결과라도 단계 지연과 지표는 반영
+                for name, seconds in msg["observed"].items():
+                    governor.observe(name, seconds)
+                if msg["metrics"] is not None:
+                    metrics.REGISTRY.merge(msg["state"], msg["metrics"])
+            if msg is not None and msg["epoch"] != epoch.value:
+                stats.cancelled += 1
+                msg = None
+            if msg is not None:
+                state = msg["state"]
+                latency_ms = frame_policy.alert(state, msg["t_capture"])
+                # 이미 낡은 프레임은 그리지 않음 (main.py 와 같은 {state}/render 최대 나이)
+                render = (not opts.headless or (server is not None and server.has_clients)) and \
+                    frame_policy.fresh(f"{state}/render", msg["t_capture"])
+                if render:
+                    frame = ring.read(msg["seq"])
+                    if frame is None:
+                        stats.stale += 1
+                    else:
+                        if msg["coord_size"] is not None:
+                            frame = cv2.resize(frame, msg["coord_size"])
+                        overlay.items = msg["items"]
+                        display = overlay.render(frame, DISPLAY_SIZE)
+                        slot.publish(display)
+                        if not opts.headless:
+                            cv2.imshow("Smart Forklift System (mp)", display)
+                stats.add(msg, time.monotonic())
+                fps = meters[state].tick()
+                metrics.PIPELINE_FPS.labels(state).set(round(fps, 2))
+                if server is not None:
+                    server.update_status(state=state, fps=round(fps, 1), latency_ms=round(latency_ms, 1), **msg["fields"])
+
+            if governor.maybe_update():
+                level.value = governor.level
+                if server is not None:
+                    server.update_status(governor=governor.status())
+
+            if not opts.headless and cv2.waitKey(1) & 0xFF == ord("q"):
+                stop.set()
+            if time.monotonic() >= next_report:
+                next_report += REPORT_INTERVAL_S
+                _print_summary("Output", stats.summary())
+    finally:
+        summary = stats.summary()
+        if opts.report:
+            with open(opts.report, "w", encoding="utf-8") as f:
+                json.dump(summary, f, indent=2)
+        if server is not None:
+            server.stop()
+        if not opts.headless:
+            cv2.destroyAllWindows()
+        ring.close()
+
+
+# ==========================================
+# [3] 감독 (워커 실행 / 재시작 / 종료)
+# ==========================================
+class Supervisor:
+    """
+    워커를 프로세스(runtime="processes") 또는 스레드(runtime="threads", 비교용)로 실행.
+    stop 이벤트 없이 끝난 워커는 RESTART_DELAY_S 뒤에 다시 띄움 (세션 자원은 부모가 소유하므로 그대로 재사용).
+    """
+
+    def __init__(self, ctx, runtime="processes"):
+        self.ctx = ctx
+        self.runtime = runtime
+        self.stop = ctx.Event()
+        self.failed = False
+        self._workers = {}    # name -> [target, args, handle, restart 시각들, 죽은 시각]
+
+    def add(self, name, target, *args):
+        self._workers[name] = [target, args, None, deque(), None]
+
+    def _spawn(self, name):
+        target, args = self._workers[name][:2]
+        if self.runtime == "processes":
+            handle = self.ctx.Process(target=target, args=args, name=name, daemon=True)
+        else:
+            handle = threading.Thread(target=target, args=args, name=name, daemon=True)
+        handle.start()
+        self._workers[name][2] = handle
+        return handle
+
+    def start(self):
+        for name in self._workers:
+            self._spawn(name)
+        print(f"[Supervisor] {self.runtime}: " + ", ".join(
+            f"{n}({getattr(w[2], 'pid', None) or 'thread'})" for n, w in self._workers.items()))
+
+    def poll(self):
+        """ 죽은 워커 재시작. 너무 자주 죽으면 stop 을 걸고 False 반환 """
+        now = time.monotonic()
+        for name, worker in self._workers.items():
+            handle = worker[2]
+            if handle.is_alive() or self.stop.is_set():
+                continue
+            if worker[4] is None:
+                code = getattr(handle, "exitcode", None)
+                print(f"[Supervisor] '{name}' 워커 종료됨 (exitcode={code}), {RESTART_DELAY_S:.0f}s 후 재시작")
+                worker[4] = now
+            if now - worker[4] < RESTART_DELAY_S:
+                continue
+            restarts = worker[3]
+            while restarts and now - restarts[0] > RESTART_WINDOW_S:
+                restarts.popleft()
+            if len(restarts) >= MAX_RESTARTS:
+                print(f"[Supervisor] '{name}' 가 {RESTART_WINDOW_S:.0f}s 안에 {MAX_RESTARTS}회 이상 죽어 종료합니다.")
+                self.failed = True
+                self.stop.set()
+                return False
+            restarts.append(now)
+            worker[4] = None
+            handle = self._spawn(name)
+            print(f"[Supervisor] '{name}' 재시작 (pid={getattr(handle, 'pid', 'thread')}, {len(restarts)}회)")
+        return True
+
+    def shutdown(self):
+        self.stop.set()
+        deadline = time.monotonic() + JOIN_TIMEOUT_S
+        for name, worker in self._workers.items():
+            handle = worker[2]
+            handle.join(max(0.0, deadline - time.monotonic()))
+            if handle.is_alive() and self.runtime == "processes":
+                print(f"[Supervisor] '{name}' 가 멈추지 않아 강제 종료")
+                handle.terminate()
+                handle.join(1.0)
+
+
+def run(opts, runtime):
+    """ 한 번 실행하고 출력 워커의 통계(dict) 반환 """
+    ctx = mp.get_context("spawn")
+    ring = FrameRing.create(source_shape(opts.source), slots=RING_SLOTS)
+    work_queues = {s: ctx.Queue(WORK_QUEUE_SIZE) for s in STATES}
+    out_q = ctx.Queue(OUT_QUEUE_SIZE)
+    state = ctx.Value("i", STATES.index("MOVING"), lock=False)
+    epoch = ctx.Value("i", 0)
+    level = ctx.Value("i", 0, lock=False)   # governor 단계 (output 워커가 씀)
+
+    sup = Supervisor(ctx, runtime)
+    sup.add("capture", capture_worker, ring.spec, work_queues, state, epoch, sup.stop, opts)
+    sup.add("detect", detect_worker, ring.spec, work_queues["STOPPED"], out_q, sup.stop, epoch, level, opts)
+    sup.add("pose", pose_worker, ring.spec, work_queues["MOVING"], out_q, sup.stop, epoch, level, opts)
+    sup.add("output", output_worker, ring.spec, out_q, sup.stop, state, epoch, level, opts)
+
+    md = None
+    if opts.state is None:
+        try:
+            import motion_detector as md
+            md.initialize_bmi160()
+        except Exception as e:
+            print(f"센서 초기화 실패, 안전 모드(MOVING)로 시작: {e}")
+
+    sup.start()
+    start = time.monotonic()
+    last_state = None
+    print("System Started (multiprocess). Press 'q' in the window or Ctrl+C to exit.")
+    try:
+        while not sup.stop.is_set():
+            now = time.monotonic()
+            if opts.state == "alternate":
+                new_state = STATES[int((now - start) // SWITCH_EVERY_S) % 2]
+            elif opts.state is not None:
+                new_state = opts.state
+            elif md is not None:
+                new_state = "MOVING" if md.check_motion_state() else "STOPPED"
+            else:
+                new_state = "MOVING"
+
+            if new_state != last_state:
+                # state 먼저, epoch 나중 (캡처가 새 epoch 을 읽었으면 state 도 새 값)
+                state.value = STATES.index(new_state)
+                with epoch.get_lock():
+                    epoch.value += 1
+                print(f"\n--- State changed to: {new_state} ---\n")
+                last_state = new_state
+
+            if opts.duration and now - start >= opts.duration:
+                break
+            if not sup.poll():
+                break
+            time.sleep(STATE_POLL_S)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # 정리 중 Ctrl+C 를 한 번 더 눌러도 공유 메모리 정리까지는 마침
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGINT, signal.SIG_IGN)
+        sup.shutdown()
+        captured = ring.latest_seq + 1
+        for q in list(work_queues.values()) + [out_q]:
+            q.cancel_join_thread()
+            q.close()
+        ring.close()
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    summary = {}
+    if opts.report and os.path.exists(opts.report):
+        with open(opts.report, encoding="utf-8") as f:
+            summary = json.load(f)
+    summary.update({"runtime": runtime, "captured_frames": captured, "failed": sup.failed})
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Smart Forklift System (multiprocess runtime)")
+    parser.add_argument("--source", default="camera", help="camera / synthetic / 녹화 영상 경로")
+    parser.add_argument("--fps", type=float, default=30.0, help="녹화/합성 영상 재생 속도 (0: 최대)")
+    parser.add_argument("--state", choices=STATES + ("alternate",), default=None,
+                        help="센서 대신 고정 상태 사용 (alternate: SWITCH_EVERY_S 마다 전환)")
+    parser.add_argument("--stub-models", action="store_true", help="모델 대역 사용 (가중치 없이 실행)")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0)
+    parser.add_argument("--headless", action="store_true", help="cv2.imshow 없이 실행 (HTTP 스트림으로만 확인)")
+    parser.add_argument("--host", default="127.0.0.1", help="상태 서버 주소")
+    parser.add_argument("--port", type=int, default=None,
+                        help="상태 서버 포트 (기본: --headless 이면 8080, 화면 모드는 서버 끔 / 0: 서버 끔)")
+    parser.add_argument("--duration", type=float, default=0.0, help="이 시간(초) 후 종료 (0: 계속)")
+    parser.add_argument("--runtime", choices=("processes", "threads"), default="processes")
+    parser.add_argument("--compare", action="store_true",
+                        help="같은 설정으로 이 파일의 threads 런타임(같은 워커를 스레드로 실행)과 processes 런타임을 "
+                             "차례로 실행해 비교. 검출/거리 추정 단계(ROI, --tiles, governor, 최대 나이)는 main.py 와 "
+                             "같고, 유휴 모델 워밍업(ModelScheduler)과 --tilt-graph 는 main.py 에만 있음")
+    add_stage_arguments(parser)   # --mask-tilt, --no-roi, --tiles, --tile-region, --max-age, governor
+    parser.add_argument("--report", default=None, help="통계 JSON 저장 경로")
+    args = parser.parse_args()
+    if args.port is None:
+        from src.common.http_stream import DEFAULT_PORT
+        args.port = DEFAULT_PORT if args.headless else 0
+    try:
+        parse_max_age(args.max_age)
+    except ValueError as e:
+        parser.error(str(e))
+
+    runtimes = ("threads", "processes") if args.compare else (args.runtime,)
+    if args.compare and not args.duration:
+        args.duration = 20.0
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        final_report = args.report
+        for runtime in runtimes:
+            args.report = os.path.join(tmp, f"{runtime}.json")
+            results[runtime] = run(args, runtime)
+            _print_summary(runtime, results[runtime])
+            print(f"[{runtime}] captured {results[runtime]['captured_frames']} frames, "
+                  f"stale {results[runtime].get('stale_frames', 0)}, cancelled {results[runtime].get('cancelled', 0)}")
+        if final_report:
+            with open(final_report, "w", encoding="utf-8") as f:
+                json.dump(results if args.compare else results[args.runtime], f, indent=2)
+            print(f"[Report] saved: {final_report}")
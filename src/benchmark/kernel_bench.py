@@ -0,0 +1,283 @@
+"""
+모델/카메라 없이 돌릴 수 있는 CPU 커널 마이크로 벤치마크.
+
+결정적인 합성 입력(회전 사각형, 기울어진 선 무늬, keypoint 배열)을 여러 크기로 만들어
+각 커널의 실행 시간(중앙값, p95)을 재고, 동시에 결과가 맞는지(불변식)도 확인함.
+불변식이 깨지거나 --baseline 대비 느려지면 exit 1 -> 빠른 회귀 검사용.
+
+사용법 (프로젝트 루트에서):
+    python -m src.benchmark.kernel_bench
+    python -m src.benchmark.kernel_bench --kernels tilt_hough draw_radar --output kernels.json
+    python -m src.benchmark.kernel_bench --baseline kernels.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from src.benchmark.stubs import stub_homography
+from src.models.result_types import Keypoints
+from src.tilt.tilt_detection import analyze_tilt_fast, analyze_tilt_hough
+from src.person_detection.distance_estimation import (
+    get_features, calculate_ensemble_distance, apply_correction, get_status_info,
+)
+from src.detection.masking import mask_background
+from src.person_detection.main_system import draw_radar, RADAR_PALETTE
+
+# ==========================================
+# [설정]
+# ==========================================
+SCALES = ((120, 160), (240, 320), (480, 640))   # 크롭 크기 (h, w)
+ANGLES = (0.0, 2.0, 6.0, 12.0)                   # 합성 기울기 (도)
+# Hough: 판정 경계(3°) 양쪽 케이스 추가. 높이 240px 미만 크롭은 계단 현상 때문에 작은 기울기를
+# 분해하지 못하므로 (120px 에서 3.5° 를 0.7° 로 측정) 정확도 케이스에서 제외 (tilt_tracker 의 hough-min 도 240px)
+HOUGH_ANGLES = (0.0, 2.0, 2.5, 3.5, 6.0, 12.0)
+HOUGH_SCALES = tuple(s for s in SCALES if s[0] >= 240)
+HOUGH_TOLERANCE_DEG = 0.5
+MIN_TIME_S = 0.2       # 케이스당 최소 측정 시간
+MAX_REPEAT = 2000
+TOLERANCE = 0.15       # 기준 대비 허용 성능 저하 (마이크로 벤치는 변동이 커서 15%)
+
+
+# ==========================================
+# [1] 합성 입력
+# ==========================================
+def rotated_rect_crop(shape, angle, fg=200, bg=30):
+    """ 어두운 배경 가운데에 angle 만큼 회전한 밝은 사각형 (analyze_tilt_fast 용) """
+    h, w = shape
+    img = np.full((h, w, 3), bg, dtype=np.uint8)
+    rect = ((w / 2, h / 2), (w * 0.5, h * 0.6), angle)
+    cv2.fillPoly(img, [cv2.boxPoints(rect).astype(np.int32)], (fg, fg, fg))
+    return img
+
+
+def line_field(shape, angle, spacing=None, seed=0, supersample=4):
+    """
+    수직에서 angle 만큼 기운 평행선 무늬 + 약한 잡음 (analyze_tilt_hough 용).
+    작은 크롭에서 계단 현상이 수직선으로 잡히지 않도록 크게 그린 뒤 INTER_AREA 로 축소.
+    """
+    h, w = shape
+    H, W = h * supersample, w * supersample
+    img = np.full((H, W, 3), 200, dtype=np.uint8)
+    spacing = (spacing or max(8, w // 10)) * supersample
+    dx = np.tan(np.deg2rad(angle)) * H
+    for x in range(-int(abs(dx)) - spacing, W + int(abs(dx)) + spacing, spacing):
+        cv2.line(img, (x, 0), (int(x + dx), H), (10, 10, 10), 2 * supersample, cv2.LINE_AA)
+    img = cv2.resize(img, (w, h), interpolation=cv2.INTER_AREA)
+    noise = np.random.default_rng(seed).integers(-8, 9, img.shape)
+    return np.clip(img.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+
+
+def person_keypoints(torso_px, foot_y, cx=320.0, visible=True):
+    """ distance_estimation.get_features 순서의 8 keypoints (어깨, 엉덩이, 무릎, 발목 좌/우) """
+    body = torso_px / 0.3
+    ys = [foot_y - 0.75 * body] * 2 + [foot_y - 0.45 * body] * 2 + [foot_y - 0.22 * body] * 2 + [foot_y] * 2
+    xs = [cx - 10, cx + 10] * 4
+    conf = [0.9] * 6 + [0.9 if visible else 0.1] * 2
+    return Keypoints(np.array([[[x, y, c] for x, y, c in zip(xs, ys, conf)]], dtype=np.float32))
+
+
+# ==========================================
+# [2] 커널별 케이스: (이름, 실행 함수, 불변식 검사 함수)
+# ==========================================
+def _tilt_fast_cases():
+    for shape in SCALES:
+        for angle in ANGLES:
+            img = rotated_rect_crop(shape, angle)
+
+            def check(out, angle=angle):
+                status, _, measured = out
+                ok = abs(measured - angle) <= 1.5 and (status == "TILTED") == (angle > 10)
+                return ok, f"angle {measured:.2f} (expected {angle}), {status}"
+            yield f"{shape[1]}x{shape[0]}@{angle:g}", (lambda img=img: analyze_tilt_fast(img)), check
+
+
+def _tilt_hough_cases():
+    for shape in HOUGH_SCALES:
+        for angle in HOUGH_ANGLES:
+            img = line_field(shape, angle)
+
+            def check(out, angle=angle):
+                status, _, measured = out
+                ok = abs(measured - angle) <= HOUGH_TOLERANCE_DEG and (status == "WARNING: TILTED") == (angle > 3.0)
+                return ok, f"angle {measured:.2f} (expected {angle}), {status}"
+            yield f"{shape[1]}x{shape[0]}@{angle:g}", (lambda img=img: analyze_tilt_hough(img)), check
+
+
+def _get_features_cases():
+    for torso in (30.0, 50.0, 80.0):
+        kp = person_keypoints(torso, 400.0)
+
+        def check(out, torso=torso):
+            foot, torso_len = out
+            ok = foot is not None and abs(foot[1] - 400.0) < 1e-3 and abs(torso_len - torso) < 1e-3
+            return ok, f"foot {foot}, torso {torso_len}"
+        yield f"torso{torso:g}", (lambda kp=kp: get_features(kp, torso / 0.3)), check
+
+    # 발목이 안 보이면 무릎 + box_h * 0.25 로 발 위치 추정
+    kp = person_keypoints(50.0, 400.0, visible=False)
+    body = 50.0 / 0.3
+    expected = 400.0 - 0.22 * body + body * 0.25
+
+    def check_knee(out):
+        foot, _ = out
+        ok = foot is not None and abs(foot[1] - expected) < 1e-3
+        return ok, f"foot y {None if foot is None else foot[1]:.2f} (expected {expected:.2f})"
+    yield "knee_fallback", (lambda: get_features(kp, body)), check_knee
+
+
+def _ensemble_cases():
+    H = stub_homography()
+    torsos = (25.0, 40.0, 60.0, 90.0)
+
+    def run_all():
+        return [calculate_ensemble_distance([320.0, 300.0], t, 480, H) for t in torsos]
+
+    def check(out):
+        dists = [d for _, d, _ in out]
+        # 같은 발 위치에서 몸통이 길수록(가까울수록) 거리는 줄어들어야 함
+        ok = all(a > b for a, b in zip(dists, dists[1:])) and all(m == "Mix" for _, _, m in out)
+        return ok, f"dists {[round(float(d), 2) for d in dists]}, methods {[m for _, _, m in out]}"
+    yield "mix_x4", run_all, check
+
+    def check_clipped(out):
+        _, dist, method = out
+        return method == "Stat" and dist > 0, f"{method} {dist:.2f}"
+    yield "clipped_foot", (lambda: calculate_ensemble_distance([320.0, 470.0], 40.0, 480, H)), check_clipped
+
+    def check_no_h(out):
+        return out[2] == "Stat", out[2]
+    yield "no_homography", (lambda: calculate_ensemble_distance([320.0, 300.0], 40.0, 480, None)), check_no_h
+
+
+def _correction_cases():
+    scalar = 2.0
+    array = np.linspace(0.5, 6.0, 10000)
+
+    def check_scalar(out):
+        ok = np.isclose(out, apply_correction(np.array([scalar]))[0])
+        return ok, f"{out:.4f}"
+    yield "scalar", (lambda: apply_correction(scalar)), check_scalar
+
+    def check_array(out):
+        ok = out.shape == array.shape and bool(np.all(np.diff(out) > 0))
+        return ok, "monotonic" if ok else "not monotonic"
+    yield "array10k", (lambda: apply_correction(array)), check_array
+
+
+def _mask_cases():
+    for shape in SCALES:
+        h, w = shape
+        rng = np.random.default_rng(1)
+        img = rng.integers(1, 255, (h, w, 3), dtype=np.uint8)
+        boxes = np.array([[w * 0.1, h * 0.1, w * 0.4, h * 0.5], [w * 0.5, h * 0.3, w * 0.9, h * 0.9]]).astype(int)
+
+        def check(out, img=img, boxes=boxes):
+            out = np.asarray(out)
+            inside = np.zeros(img.shape[:2], bool)
+            for x1, y1, x2, y2 in boxes:
+                inside[y1:y2, x1:x2] = True
+            # 테두리(3px)는 제외하고 비교
+            core = np.zeros_like(inside)
+            outer = np.ones_like(inside)
+            for x1, y1, x2, y2 in boxes:
+                core[y1 + 3:y2 - 3, x1 + 3:x2 - 3] = True
+                outer[max(y1 - 3, 0):y2 + 3, max(x1 - 3, 0):x2 + 3] = False
+            ok = out.shape == img.shape and np.array_equal(out[core], img[core]) and not out[outer].any()
+            return ok, "box pixels kept, background cleared" if ok else "mask mismatch"
+        yield f"{w}x{h}", (lambda img=img, boxes=boxes: mask_background(img, boxes)), check
+
+
+def _radar_cases():
+    for n in (0, 1, 5, 20):
+        rng = np.random.default_rng(n)
+        objects = [(float(x), float(z), None) for x, z in zip(rng.uniform(-1.5, 1.5, n), rng.uniform(0.5, 4.5, n))]
+
+        def check(out, objects=objects):
+            ok = out.shape == (400, 400, 3)
+            for x, z, _ in objects[-1:]:   # 마지막 마커는 다른 마커에 가려지지 않음
+                px = int(np.clip(200 + x * 100.0, 0, 399))
+                py = int(np.clip(400 - z * 80.0, 0, 399))
+                status, color = get_status_info(z)
+                ok = ok and tuple(int(v) for v in out[py, px]) == color and color in RADAR_PALETTE
+            return ok, f"{len(objects)} markers"
+        yield f"{n}obj", (lambda objects=objects: draw_radar(objects)), check
+
+
+KERNELS = {
+    "tilt_fast": _tilt_fast_cases,
+    "tilt_hough": _tilt_hough_cases,
+    "get_features": _get_features_cases,
+    "ensemble_distance": _ensemble_cases,
+    "apply_correction": _correction_cases,
+    "mask_background": _mask_cases,
+    "draw_radar": _radar_cases,
+}
+
+
+# ==========================================
+# [3] 측정
+# ==========================================
+def time_case(fn, min_time=MIN_TIME_S, max_repeat=MAX_REPEAT):
+    """ min_time 동안(최대 max_repeat 회) 반복 실행, 호출별 시간(µs) 배열 반환 """
+    fn()   # 워밍업 (캐시 생성 등)
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while len(samples) < max_repeat and (len(samples) < 5 or time.perf_counter() < deadline):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1e6)
+    return np.asarray(samples)
+
+
+def run(kernels, min_time=MIN_TIME_S):
+    report, failures = {}, []
+    for kernel in kernels:
+        for case, fn, check in KERNELS[kernel]():
+            ok, detail = check(fn())
+            us = time_case(fn, min_time)
+            name = f"{kernel}/{case}"
+            report[name] = {"median_us": float(np.median(us)), "p95_us": float(np.percentile(us, 95)),
+                            "runs": int(us.size), "ok": bool(ok), "detail": detail}
+            if not ok:
+                failures.append(f"{name}: {detail}")
+            print(f"{name:<36}{np.median(us):>11.1f}{np.percentile(us, 95):>11.1f}  {'ok ' if ok else 'FAIL'} {detail}")
+    return report, failures
+
+
+def compare(report, baseline, tolerance=TOLERANCE):
+    regressions = []
+    for name, cur in report.items():
+        base = baseline.get(name)
+        if base and cur["median_us"] > base["median_us"] * (1 + tolerance):
+            regressions.append(f"{name}: {base['median_us']:.1f} -> {cur['median_us']:.1f} us")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geometry kernel micro-benchmarks")
+    parser.add_argument("--kernels", nargs="+", choices=list(KERNELS), default=list(KERNELS))
+    parser.add_argument("--min-time", type=float, default=MIN_TIME_S, help="케이스당 최소 측정 시간 (s)")
+    parser.add_argument("--output", default=None, help="JSON 결과 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 JSON")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    print(f"{'kernel/case':<36}{'median us':>11}{'p95 us':>11}  check")
+    report, failures = run(args.kernels, args.min_time)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[Bench] report saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            failures += [f"REGRESSION {r}" for r in compare(report, json.load(f), args.tolerance)]
+
+    for line in failures:
+        print(f"[Bench] {line}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,175 @@
+"""
+마스크 기반 기울기(mask_tilt) vs 크롭 Hough(analyze_tilt_hough) 비교 벤치마크.
+
+같은 검출 결과의 객체마다 두 방식으로 각도를 구해
+  - 객체당 분석 시간 (중앙값, p95)
+  - 두 방식의 각도 차이, 판정(TILTED 여부) 일치율
+  - 합성 영상이면 실제 기울기 대비 오차
+를 보고함. 추론 시간은 마스크 유지(task="segment") 여부에 따라 따로 측정.
+
+기본은 합성 팔레트(정답 각도를 아는 영상) + StubDetector 윤곽 마스크로 실행되고,
+--real-models 이면 YOLOE-seg 와 녹화 영상(--data)으로 실행 (정답이 없으므로 일치도만 보고).
+
+사용법 (프로젝트 루트에서):
+    python -m src.benchmark.mask_tilt_bench
+    python -m src.benchmark.mask_tilt_bench --imgsz 640 --method moments
+    python -m src.benchmark.mask_tilt_bench --real-models --data data/testData --output mask_tilt.json
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from src.benchmark.stubs import FRAME_SHAPE, StubDetector, draw_pallet
+from src.common.recorded_frames import iter_frames
+from src.detection.object_detection import run_inference
+from src.tilt.mask_tilt import METHOD, polygon_angle
+from src.tilt.tilt_detection import analyze_tilt_hough
+from src.tilt.tilt_tracker import box_iou
+
+# ==========================================
+# [설정]
+# ==========================================
+ANGLES = (0.0, 1.0, 2.0, 3.5, 5.0, 7.0, 10.0, 15.0)   # 합성 기울기 (도)
+SCALES = (0.15, 0.25, 0.4)   # 팔레트 높이 / 프레임 높이
+TILT_THRESHOLD = 3.0         # 판정 일치율 계산용 (analyze_tilt_hough 기본값)
+DEFAULT_DATA = "data/testData"
+MAX_FRAMES = 100
+PERCENTILES = (50, 95)
+
+
+def synthetic_cases(shape=FRAME_SHAPE, seed=0):
+    """ (frame, 정답 박스 (1, 4), 정답 각도) 생성 - 프레임마다 팔레트 하나 """
+    rng = np.random.default_rng(seed)
+    h, w = shape[:2]
+    base = np.full(shape, 110, dtype=np.uint8)
+    base += rng.integers(0, 20, shape, dtype=np.uint8)
+    for scale in SCALES:
+        for angle in ANGLES:
+            for sign in (1, -1):
+                frame = base.copy()
+                size = (h * scale * 1.6, h * scale)
+                center = (w * rng.uniform(0.35, 0.65), h * rng.uniform(0.4, 0.6))
+                draw_pallet(frame, center, size, sign * angle)
+                half = np.array(size) / 2 + 0.15 * h * scale   # 회전해도 들어가는 대략적 박스
+                box = np.array([[center[0] - half[0], center[1] - half[1], center[0] + half[0], center[1] + half[1]]])
+                yield frame, box, angle
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - t0) * 1e6
+
+
+def compare_frame(model, frame, method, rec, truth_boxes=None, truth_angle=None):
+    """ 한 프레임의 모든 검출 객체를 두 방식으로 분석해 rec 에 누적 """
+    result, t_det = _time(run_inference, model, frame, 0, False)
+    result, t_seg = _time(run_inference, model, frame, 0, True)
+    rec["infer_detect_us"].append(t_det)
+    rec["infer_segment_us"].append(t_seg)
+    if result is None or result.masks is None:
+        return
+
+    boxes = result.boxes.xyxy.cpu().numpy().astype(int)
+    if truth_boxes is not None and len(boxes):
+        # 정답 팔레트와 겹치는 검출만 사용 (배경 오검출 제외)
+        boxes_keep = box_iou(boxes, truth_boxes).max(axis=1) > 0.3
+    else:
+        boxes_keep = np.ones(len(boxes), bool)
+
+    for (x1, y1, x2, y2), polygon, keep in zip(boxes.tolist(), result.masks.xy, boxes_keep):
+        if not keep:
+            continue
+        crop = frame[max(y1, 0):y2, max(x1, 0):x2]
+        if crop.size == 0:
+            continue
+        (_, _, hough), t_hough = _time(analyze_tilt_hough, crop, TILT_THRESHOLD)
+        mask, t_mask = _time(polygon_angle, polygon, method)
+        rec["hough_us"].append(t_hough)
+        rec["mask_us"].append(t_mask)
+        if mask is None:
+            rec["no_mask"] += 1
+            continue
+        hough = float(hough)
+        rec["pairs"].append((hough, mask, truth_angle))
+
+
+def summarize(rec):
+    def pct(values):
+        arr = np.asarray(values, dtype=np.float64)
+        if arr.size == 0:
+            return {}
+        return {"count": int(arr.size), "mean": float(arr.mean()),
+                **{f"p{q}": float(np.percentile(arr, q)) for q in PERCENTILES}}
+
+    pairs = rec["pairs"]
+    hough = np.array([p[0] for p in pairs], dtype=np.float64)
+    mask = np.array([p[1] for p in pairs], dtype=np.float64)
+    report = {
+        "objects": len(pairs),
+        "no_mask": rec["no_mask"],
+        "timing_us": {k: pct(rec[k]) for k in ("hough_us", "mask_us", "infer_detect_us", "infer_segment_us")},
+    }
+    if pairs:
+        report["agreement"] = {
+            "mean_abs_diff_deg": float(np.abs(hough - mask).mean()),
+            "verdict_agree": float(np.mean((hough > TILT_THRESHOLD) == (mask > TILT_THRESHOLD))),
+        }
+    truth = np.array([p[2] for p in pairs if p[2] is not None], dtype=np.float64)
+    if truth.size == len(pairs) and pairs:
+        report["error_vs_truth"] = {
+            name: {"mean_abs_deg": float(np.abs(est - truth).mean()),
+                   "p95_abs_deg": float(np.percentile(np.abs(est - truth), 95)),
+                   "verdict_correct": float(np.mean((est > TILT_THRESHOLD) == (truth > TILT_THRESHOLD)))}
+            for name, est in (("hough", hough), ("mask", mask))
+        }
+    return report
+
+
+def print_report(report):
+    t = report["timing_us"]
+    print(f"\n[MaskTilt] objects={report['objects']} (마스크 없음 {report['no_mask']})")
+    for key, label in (("hough_us", "hough / object"), ("mask_us", "mask / object"),
+                       ("infer_detect_us", "infer detect"), ("infer_segment_us", "infer segment")):
+        if t.get(key):
+            print(f"  {label:<16} p50 {t[key]['p50']:>10.1f} us   p95 {t[key]['p95']:>10.1f} us")
+    if t.get("hough_us") and t.get("mask_us"):
+        print(f"  speedup (p50)    x{t['hough_us']['p50'] / max(t['mask_us']['p50'], 1e-9):.0f}")
+    if "agreement" in report:
+        a = report["agreement"]
+        print(f"  hough vs mask    |diff| {a['mean_abs_diff_deg']:.2f}°, 판정 일치 {a['verdict_agree'] * 100:.1f}%")
+    for name, e in report.get("error_vs_truth", {}).items():
+        print(f"  {name:<5} vs truth   |err| {e['mean_abs_deg']:.2f}° (p95 {e['p95_abs_deg']:.2f}°), "
+              f"판정 정확 {e['verdict_correct'] * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mask-based tilt vs Hough tilt benchmark")
+    parser.add_argument("--real-models", action="store_true", help="YOLOE-seg + 녹화 영상 사용 (정답 없음)")
+    parser.add_argument("--data", default=DEFAULT_DATA)
+    parser.add_argument("--frames", type=int, default=MAX_FRAMES)
+    parser.add_argument("--method", choices=("rect", "moments"), default=METHOD)
+    parser.add_argument("--imgsz", type=int, default=256, help="StubDetector 윤곽(마스크) 해상도")
+    parser.add_argument("--output", default=None, help="JSON 보고서 저장 경로")
+    args = parser.parse_args()
+
+    rec = {"hough_us": [], "mask_us": [], "infer_detect_us": [], "infer_segment_us": [], "pairs": [], "no_mask": 0}
+    if args.real_models:
+        from src.models.yoloe_loader import load_yoloe_model
+        model = load_yoloe_model()
+        for frame in iter_frames(args.data, limit=args.frames):
+            compare_frame(model, frame, args.method, rec)
+    else:
+        model = StubDetector(max_boxes=3, imgsz=args.imgsz)
+        for frame, box, angle in synthetic_cases():
+            compare_frame(model, frame, args.method, rec, truth_boxes=box, truth_angle=angle)
+
+    report = summarize(rec)
+    report["meta"] = {"models": "real" if args.real_models else f"stub (imgsz {args.imgsz})", "method": args.method}
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[MaskTilt] report saved: {args.output}")
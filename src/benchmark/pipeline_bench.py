@@ -0,0 +1,283 @@
+"""
+녹화 영상(또는 합성 영상)을 파이프라인 모드별로 재생하는 end-to-end 벤치마크.
+
+  - tilt     : run_inference(YOLOE) -> TiltTracker (정차 중 경로)
+  - distance : process_distance_estimation(pose) (주행 중 경로)
+  - combined : SWITCH_EVERY 프레임마다 MOVING/STOPPED 를 전환하며 두 경로를 번갈아 실행
+               (정차할 때마다 트래커를 새로 만드는 main.py 동작 포함)
+
+기본은 src.benchmark.stubs 의 모델 대역을 사용하므로 가중치 없이 CPU 만으로 실행됨.
+결과는 처리량(FPS), 단계별 지연 백분위, 최대 RSS 를 JSON 으로 저장하고,
+--baseline 으로 저장해 둔 보고서와 비교해 기준 이상 느려지면 exit 1.
+
+사용법 (프로젝트 루트에서):
+    python -m src.benchmark.pipeline_bench --output bench.json
+    python -m src.benchmark.pipeline_bench --data data/testData --baseline bench.json
+    python -m src.benchmark.pipeline_bench --real-models --modes tilt
+    python -m src.benchmark.pipeline_bench --modes tilt --mask-tilt   # 마스크 기반 기울기
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.common.recorded_frames import list_clips, iter_frames
+from src.benchmark.stubs import StubDetector, StubPose, synthetic_clip, stub_homography
+from src.detection.object_detection import run_inference
+from src.tilt.tilt_tracker import TiltTracker
+from src.person_detection.distance_estimation import process_distance_estimation
+
+try:
+    import resource
+except ImportError:   # Windows
+    resource = None
+
+# ==========================================
+# [설정]
+# ==========================================
+MODES = ("tilt", "distance", "combined")
+DEFAULT_DATA = "data/testData"
+MAX_FRAMES = 300          # 모드당 재생할 최대 프레임 수
+SYNTHETIC_FRAMES = 120    # 녹화 영상이 없을 때 합성 프레임 수
+WARMUP_FRAMES = 5
+SWITCH_EVERY = 30         # combined 모드 상태 전환 주기 (프레임)
+TOLERANCE = 0.10          # 기준 대비 허용 성능 저하 (10%)
+PERCENTILES = (50, 95, 99)
+
+
+class LatencyRecorder:
+    """ 단계별 지연(ms) 원본 값을 모아 정확한 백분위를 계산 """
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, name, seconds):
+        self.samples.setdefault(name, []).append(seconds * 1000.0)
+
+    def summary(self):
+        result = {}
+        for name, values in self.samples.items():
+            arr = np.asarray(values)
+            result[name] = {"count": int(arr.size), "mean": float(arr.mean()), "max": float(arr.max()),
+                            **{f"p{q}": float(np.percentile(arr, q)) for q in PERCENTILES}}
+        return result
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def load_clips(data, max_frames):
+    """ 재생할 프레임을 미리 메모리에 올림 (디스크 I/O 를 측정에서 제외) """
+    clips = list_clips(data) if os.path.exists(data) else []
+    frames = []
+    for clip in clips:
+        frames.extend(iter_frames(clip, limit=max_frames - len(frames)))
+        if len(frames) >= max_frames:
+            break
+    if frames:
+        return frames, clips
+    n = min(SYNTHETIC_FRAMES, max_frames)
+    print(f"[Bench] '{data}' 에 녹화 영상이 없어 합성 영상 {n} 프레임을 사용합니다.")
+    return synthetic_clip(n), ["synthetic"]
+
+
+def make_models(real=False, latency_ms=0.0):
+    if real:
+        from src.models.yoloe_loader import load_yoloe_model
+        from src.models.pose_loader import load_pose_model
+        from src.person_detection.distance_estimation import load_calibration_data
+        return load_yoloe_model(), load_pose_model(), load_calibration_data()
+    return StubDetector(latency_ms=latency_ms), StubPose(latency_ms=latency_ms), stub_homography()
+
+
+# ==========================================
+# 모드별 한 프레임 처리
+# ==========================================
+class TiltPath:
+    def __init__(self, detector, use_masks=False):
+        self.detector = detector
+        self.use_masks = use_masks
+        self.tracker = TiltTracker(use_masks=use_masks)
+        self.frame_count = 0
+
+    def reset(self):
+        self.tracker = TiltTracker(use_masks=self.use_masks)
+
+    def step(self, frame, rec):
+        self.frame_count += 1
+        t0 = time.perf_counter()
+        result = run_inference(self.detector, frame, self.frame_count, self.use_masks)
+        t1 = time.perf_counter()
+        boxes = result.boxes.xyxy.cpu().numpy().astype(int) if result else np.zeros((0, 4), int)
+        verdicts = self.tracker.update(frame, boxes, result.masks if result else None)
+        t2 = time.perf_counter()
+        rec.add("detect", t1 - t0)
+        rec.add("tilt", t2 - t1)
+        return len(verdicts)
+
+
+class DistancePath:
+    def __init__(self, pose, H):
+        self.pose = pose
+        self.H = H
+        self.danger_frames = 0
+
+    def step(self, frame, rec):
+        t0 = time.perf_counter()
+        _, objects = process_distance_estimation(self.pose, frame, self.H, draw=False)
+        rec.add("distance", time.perf_counter() - t0)
+        self.danger_frames += any(status == "DANGER" for _, _, status in objects)
+        return len(objects)
+
+
+def run_mode(mode, frames, detector, pose, H, mask_tilt=False):
+    tilt = TiltPath(detector, mask_tilt) if mode in ("tilt", "combined") else None
+    dist = DistancePath(pose, H) if mode in ("distance", "combined") else None
+
+    def step(i, frame, rec):
+        if mode == "tilt":
+            return tilt.step(frame, rec)
+        if mode == "distance":
+            return dist.step(frame, rec)
+        # combined: MOVING 구간과 STOPPED 구간을 번갈아 처리
+        moving = (i // SWITCH_EVERY) % 2 == 0
+        if i % SWITCH_EVERY == 0:
+            rec.add("switch", 0.0)
+            if not moving:
+                tilt.reset()
+        return dist.step(frame, rec) if moving else tilt.step(frame, rec)
+
+    warm = LatencyRecorder()
+    for i, frame in enumerate(frames[:WARMUP_FRAMES]):
+        step(i, frame, warm)
+
+    rec = LatencyRecorder()
+    outputs = 0
+    start = time.perf_counter()
+    for i, frame in enumerate(frames):
+        t0 = time.perf_counter()
+        outputs += step(i, frame, rec)
+        rec.add("frame", time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+
+    latency = rec.summary()
+    switches = latency.pop("switch", {}).get("count", 0)
+    report = {
+        "frames": len(frames),
+        "seconds": elapsed,
+        "fps": len(frames) / elapsed if elapsed > 0 else 0.0,
+        "outputs": outputs,
+        "latency_ms": latency,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if dist is not None:
+        report["danger_frames"] = dist.danger_frames
+    if mode == "combined":
+        report["switches"] = switches
+    return report
+
+
+def run_isolated(mode, args):
+    """ 최대 RSS 를 모드별로 분리하기 위해 하위 프로세스에서 한 모드만 실행 """
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "mode.json")
+        cmd = [sys.executable, "-m", "src.benchmark.pipeline_bench", "--modes", mode, "--output", out,
+               "--data", args.data, "--frames", str(args.frames), "--stub-latency-ms", str(args.stub_latency_ms)]
+        if args.real_models:
+            cmd.append("--real-models")
+        if args.mask_tilt:
+            cmd.append("--mask-tilt")
+        subprocess.run(cmd, check=True)
+        with open(out, encoding="utf-8") as f:
+            return json.load(f)["modes"][mode]
+
+
+# ==========================================
+# 기준 보고서와 비교
+# ==========================================
+def compare(report, baseline, tolerance=TOLERANCE):
+    """ 처리량이 tolerance 이상 줄거나 p95 지연이 tolerance 이상 늘어난 항목 목록 """
+    regressions = []
+    for mode, cur in report["modes"].items():
+        base = baseline.get("modes", {}).get(mode)
+        if base is None:
+            continue
+        if cur["fps"] < base["fps"] * (1 - tolerance):
+            regressions.append(f"{mode}: fps {base['fps']:.1f} -> {cur['fps']:.1f}")
+        for stage, stats in cur["latency_ms"].items():
+            base_stats = base["latency_ms"].get(stage)
+            if base_stats and stats["p95"] > base_stats["p95"] * (1 + tolerance):
+                regressions.append(f"{mode}/{stage}: p95 {base_stats['p95']:.2f} -> {stats['p95']:.2f} ms")
+    return regressions
+
+
+def print_report(report):
+    print(f"\n{'mode':<10}{'stage':<10}{'n':>6}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}   (ms)")
+    for mode, r in report["modes"].items():
+        for stage, s in r["latency_ms"].items():
+            print(f"{mode:<10}{stage:<10}{s['count']:>6}{s['mean']:>9.2f}{s['p50']:>9.2f}{s['p95']:>9.2f}{s['p99']:>9.2f}")
+        rss = f"{r['peak_rss_mb']:.0f} MB" if r["peak_rss_mb"] is not None else "-"
+        print(f"{mode:<10}=> {r['fps']:.1f} FPS, peak RSS {rss}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="녹화 영상 폴더/파일 (없으면 합성 영상)")
+    parser.add_argument("--frames", type=int, default=MAX_FRAMES)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--real-models", action="store_true", help="모델 대역 대신 실제 가중치 사용")
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="모델 대역의 추론 지연 흉내 (ms)")
+    parser.add_argument("--mask-tilt", action="store_true", help="tilt 경로에서 Hough 대신 seg 마스크 방향 사용")
+    parser.add_argument("--isolate", action="store_true", help="모드마다 별도 프로세스로 실행 (RSS 분리)")
+    parser.add_argument("--output", default=None, help="JSON 보고서 저장 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 기준 JSON 보고서")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "models": "real" if args.real_models else f"stub ({args.stub_latency_ms} ms)",
+            "tilt": "mask" if args.mask_tilt else "hough",
+        },
+        "modes": {},
+    }
+
+    if args.isolate and len(args.modes) > 1:
+        for mode in args.modes:
+            report["modes"][mode] = run_isolated(mode, args)
+    else:
+        frames, clips = load_clips(args.data, args.frames)
+        report["meta"]["clips"] = clips
+        report["meta"]["frame_shape"] = list(frames[0].shape)
+        for mode in args.modes:
+            detector, pose, H = make_models(args.real_models, args.stub_latency_ms)
+            report["modes"][mode] = run_mode(mode, frames, detector, pose, H, args.mask_tilt)
+
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[Bench] report saved: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"[Bench] REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("[Bench] 기준 대비 성능 저하 없음")
@@ -0,0 +1,171 @@
+"""
+실제 가중치/카메라 없이 파이프라인을 돌리기 위한 모델 대역과 합성 프레임.
+
+StubDetector / StubPose 는 ultralytics 와 같은 호출 형태(predict, __call__)와
+결과 형태(src.models.result_types.Results)를 따르므로 run_inference,
+process_distance_estimation, TiltTracker 를 그대로 사용할 수 있음.
+"""
+import time
+
+import cv2
+import numpy as np
+
+from src.models.result_types import Boxes, Keypoints, Masks, Results
+from src.person_detection.distance_estimation import REAL_POINTS_BASE, ALPHA, BETA
+
+FRAME_SHAPE = (1232, 1640, 3)   # camera_input 기본 해상도
+# 640x480 화면에서 1m~4m 지점의 바닥 픽셀 좌표 (합성 호모그래피용)
+STUB_PIXEL_POINTS = np.array([[320, 440], [320, 330], [320, 280], [320, 255]], dtype=np.float32)
+
+
+# ==========================================
+# [1] 합성 입력
+# ==========================================
+def draw_pallet(image, center, size, angle, slats=6, color=(40, 70, 100)):
+    """ 가로 판재(slat)가 있는 팔레트를 angle(도) 만큼 회전시켜 그림 (Hough 선 검출용) """
+    rect = (center, size, angle)
+    cv2.fillPoly(image, [cv2.boxPoints(rect).astype(np.int32)], color)
+    w, h = size
+    rad = np.deg2rad(angle)
+    ux, uy = np.cos(rad), np.sin(rad)      # 판재 방향
+    vx, vy = -np.sin(rad), np.cos(rad)     # 판재 간격 방향
+    for i in range(1, slats):
+        off = -h / 2 + h * i / slats
+        cx, cy = center[0] + vx * off, center[1] + vy * off
+        p1 = (int(cx - ux * w / 2), int(cy - uy * w / 2))
+        p2 = (int(cx + ux * w / 2), int(cy + uy * w / 2))
+        cv2.line(image, p1, p2, (20, 40, 60), 3)
+
+
+def synthetic_clip(n_frames, shape=FRAME_SHAPE, pallets=3, seed=0):
+    """
+    결정적인 합성 창고 영상 (n_frames 장의 BGR 프레임 리스트).
+    팔레트 일부는 3° 이상 기울어져 있고, 프레임마다 약간씩 흔들림.
+    """
+    rng = np.random.default_rng(seed)
+    h, w = shape[:2]
+    base = np.full(shape, 110, dtype=np.uint8)
+    base += rng.integers(0, 20, shape, dtype=np.uint8)
+
+    layout = []
+    for i in range(pallets):
+        center = ((i + 0.5) * w / pallets, h * rng.uniform(0.45, 0.65))
+        size = (w / pallets * 0.6, h * 0.25)
+        angle = float(rng.choice([0.0, 1.0, 5.0, 9.0]))
+        layout.append((center, size, angle))
+
+    frames = []
+    for f in range(n_frames):
+        frame = base.copy()
+        for (cx, cy), size, angle in layout:
+            jitter = rng.normal(0, 2.0, 2)
+            draw_pallet(frame, (cx + jitter[0], cy + jitter[1]), size, angle + rng.normal(0, 0.3))
+        frames.append(frame)
+    return frames
+
+
+def stub_homography():
+    """ STUB_PIXEL_POINTS 기준 호모그래피 (load_calibration_data 와 같은 방식) """
+    pixels = STUB_PIXEL_POINTS.tolist()
+    reals = REAL_POINTS_BASE.tolist()
+    pixels.append([pixels[0][0] + 100.0, pixels[0][1]])
+    reals.append([0.5, 1.0])
+    H, _ = cv2.findHomography(np.array(pixels, np.float32), np.array(reals, np.float32))
+    return H
+
+
+def _wait(latency_ms):
+    if latency_ms > 0:
+        time.sleep(latency_ms / 1000.0)
+
+
+# ==========================================
+# [2] 모델 대역
+# ==========================================
+class StubDetector:
+    """
+    YOLOE 대역. imgsz 로 줄인 영상에서 윤곽선을 찾아 큰 것부터 max_boxes 개를 박스로 반환.
+    task="segment" 이면 그 윤곽선을 마스크 폴리곤(Results.masks)으로도 반환 (seg 모델처럼 저해상도 윤곽).
+    latency_ms 로 실제 모델 추론 시간을 흉내낼 수 있음. imgsz 를 주면 predict 인자 대신 그 크기를 사용.
+    """
+
+    def __init__(self, latency_ms=0.0, max_boxes=5, min_area_ratio=0.01, names=("pallet_wrapped",), imgsz=None):
+        self.latency_ms = latency_ms
+        self.imgsz = imgsz
+        self.max_boxes = max_boxes
+        self.min_area_ratio = min_area_ratio
+        self.names = list(names)
+
+    def predict(self, source, conf=0.25, imgsz=256, verbose=False, task="detect", **kwargs):
+        images = source if isinstance(source, (list, tuple)) else [source]
+        return [self._detect(img, self.imgsz or imgsz, task == "segment") for img in images]
+
+    __call__ = predict
+
+    def _detect(self, image, imgsz, with_masks=False):
+        h, w = image.shape[:2]
+        scale = imgsz / max(h, w)
+        small = cv2.resize(image, (max(1, int(w * scale)), max(1, int(h * scale))))
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        min_area = self.min_area_ratio * small.shape[0] * small.shape[1]
+        found = sorted(((cv2.boundingRect(c), c) for c in contours), key=lambda rc: -rc[0][2] * rc[0][3])
+        found = [(r, c) for r, c in found if r[2] * r[3] >= min_area][:self.max_boxes]
+        xyxy = np.array([[x, y, x + rw, y + rh] for (x, y, rw, rh), _ in found], dtype=np.float32).reshape(-1, 4) / scale
+        conf = np.full(len(xyxy), 0.9, dtype=np.float32)
+        cls = np.zeros(len(xyxy), dtype=np.int64)
+        masks = Masks([(c.reshape(-1, 2) + 0.5) / scale for _, c in found], image.shape) if with_masks else None
+
+        _wait(self.latency_ms)
+        return Results(image, self.names, Boxes(xyxy, conf, cls), masks=masks)
+
+
+class StubPose:
+    """
+    거리 추정용 pose 모델 대역 (8 keypoints: 어깨, 엉덩이, 무릎, 발목 좌/우).
+    호출할 때마다 사람 0~2 명이 다가오거나 멀어지도록 결정적으로 생성하므로
+    DANGER / WARNING / Safe 가 모두 나옴.
+    """
+
+    def __init__(self, latency_ms=0.0, period=90):
+        self.latency_ms = latency_ms
+        self.period = period
+        self.names = ["person"]
+        self.calls = 0
+
+    def predict(self, source, conf=0.5, verbose=False, **kwargs):
+        images = source if isinstance(source, (list, tuple)) else [source]
+        return [self._people(img) for img in images]
+
+    __call__ = predict
+
+    def _people(self, image):
+        h, w = image.shape[:2]
+        t = self.calls
+        self.calls += 1
+        count = (t // (self.period // 3)) % 3
+
+        boxes, kpts = [], []
+        for i in range(count):
+            # 0.8m ~ 4.5m 를 왕복하는 거리 -> 몸통 길이(px)로 역산
+            phase = ((t + i * self.period // 2) % self.period) / self.period
+            dist = 0.8 + 3.7 * abs(2 * phase - 1)
+            torso = ALPHA / (dist - BETA)
+            body = torso / 0.3
+            cx = w * (0.3 + 0.4 * i)
+            foot_y = min(h * 0.9, h * 0.45 + body * 0.6)
+            top = foot_y - body
+
+            ys = [foot_y - 0.75 * body] * 2 + [foot_y - 0.45 * body] * 2 + \
+                 [foot_y - 0.22 * body] * 2 + [foot_y] * 2
+            xs = [cx - body * 0.12, cx + body * 0.12] * 4
+            kpts.append([[x, y, 0.9] for x, y in zip(xs, ys)])
+            boxes.append([cx - body * 0.25, top, cx + body * 0.25, foot_y])
+
+        xyxy = np.array(boxes, dtype=np.float32).reshape(-1, 4)
+        data = np.array(kpts, dtype=np.float32).reshape(-1, 8, 3)
+        _wait(self.latency_ms)
+        return Results(image, self.names, Boxes(xyxy, np.full(len(xyxy), 0.9), np.zeros(len(xyxy))),
+                       keypoints=Keypoints(data))
@@ -0,0 +1,289 @@
+"""
+asyncio 기반 오케스트레이터 (센서 샘플링, 프레임 소스, 추론, 출력을 코루틴으로 실행).
+
+main.py 의 메인 루프(센서 폴링 -> Condition 알림 -> 화면 복사 -> waitKey)와 블로킹 작업 스레드 두 개를
+이벤트 루프 하나로 대체함:
+
+  sensor  : motion() 을 poll_s 마다 호출해 상태 결정. 바뀌면 현재 stage 태스크를 취소하고 새 상태로 다시 시작
+  capture : 프레임 소스에서 읽어 frames 메일박스에 넣음 (블로킹 소스는 캡처 전용 스레드에서 next)
+  stage   : 현재 상태의 handler(packet, epoch) 를 상태별 추론 executor 에서 실행 (모델 추론 + 기울기/거리 분석)
+  output  : 결과를 sinks 에 차례로 전달 (이벤트 루프 스레드에서 실행되므로 가볍게 유지)
+
+단계 사이는 크기 1의 Mailbox 로 연결함. 느린 단계가 아직 처리 중이면 새 항목이 이전 항목을 덮어써
+오래된 프레임이 쌓이지 않음 (덮어쓴 수는 dropped 로 집계).
+
+상태가 바뀌면 stage 태스크를 취소하므로 이전 상태에서 시작한 추론 결과는 출력되지 않음.
+executor 스레드 안의 추론은 끝까지 돌지만 상태마다 executor 가 따로 있어 새 상태의 추론은 기다리지 않고
+바로 시작됨 (ModelScheduler 의 모델별 락과 같은 역할).
+
+소스, 핸들러, 싱크를 모두 주입받으므로 카메라/센서/모델 없이 가짜 소스로 실행할 수 있음:
+
+    orch = Orchestrator(frames=iter(fake_frames), motion=lambda: False,
+                        handlers={"MOVING": fn, "STOPPED": fn}, sinks=[results.append])
+    stats = asyncio.run(orch.run(duration=2.0))
+"""
+import asyncio
+import inspect
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# ==========================================
+# [설정]
+# ==========================================
+STATE_POLL_S = 0.03       # 센서 확인 주기 (main.py DISPLAY_WAIT_S 와 같음)
+HANDLER_ERROR_WAIT_S = 0.5  # 핸들러 예외 후 다음 프레임까지 대기
+LATENCY_SAMPLES = 5000    # 지연 백분위 계산에 보관할 최근 샘플 수
+
+# 캡처된 프레임 / 단계 결과
+Packet = namedtuple("Packet", ["seq", "t_capture", "frame"])
+Result = namedtuple("Result", ["state", "epoch", "seq", "t_capture", "t_result", "value"])
+
+_END = object()
+
+
+class Mailbox:
+    """
+    크기 1 최신 우선 큐 (생산자 여러 개, 소비자 하나, 같은 이벤트 루프 안에서만 사용).
+    put 은 기다리지 않고 이전 항목을 덮어씀 -> 소비자가 느리면 오래된 항목은 버려짐.
+    """
+
+    def __init__(self):
+        self._item = _END
+        self._event = asyncio.Event()
+        self.dropped = 0
+
+    def put(self, item):
+        if self._item is not _END:
+            self.dropped += 1
+        self._item = item
+        self._event.set()
+
+    async def get(self):
+        while self._item is _END:
+            self._event.clear()
+            await self._event.wait()
+        item, self._item = self._item, _END
+        return item
+
+    def clear(self):
+        self._item = _END
+
+
+class Orchestrator:
+    """
+    frames   : 프레임 iterator (블로킹 next 는 캡처 스레드에서 실행) 또는 async iterator. 끝나면 실행 종료.
+               (프레임, 캡처 시각) 튜플을 내면 그 시각을 Packet.t_capture 로 사용 (pipeline_sources.open_source,
+               카메라 센서 타임스탬프 -> glass-to-alert 에 캡처 지연 포함), 프레임만 내면 받은 시각 사용
+    motion   : 인자 없는 함수, True 면 MOVING (motion_detector.check_motion_state 와 같은 형식)
+    handlers : {상태: handler(packet, epoch)} - 상태별 executor 스레드에서 실행, 반환값이 Result.value
+               (None 을 반환하면 그 프레임은 버린 것으로 보고 출력하지 않음, frame_policy 참고)
+    sinks    : [sink(result)] - 함수 또는 코루틴 함수
+    on_state : on_state(new_state) - 상태가 바뀔 때 호출 (로그, 지표)
+    """
+
+    def __init__(self, frames, motion, handlers, sinks=(), on_state=None, poll_s=STATE_POLL_S):
+        self.source = frames
+        self.motion = motion
+        self.handlers = dict(handlers)
+        self.sinks = list(sinks)
+        self.on_state = on_state
+        self.poll_s = poll_s
+
+        self.state = None
+        self.epoch = 0
+        self.captured = 0
+        self.cancelled = 0       # 추론 도중 상태가 바뀌어 버린 결과 수
+        self.errors = 0
+        self.transition_ms = []  # 상태 전환 ~ 새 상태의 첫 결과
+        self._stage_task = None
+        self._last_packet = None
+        self._changed_at = None
+        self._state_since = None
+        self._awaiting_result = False
+        self._state_seconds = {s: 0.0 for s in self.handlers}
+        self._frames_out = {s: 0 for s in self.handlers}
+        self._result_ms = {s: deque(maxlen=LATENCY_SAMPLES) for s in self.handlers}
+        self._output_ms = {s: deque(maxlen=LATENCY_SAMPLES) for s in self.handlers}
+
+    # ------------------------------------------
+    # 실행 / 종료
+    # ------------------------------------------
+    async def run(self, duration=None, tasks=()):
+        """
+        duration 초 동안 (None 이면 stop() 또는 소스가 끝날 때까지) 실행하고 stats() 반환.
+        tasks: orchestrator 를 인자로 받는 코루틴 함수 (화면 출력 루프 등), 함께 시작하고 함께 취소됨
+        """
+        self._stop_event = asyncio.Event()
+        self.frames = Mailbox()
+        self.results = Mailbox()
+        self._capture_pool = ThreadPoolExecutor(1, thread_name_prefix="capture")
+        self._sensor_pool = ThreadPoolExecutor(1, thread_name_prefix="sensor")
+        self._pools = {s: ThreadPoolExecutor(1, thread_name_prefix=f"infer-{s}") for s in self.handlers}
+        self._start = time.monotonic()
+
+        self._tasks = [self._spawn(c) for c in (self._sensor(), self._capture(), self._output())]
+        self._tasks += [self._spawn(t(self)) for t in tasks]
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), duration)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await self._shutdown()
+        return self.stats()
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        task.add_done_callback(self._task_done)
+        return task
+
+    def _task_done(self, task):
+        # 센서/캡처/출력 태스크가 예외로 죽으면 전체 종료
+        if not task.cancelled() and task.exception() is not None:
+            print(f"[Async] 태스크 오류로 종료: {task.exception()!r}")
+            self.errors += 1
+            self.stop()
+
+    async def _shutdown(self):
+        self._close_state(time.monotonic())
+        self.state = None
+        tasks = self._tasks + ([self._stage_task] if self._stage_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        # 블로킹 소스는 진행 중인 next 가 끝난 뒤 같은 스레드에서 닫음
+        if hasattr(self.source, "close") and not hasattr(self.source, "__anext__"):
+            self._capture_pool.submit(self.source.close)
+        for pool in [self._capture_pool, self._sensor_pool] + list(self._pools.values()):
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    # ------------------------------------------
+    # 코루틴
+    # ------------------------------------------
+    async def _sensor(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            moving = await loop.run_in_executor(self._sensor_pool, self.motion)
+            new_state = "MOVING" if moving else "STOPPED"
+            if new_state != self.state:
+                self._switch(new_state)
+            await asyncio.sleep(self.poll_s)
+
+    def _switch(self, new_state):
+        now = time.monotonic()
+        if self._stage_task is not None:
+            self._stage_task.cancel()
+        self._close_state(now)
+        self.state = new_state
+        self.epoch += 1
+        self._changed_at = now
+        self._awaiting_result = True
+        self.results.clear()
+        # 새 상태는 다음 캡처를 기다리지 않고 가장 최근 프레임부터 처리
+        self.frames.clear()
+        if self._last_packet is not None:
+            self.frames.put(self._last_packet)
+        if self.on_state is not None:
+            self.on_state(new_state)
+        self._stage_task = asyncio.create_task(self._stage(new_state, self.epoch))
+
+    def _close_state(self, now):
+        if self.state is not None:
+            self._state_seconds[self.state] += now - self._state_since
+        self._state_since = now
+
+    async def _capture(self):
+        loop = asyncio.get_running_loop()
+        is_async = hasattr(self.source, "__anext__")
+        while True:
+            if is_async:
+                frame = await anext(self.source, _END)
+            else:
+                frame = await loop.run_in_executor(self._capture_pool, next, self.source, _END)
+            if frame is _END:
+                print("[Async] 프레임 소스 끝")
+                self.stop()
+                return
+            if isinstance(frame, tuple):
+                frame, t_capture = frame
+            else:
+                t_capture = time.monotonic()
+            self._last_packet = Packet(self.captured, t_capture, frame)
+            self.frames.put(self._last_packet)
+            self.captured += 1
+
+    async def _stage(self, state, epoch):
+        loop = asyncio.get_running_loop()
+        handler, pool = self.handlers[state], self._pools[state]
+        while True:
+            packet = await self.frames.get()
+            try:
+                value = await loop.run_in_executor(pool, handler, packet, epoch)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            except Exception as e:
+                print(f"[Async] {state} 처리 오류: {e!r}")
+                self.errors += 1
+                await asyncio.sleep(HANDLER_ERROR_WAIT_S)
+                continue
+            if value is None:
+                continue
+            self.results.put(Result(state, epoch, packet.seq, packet.t_capture, time.monotonic(), value))
+
+    async def _output(self):
+        while True:
+            result = await self.results.get()
+            if result.epoch != self.epoch:
+                continue
+            for sink in self.sinks:
+                ret = sink(result)
+                if inspect.isawaitable(ret):
+                    await ret
+            self._record(result, time.monotonic())
+
+    # ------------------------------------------
+    # 통계
+    # ------------------------------------------
+    def _record(self, result, t_out):
+        state = result.state
+        self._frames_out[state] += 1
+        self._result_ms[state].append((result.t_result - result.t_capture) * 1000.0)
+        self._output_ms[state].append((t_out - result.t_capture) * 1000.0)
+        if self._awaiting_result:
+            self._awaiting_result = False
+            self.transition_ms.append((t_out - self._changed_at) * 1000.0)
+
+    def stats(self):
+        def pct(values):
+            arr = np.asarray(values, dtype=np.float64)
+            return {"p50": float(np.percentile(arr, 50)), "p95": float(np.percentile(arr, 95))} if arr.size else {}
+
+        out = {
+            "seconds": time.monotonic() - self._start,
+            "captured_frames": self.captured,
+            "dropped_frames": self.frames.dropped,    # 추론이 밀려 건너뛴 프레임
+            "dropped_results": self.results.dropped,  # 출력이 밀려 건너뛴 결과
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "transition_ms": pct(self.transition_ms),
+            "states": {},
+        }
+        now = time.monotonic()
+        for s in self.handlers:
+            if not self._frames_out[s]:
+                continue
+            seconds = self._state_seconds[s] + (now - self._state_since if s == self.state else 0.0)
+            out["states"][s] = {
+                "frames": self._frames_out[s],
+                "fps": self._frames_out[s] / seconds if seconds > 0 else 0.0,
+                "result_latency_ms": pct(self._result_ms[s]),
+                "output_latency_ms": pct(self._output_ms[s]),
+            }
+        return out
@@ -2,15 +2,13 @@ import cv2
 import time
 from picamera2 import Picamera2
 
+MAX_SENSOR_SKEW_S = 1.0   # 센서 타임스탬프가 이보다 오래됐으면 다른 시계로 보고 무시
+
 def init_camera():
     """Picamera2 초기화"""
     picam2 = Picamera2()
     config = picam2.create_video_configuration(
-<<<<<<< HEAD
         main={"size": (1640, 1232), "format": "RGB888"}
-=======
-        main={"size": (720, 480), "format": "RGB888"}
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
     )
     picam2.configure(config)
     picam2.start()
@@ -23,4 +21,23 @@ def get_frame(picam2):
     """현재 프레임 반환 (BGR)"""
     frame = picam2.capture_array()
     frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-    return frame
\ No newline at end of file
+    return frame
+
+
+def get_frame_stamped(picam2):
+    """
+    (BGR 프레임, 캡처 시각) 반환. 캡처 시각은 time.monotonic() 기준 초.
+    libcamera 의 SensorTimestamp(CLOCK_MONOTONIC, ns) 를 쓰고, 없거나 시계가 맞지 않으면 수신 시각 사용
+    """
+    request = picam2.capture_request()
+    try:
+        frame = request.make_array("main")
+        sensor_ns = request.get_metadata().get("SensorTimestamp")
+    finally:
+        request.release()
+    now = time.monotonic()
+    t_capture = sensor_ns / 1e9 if sensor_ns else now
+    if not 0.0 <= now - t_capture < MAX_SENSOR_SKEW_S:
+        t_capture = now
+    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    return frame, t_capture
\ No newline at end of file
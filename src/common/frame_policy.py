@@ -0,0 +1,117 @@
+"""
+최신 프레임 우선(latest-frame-wins) 정책과 캡처 기준 지연(glass-to-alert) 집계.
+
+프레임마다 캡처 시각(camera_input.get_frame_stamped)을 함께 들고 다니고, 단계에 들어가기 전에
+frame_policy.fresh(단계, t_capture) 로 나이를 확인함. 단계별 최대 나이(MAX_AGE_S)를 넘긴 프레임은
+그 단계부터 처리하지 않고 버림 -> 추론이 밀렸을 때 낡은 프레임에 Hough/그리기 시간을 쓰지 않고
+다음(최신) 프레임으로 넘어감.
+
+결과(경보)를 내보내는 시점에는 frame_policy.alert(모드, t_capture) 로 캡처 ~ 경보 지연을 기록.
+안전 경보 자체는 나이 때문에 버리지 않음 (늦은 경보라도 지연으로 집계만 함).
+
+    frame, t_capture = get_frame_stamped(picam2)
+    result = run_inference(...)
+    if not frame_policy.fresh("STOPPED/tilt", t_capture):   # 추론이 밀려 낡은 프레임은 분석/그리기 생략
+        continue
+    ...
+    frame_policy.alert("STOPPED", t_capture)
+    frame_policy.report()      # 단계별 통과/버림 수, 모드별 glass-to-alert p50/p95/p99
+
+단계 이름은 stage_timer 와 같음. MAX_AGE_S 에 없는 단계는 항상 통과.
+"""
+import threading
+import time
+
+from src.common import metrics
+from src.common.stage_timer import LatencyHistogram, PERCENTILES
+
+# ==========================================
+# [설정] 단계별 최대 허용 나이 (캡처 시각 기준, 초)
+# ==========================================
+# MOVING/distance, STOPPED/detect 는 넣지 않음: 추론 전에는 처리하는 프레임이 이미 가장 최신이라 버리면
+# 다음 프레임도 똑같이 늦어 검출 자체가 멈출 수 있음 (캡처 지연이 길어도 추론은 하고, 그 뒤 단계만 나이로 거름)
+MAX_AGE_S = {
+    "MOVING/render": 0.5,
+    "STOPPED/tilt": 3.0,       # YOLOE 추론이 느린 Pi 에서도 통과하도록 여유 있게 (정차 중 화물은 천천히 변함)
+    "STOPPED/render": 3.0,
+}
+REPORT_INTERVAL_S = 10.0
+
+
+def parse_max_age(specs):
+    """ ["STOPPED/tilt=2.0", ...] -> {단계: 초}. 0 이하면 해당 단계 검사 끔 """
+    out = {}
+    for spec in specs or ():
+        stage, sep, value = spec.partition("=")
+        if not sep:
+            raise ValueError(f"STAGE=SECONDS 형식이어야 합니다: {spec}")
+        out[stage.strip()] = float(value)
+    return out
+
+
+class FramePolicy:
+    def __init__(self, max_age_s=None, interval=REPORT_INTERVAL_S):
+        self.max_age_s = dict(MAX_AGE_S)
+        self.max_age_s.update(max_age_s or {})
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._counts = {}   # 단계 -> [통과, 버림]
+        self._alerts = {}   # 모드 -> LatencyHistogram (ms)
+        self._last_report = time.monotonic()
+
+    def fresh(self, stage, t_capture, now=None):
+        """ 프레임이 stage 의 최대 나이 안이면 True, 넘었으면 버림으로 집계하고 False """
+        max_age = self.max_age_s.get(stage)
+        counts = self._counts.get(stage)
+        if counts is None:
+            with self._lock:
+                counts = self._counts.setdefault(stage, [0, 0])
+        if max_age is None or max_age <= 0 or (now or time.monotonic()) - t_capture <= max_age:
+            counts[0] += 1
+            return True
+        counts[1] += 1
+        metrics.STALE_FRAMES.labels(stage).inc()
+        return False
+
+    def alert(self, mode, t_capture, now=None):
+        """ 결과/경보를 내보낸 시점에 호출. 캡처 ~ 경보 지연(ms) 반환 """
+        seconds = (now or time.monotonic()) - t_capture
+        hist = self._alerts.get(mode)
+        if hist is None:
+            with self._lock:
+                hist = self._alerts.setdefault(mode, LatencyHistogram())
+        hist.add(seconds * 1000.0)
+        metrics.GLASS_TO_ALERT.labels(mode).observe(seconds)
+        return seconds * 1000.0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "stages": {stage: {"passed": c[0], "dropped": c[1], "max_age_s": self.max_age_s.get(stage)}
+                           for stage, c in self._counts.items()},
+                "glass_to_alert_ms": {mode: {"count": h.count, "mean": h.mean_ms, "max": h.max_ms,
+                                             **{f"p{q}": h.percentile(q) for q in PERCENTILES}}
+                                      for mode, h in self._alerts.items()},
+            }
+
+    def maybe_report(self):
+        if time.monotonic() - self._last_report >= self.interval:
+            self.report()
+
+    def report(self):
+        """ 실행 시작부터의 누적 통계 출력 """
+        self._last_report = time.monotonic()
+        snap = self.snapshot()
+        lines = ["[FramePolicy] glass-to-alert / stale frames"]
+        for mode, h in sorted(snap["glass_to_alert_ms"].items()):
+            p = "  ".join(f"p{q} {h[f'p{q}']:7.1f}" for q in PERCENTILES)
+            lines.append(f"  {mode:<16} n={h['count']:<6} {p}  max {h['max']:7.1f} ms")
+        for stage, c in sorted(snap["stages"].items()):
+            total = c["passed"] + c["dropped"]
+            limit = f"{c['max_age_s']:.2f}s" if c["max_age_s"] else "-"
+            lines.append(f"  {stage:<16} max age {limit:>6}  dropped {c['dropped']}/{total}")
+        print("\n".join(lines))
+
+
+# 프로세스 공용 인스턴스
+frame_policy = FramePolicy()
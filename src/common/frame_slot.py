@@ -0,0 +1,52 @@
+import threading
+import time
+
+
+class FrameSlot:
+    """
+    크기 1짜리 버전 관리 슬롯 (작업 스레드 -> 화면 출력 루프).
+
+    - publish: 새 프레임을 복사 없이 넘기고 시퀀스 번호를 올림
+      (넘긴 뒤에는 작업 스레드가 해당 배열을 다시 수정하지 않아야 함)
+    - wait_newer: 마지막으로 본 번호보다 새 프레임이 올 때까지 대기
+    - age: 마지막 publish 이후 지난 시간 (스냅샷이 멈춘 프레임을 주지 않도록)
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._published_at = None
+
+    @property
+    def seq(self):
+        return self._seq
+
+    def publish(self, frame):
+        """프레임 소유권을 슬롯으로 넘기고 새 시퀀스 번호 반환"""
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._published_at = time.monotonic()
+            self._cond.notify_all()
+            return self._seq
+
+    def age(self):
+        """마지막 publish 후 지난 초 (아직 없으면 None)"""
+        published_at = self._published_at
+        return None if published_at is None else time.monotonic() - published_at
+
+    def latest(self):
+        """(seq, frame) 즉시 반환"""
+        with self._cond:
+            return self._seq, self._frame
+
+    def wait_newer(self, last_seq, timeout=None):
+        """
+        last_seq 보다 새 프레임이 오면 (seq, frame), timeout 이면 (last_seq, None) 반환.
+        반환된 frame 은 읽기 전용으로 취급.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq != last_seq, timeout):
+                return last_seq, None
+            return self._seq, self._frame
@@ -0,0 +1,274 @@
+"""
+발열/부하 기반 추론 강도 조절기 (governor).
+
+더운 창고에서 YOLOE 를 계속 돌리면 Pi 가 스로틀링되어 FPS 가 예고 없이 무너지므로,
+CPU 온도, 펌웨어 스로틀 상태(get_throttled)와 단계별 지연(observe)을 보고 LEVELS 의 단계를 한 칸씩 올리거나 내림.
+현재/최대 클럭 비는 지표로만 남김 (ondemand 거버너는 한가할 때 40~60% 로 내려가므로 스로틀 신호가 아님).
+
+  - 단계가 올라갈수록 정차(STOPPED) 작업부터 줄임: 유휴 모델 워밍업 중지 -> YOLOE 추론 간격 증가,
+    imgsz 축소 -> 기울기 분석 hough -> hough-lite -> hough-min
+  - 주행(MOVING) 사람 검출은 온도가 TEMP_HOT_C 이상으로 계속될 때 마지막 단계에서만 MOVING 최소 FPS 까지 낮춤
+    (스로틀/지연 초과만으로는 마지막 단계에 가지 않음. MOVING 이 느리면 유휴 워밍업 등 다른 부하부터 끔)
+  - 낮출 때는 STEP_DOWN_S(임계 온도/스로틀 중이면 STEP_DOWN_FAST_S) 마다 한 단계,
+    복구는 TEMP_COOL_C 이하 + 지연 여유가 있을 때 STEP_UP_S 마다 한 단계 (히스테리시스)
+
+    governor = Governor()
+    governor.maybe_update()                          # 메인 루프에서 (SAMPLE_INTERVAL_S 마다 실제 갱신)
+    governor.observe("STOPPED/detect", seconds)      # 작업 스레드에서 단계 지연 보고
+    knobs = governor.knobs                           # 현재 단계 설정 (Knobs)
+
+sysfs 경로는 root 기준 상대 경로라 가짜 파일 트리로 바꿔 시험할 수 있음 (SysfsSensors(root=tmpdir)).
+
+    python -m src.common.governor --watch            # 실제 센서 값과 단계 출력
+    python -m src.common.governor --simulate         # 가짜 sysfs + 발열 모델로 단계 변화 시뮬레이션
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+from collections import namedtuple
+
+from src.common import metrics
+
+# ==========================================
+# [설정] 센서 경로 / 임계값
+# ==========================================
+SYSFS_ROOT = "/"
+THERMAL_PATH = "sys/class/thermal/thermal_zone0/temp"                   # m°C
+CUR_FREQ_PATH = "sys/devices/system/cpu/cpu0/cpufreq/scaling_cur_freq"  # kHz
+MAX_FREQ_PATH = "sys/devices/system/cpu/cpu0/cpufreq/cpuinfo_max_freq"  # kHz
+THROTTLED_PATH = "sys/devices/platform/soc/soc:firmware/get_throttled"   # 16진수 (vcgencmd get_throttled 와 같은 비트)
+VCGENCMD = "vcgencmd"    # THROTTLED_PATH 가 없을 때 (실제 sysfs 루트에서만) 사용
+# get_throttled 현재 상태 비트: 1 클럭 제한, 2 스로틀 중, 3 소프트 온도 제한 (0 저전압, 16~19 는 과거 발생 기록이라 제외)
+THROTTLED_NOW_MASK = 0x2 | 0x4 | 0x8
+
+SAMPLE_INTERVAL_S = 1.0
+TEMP_HOT_C = 75.0        # 이 이상이면 단계를 올림 (Pi 소프트 스로틀 80°C 전에 미리)
+TEMP_CRITICAL_C = 80.0   # 이 이상이면 STEP_DOWN_FAST_S 간격으로 올림
+TEMP_COOL_C = 68.0       # 이 이하여야 복구
+TEMP_FALLING_C_S = 0.02  # 온도가 이보다 빨리(°C/s) 내려가는 중이면 (임계 미만에서는) 더 낮추지 않고 기다림
+TEMP_SLOPE_ALPHA = 0.2   # 온도 변화율 EMA 계수
+STEP_DOWN_S = 20.0
+STEP_DOWN_FAST_S = 3.0
+STEP_UP_S = 30.0
+LATENCY_ALPHA = 0.2      # 단계 지연 EMA 계수
+LATENCY_STALE_S = 5.0    # 이보다 오래 보고가 없는 단계(비활성 모드)는 판단에서 제외
+LATENCY_BUDGET_S = {     # 단계 지연 EMA 가 예산을 넘으면 과부하
+    "MOVING/distance": 0.15,
+    "STOPPED/detect": 1.0,
+}
+RECOVER_MARGIN = 0.7     # 복구하려면 지연 EMA 가 예산 x 이 값 이하
+
+# level, STOPPED 추론 최소 간격(s), YOLOE imgsz, 기울기 분석, 유휴 워밍업, MOVING 추론 최소 간격(s)
+Knobs = namedtuple("Knobs", ["level", "stopped_interval", "imgsz", "tilt", "warmup", "moving_interval"])
+
+# 안전 범위: imgsz >= 160, STOPPED 최소 0.5 FPS, MOVING 최소 10 FPS (마지막 단계에서만)
+LEVELS = (
+    Knobs(0, 0.0, 256, "hough", True, 0.0),
+    Knobs(1, 0.1, 256, "hough", False, 0.0),
+    Knobs(2, 0.25, 224, "hough-lite", False, 0.0),
+    Knobs(3, 0.5, 192, "hough-lite", False, 0.0),
+    Knobs(4, 1.0, 160, "hough-min", False, 0.0),
+    Knobs(5, 2.0, 160, "hough-min", False, 0.1),
+)
+LOAD_MAX_LEVEL = len(LEVELS) - 2   # 지연 초과만으로 올라갈 수 있는 최대 단계 (MOVING 간격은 건드리지 않음)
+
+
+class SysfsSensors:
+    """ CPU 온도(°C), 현재/최대 클럭 비, 펌웨어 스로틀 여부를 읽음. 읽을 수 없으면 None """
+
+    def __init__(self, root=SYSFS_ROOT):
+        self.thermal = os.path.join(root, THERMAL_PATH)
+        self.cur_freq = os.path.join(root, CUR_FREQ_PATH)
+        self.max_freq = os.path.join(root, MAX_FREQ_PATH)
+        self.throttled = os.path.join(root, THROTTLED_PATH)
+        # 가짜 sysfs 루트로 시험할 때는 실제 장비의 vcgencmd 를 부르지 않음
+        self._use_vcgencmd = os.path.abspath(root) == os.path.abspath(SYSFS_ROOT)
+
+    @staticmethod
+    def _read_int(path, base=10):
+        try:
+            with open(path) as f:
+                return int(f.read().strip(), base)
+        except (OSError, ValueError):
+            return None
+
+    def _read_throttled(self):
+        """ get_throttled 비트 (sysfs, 없으면 vcgencmd). 둘 다 안 되면 None """
+        bits = self._read_int(self.throttled, 16)
+        if bits is not None or not self._use_vcgencmd:
+            return bits
+        try:
+            out = subprocess.run([VCGENCMD, "get_throttled"], capture_output=True, text=True, timeout=1.0).stdout
+            return int(out.strip().partition("=")[2], 16)
+        except (OSError, ValueError, subprocess.SubprocessError):
+            self._use_vcgencmd = False   # vcgencmd 가 없는 장비에서는 다시 시도하지 않음
+            return None
+
+    def read(self):
+        """ (temp_c, freq_ratio, throttled) """
+        temp = self._read_int(self.thermal)
+        cur, peak = self._read_int(self.cur_freq), self._read_int(self.max_freq)
+        bits = self._read_throttled()
+        return (temp / 1000.0 if temp is not None else None,
+                cur / peak if cur is not None and peak else None,
+                bool(bits & THROTTLED_NOW_MASK) if bits is not None else None)
+
+
+class Governor:
+    def __init__(self, sensors=None, levels=LEVELS, max_level=None, interval=SAMPLE_INTERVAL_S):
+        self.sensors = sensors or SysfsSensors()
+        self.levels = levels
+        self.max_level = len(levels) - 1 if max_level is None else min(max_level, len(levels) - 1)
+        self.interval = interval
+        self.level = 0
+        self.temp_c = None
+        self.freq_ratio = None
+        self.throttled = None
+        self.reason = ""
+        self._latency = {}        # 단계 -> [EMA(s), 마지막 보고 시각]
+        self._last_change = None
+        self._temp_slope = 0.0    # °C/s EMA
+        self._last_sample = None
+        metrics.GOVERNOR_LEVEL.set(0)
+
+    @property
+    def knobs(self):
+        return self.levels[self.level]
+
+    def observe(self, stage, seconds, now=None):
+        """ 단계 지연 보고 (단계마다 보고하는 스레드는 하나) """
+        now = time.monotonic() if now is None else now
+        entry = self._latency.get(stage)
+        if entry is None:
+            self._latency[stage] = [seconds, now]
+        else:
+            entry[0] += LATENCY_ALPHA * (seconds - entry[0])
+            entry[1] = now
+
+    def maybe_update(self, now=None):
+        now = time.monotonic() if now is None else now
+        if self._last_sample is not None and now - self._last_sample < self.interval:
+            return False
+        return self.update(now)
+
+    def update(self, now=None):
+        """ 센서를 읽고 단계 조정. 단계가 바뀌었으면 True """
+        now = time.monotonic() if now is None else now
+        prev_temp, prev_sample = self.temp_c, self._last_sample
+        self._last_sample = now
+        if self._last_change is None:
+            self._last_change = now
+        self.temp_c, self.freq_ratio, self.throttled = self.sensors.read()
+        temp, ratio = self.temp_c, self.freq_ratio
+        if temp is not None and prev_temp is not None and now > prev_sample:
+            self._temp_slope += TEMP_SLOPE_ALPHA * ((temp - prev_temp) / (now - prev_sample) - self._temp_slope)
+        if temp is not None:
+            metrics.CPU_TEMPERATURE.set(temp)
+        if ratio is not None:
+            metrics.CPU_FREQ_RATIO.set(ratio)
+        if self.throttled is not None:
+            metrics.CPU_THROTTLED.set(int(self.throttled))
+
+        latency = {s: ema for s, (ema, t) in self._latency.items() if now - t <= LATENCY_STALE_S}
+        over = [s for s, ema in latency.items() if ema > LATENCY_BUDGET_S.get(s, float("inf"))]
+        hot = temp is not None and temp >= TEMP_HOT_C
+        critical = temp is not None and temp >= TEMP_CRITICAL_C
+        throttled = bool(self.throttled)
+
+        # MOVING 을 건드리는 마지막 단계는 온도가 높을 때만 (스로틀/지연 초과만으로는 STOPPED 쪽만 줄임)
+        ceiling = self.max_level if hot else min(self.max_level, LOAD_MAX_LEVEL)
+        elapsed = now - self._last_change
+
+        # 직전 단계로 이미 식고 있으면 열 지연 때문에 과하게 낮추지 않도록 대기
+        if hot and not (critical or throttled or over) and self._temp_slope < -TEMP_FALLING_C_S:
+            return False
+
+        if hot or throttled or over:
+            step_s = STEP_DOWN_FAST_S if critical or throttled else STEP_DOWN_S
+            if self.level < ceiling and (elapsed >= step_s or self.level == 0):
+                reasons = ([f"temp {temp:.1f}°C"] if hot else []) + \
+                          (["firmware throttled"] if throttled else []) + \
+                          [f"{s} {latency[s] * 1000:.0f} ms" for s in over]
+                return self._set(self.level + 1, now, ", ".join(reasons))
+            return False
+
+        cool = temp is None or temp <= TEMP_COOL_C
+        relaxed = all(ema <= LATENCY_BUDGET_S.get(s, float("inf")) * RECOVER_MARGIN for s, ema in latency.items())
+        if self.level > 0 and cool and relaxed and elapsed >= STEP_UP_S:
+            return self._set(self.level - 1, now, "recovered" + (f" (temp {temp:.1f}°C)" if temp is not None else ""))
+        return False
+
+    def _set(self, level, now, reason):
+        old, self.level = self.level, level
+        self._last_change = now
+        self.reason = reason
+        metrics.GOVERNOR_LEVEL.set(level)
+        knobs = self.knobs
+        print(f"[Governor] level {old} -> {level} ({reason}) | STOPPED interval {knobs.stopped_interval:.2f}s, "
+              f"imgsz {knobs.imgsz}, tilt {knobs.tilt}, warmup {'on' if knobs.warmup else 'off'}, "
+              f"MOVING interval {knobs.moving_interval:.2f}s")
+        return True
+
+    def status(self):
+        return {"level": self.level, "temp_c": self.temp_c, "freq_ratio": self.freq_ratio,
+                "throttled": self.throttled, "reason": self.reason,
+                **self.knobs._asdict()}
+
+
+# ==========================================
+# 시뮬레이션 (가짜 sysfs)
+# ==========================================
+def _write_fake_sysfs(root, temp_c, ratio, max_khz=2400000, throttled_bits=0):
+    for rel, value in ((THERMAL_PATH, int(temp_c * 1000)), (CUR_FREQ_PATH, int(max_khz * ratio)),
+                       (MAX_FREQ_PATH, max_khz), (THROTTLED_PATH, f"{throttled_bits:x}")):
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(f"{value}\n")
+
+
+def simulate(seconds=1800, ambient_c=35.0, print_every=30):
+    """
+    단순 발열 모델: dT/dt = HEAT * load(level) - COOL * (T - ambient).
+    load 는 단계별 상대 CPU 사용량, 80°C 이상이면 펌웨어 스로틀(클럭 75%, get_throttled 0x6)을 흉내냄.
+    """
+    heat, cool = 0.53, 0.01
+    load = (1.0, 0.92, 0.8, 0.7, 0.6, 0.5)
+    with tempfile.TemporaryDirectory() as root:
+        gov = Governor(SysfsSensors(root))
+        temp = 60.0
+        for t in range(seconds):
+            ratio = 0.75 if temp >= 80.0 else 1.0
+            _write_fake_sysfs(root, temp, ratio, throttled_bits=0x6 if temp >= 80.0 else 0)
+            gov.update(now=float(t))
+            temp += heat * load[gov.level] * ratio - cool * (temp - ambient_c)
+            if t % print_every == 0:
+                print(f"  t={t:5d}s  temp {temp:5.1f}°C  freq {ratio * 100:3.0f}%  level {gov.level}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thermal/load governor")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--watch", action="store_true", help="실제 sysfs 값과 단계를 1초마다 출력")
+    group.add_argument("--simulate", action="store_true", help="가짜 sysfs + 발열 모델 시뮬레이션")
+    parser.add_argument("--root", default=SYSFS_ROOT, help="sysfs 루트 (--watch)")
+    parser.add_argument("--seconds", type=int, default=1800, help="시뮬레이션 길이")
+    parser.add_argument("--ambient", type=float, default=35.0, help="시뮬레이션 주변 온도 (°C)")
+    args = parser.parse_args()
+
+    if args.simulate:
+        simulate(args.seconds, args.ambient)
+    else:
+        gov = Governor(SysfsSensors(args.root))
+        try:
+            while True:
+                gov.update()
+                temp = f"{gov.temp_c:.1f}°C" if gov.temp_c is not None else "n/a"
+                freq = f"{gov.freq_ratio * 100:.0f}%" if gov.freq_ratio is not None else "n/a"
+                throttled = "n/a" if gov.throttled is None else ("yes" if gov.throttled else "no")
+                print(f"temp {temp}  freq {freq}  throttled {throttled}  level {gov.level}")
+                time.sleep(SAMPLE_INTERVAL_S)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,231 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+
+from src.common.metrics import REGISTRY, CONTENT_TYPE as METRICS_CONTENT_TYPE
+
+# ==========================================
+# [설정] 스트리밍 파라미터
+# ==========================================
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+STREAM_MAX_FPS = 5.0   # 클라이언트로 보내는 최대 프레임 수
+SNAPSHOT_MAX_AGE_S = 1.0  # 이보다 오래된 프레임은 스냅샷으로 주지 않고 새 프레임을 기다림
+SNAPSHOT_WAIT_S = 2.0
+JPEG_QUALITY = 70
+BOUNDARY = "frame"
+
+INDEX_HTML = b"""<html><head><title>Smart Forklift System</title></head>
+<body style="background:#111;color:#eee;font-family:monospace">
+<img src="/stream.mjpg"><pre id="s"></pre>
+<script>setInterval(()=>fetch('/status').then(r=>r.json())
+.then(j=>{document.getElementById('s').textContent=JSON.stringify(j,null,2)}),1000)</script>
+</body></html>"""
+
+
+class RateMeter:
+    """호출 간격으로 FPS 를 추정 (지수 이동 평균)"""
+
+    def __init__(self, alpha=0.1):
+        self.alpha = alpha
+        self.fps = 0.0
+        self._last = None
+
+    def tick(self):
+        now = time.monotonic()
+        if self._last is not None and now > self._last:
+            inst = 1.0 / (now - self._last)
+            self.fps = inst if self.fps == 0.0 else (1 - self.alpha) * self.fps + self.alpha * inst
+        self._last = now
+        return self.fps
+
+
+class StatusServer:
+    """
+    모니터 없는(headless) 장비용 로컬 HTTP 서버.
+
+    - /            : 간단한 뷰어 페이지
+    - /stream.mjpg : FrameSlot 의 최신 프레임을 JPEG 로 스트리밍 (STREAM_MAX_FPS 로 제한)
+    - /snapshot.jpg: 최신 프레임 1장 (snapshot_max_age 보다 오래됐으면 새 프레임을 기다리고, 없으면 503)
+    - /status      : 상태, 검출 결과, 거리, FPS 등 JSON (/status.json 도 같음)
+    - /metrics     : Prometheus 텍스트 형식 지표 (src.common.metrics.REGISTRY)
+
+    JPEG 인코딩은 클라이언트 요청이 있을 때만 수행되므로 접속자가 없으면 비용이 없음.
+    port=0 으로 만들면 빈 포트를 자동으로 잡음 (로컬 테스트용).
+    """
+
+    def __init__(self, frame_slot, host=DEFAULT_HOST, port=DEFAULT_PORT,
+                 max_fps=STREAM_MAX_FPS, quality=JPEG_QUALITY, snapshot_max_age=SNAPSHOT_MAX_AGE_S):
+        self.frame_slot = frame_slot
+        self.max_fps = max_fps
+        self.snapshot_max_age = snapshot_max_age
+        self.quality = quality
+
+        self._status = {}
+        self._status_lock = threading.Lock()
+        self._clients = 0
+        self._clients_lock = threading.Lock()
+        self._jpeg_cache = (None, None)   # (seq, bytes)
+        self._jpeg_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._started_at = time.monotonic()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ------------------------------------------
+    # 서버 제어
+    # ------------------------------------------
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        print(f"[HTTP] Status server started: {self.url}")
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    @property
+    def has_clients(self):
+        """스트림을 보고 있는 클라이언트가 있으면 True (렌더링 여부 판단용)"""
+        return self._clients > 0
+
+    # ------------------------------------------
+    # 상태 / 프레임
+    # ------------------------------------------
+    def update_status(self, **fields):
+        with self._status_lock:
+            self._status.update(fields)
+
+    def status(self):
+        with self._status_lock:
+            status = dict(self._status)
+        status["stream_clients"] = self._clients
+        status["uptime_s"] = round(time.monotonic() - self._started_at, 1)
+        return status
+
+    def _encode(self, seq, frame):
+        """같은 시퀀스는 한 번만 인코딩 (클라이언트 여러 명이 공유)"""
+        with self._jpeg_lock:
+            cached_seq, data = self._jpeg_cache
+            if cached_seq == seq:
+                return data
+            ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if not ok:
+                return None
+            data = buf.tobytes()
+            self._jpeg_cache = (seq, data)
+            return data
+
+    def _client_enter(self):
+        with self._clients_lock:
+            self._clients += 1
+
+    def _client_leave(self):
+        with self._clients_lock:
+            self._clients -= 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, code, content_type, body):
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/":
+                    self._send(200, "text/html; charset=utf-8", INDEX_HTML)
+                elif path in ("/status", "/status.json"):
+                    body = json.dumps(server.status(), default=float).encode("utf-8")
+                    self._send(200, "application/json", body)
+                elif path == "/metrics":
+                    self._send(200, METRICS_CONTENT_TYPE, REGISTRY.render().encode("utf-8"))
+                elif path == "/snapshot.jpg":
+                    self._snapshot()
+                elif path == "/stream.mjpg":
+                    self._stream()
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _snapshot(self):
+                # 스냅샷도 렌더링이 필요하므로 클라이언트로 집계 후 새 프레임을 잠시 기다림
+                # (렌더링이 멈춘 동안 슬롯에 남아 있던 오래된 프레임은 주지 않음)
+                server._client_enter()
+                try:
+                    slot = server.frame_slot
+                    seq, frame = slot.latest()
+                    age = slot.age()
+                    if frame is None or age is None or age > server.snapshot_max_age:
+                        seq, frame = slot.wait_newer(seq, timeout=SNAPSHOT_WAIT_S)
+                    data = server._encode(seq, frame) if frame is not None else None
+                finally:
+                    server._client_leave()
+                if data is None:
+                    self._send(503, "text/plain", b"no fresh frame")
+                else:
+                    self._send(200, "image/jpeg", data)
+
+            def _stream(self):
+                self.send_response(200)
+                self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+
+                min_interval = 1.0 / server.max_fps if server.max_fps > 0 else 0.0
+                last_sent = 0.0
+                server._client_enter()
+                # 슬롯에 남아 있던 프레임은 보내지 않고 접속 후 다음 publish 부터 전송
+                last_seq = server.frame_slot.seq
+                try:
+                    while not server._stop_event.is_set():
+                        seq, frame = server.frame_slot.wait_newer(last_seq, timeout=1.0)
+                        if frame is None:
+                            continue
+                        last_seq = seq
+
+                        wait = min_interval - (time.monotonic() - last_sent)
+                        if wait > 0:
+                            time.sleep(wait)
+                            seq, frame = server.frame_slot.latest()
+                            last_seq = seq
+
+                        data = server._encode(seq, frame)
+                        if data is None:
+                            continue
+                        self.wfile.write(
+                            f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\n"
+                            f"Content-Length: {len(data)}\r\n\r\n".encode("ascii")
+                        )
+                        self.wfile.write(data)
+                        self.wfile.write(b"\r\n")
+                        last_sent = time.monotonic()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                finally:
+                    server._client_leave()
+
+        return Handler
@@ -0,0 +1,334 @@
+import bisect
+from abc import ABC, abstractmethod
+import threading
+import time
+
+# ==========================================
+# [설정] 기본 히스토그램 버킷 (초)
+# ==========================================
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if value == float("-inf"):
+        return "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Sharded(ABC):
+    """
+    스레드별 샤드에 기록하고 수집할 때만 합침.
+    기록 경로에는 잠금이 없고, 스레드가 처음 기록할 때만 샤드 등록용 잠금을 사용.
+    (끝난 스레드의 샤드도 목록에 남아 누적값이 유지됨)
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+
+    @abstractmethod
+    def _new_shard(self):
+        """ 스레드 하나가 쓸 새 샤드 (하위 클래스마다 모양이 다름) """
+
+    def _shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._new_shard()
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def _snapshot(self):
+        with self._shards_lock:
+            return list(self._shards)
+
+
+class _CounterChild(_Sharded):
+    def _new_shard(self):
+        return [0]
+
+    def inc(self, amount=1):
+        if amount < 0:
+            raise ValueError("Counter 는 감소할 수 없습니다.")
+        self._shard()[0] += amount
+
+    @property
+    def value(self):
+        return sum(s[0] for s in self._snapshot())
+
+
+class _GaugeChild:
+    """ 마지막 값만 의미가 있으므로 단일 값 (대입은 GIL 하에서 원자적) """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        self.inc(-amount)
+
+
+class _HistogramChild(_Sharded):
+    def __init__(self, buckets):
+        super().__init__()
+        self.buckets = buckets
+
+    def _new_shard(self):
+        # [버킷별 개수..., +Inf 개수, 합계, 총 개수]
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def observe(self, value):
+        shard = self._shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def time(self):
+        return _HistogramTimer(self)
+
+    def collect(self):
+        """ (누적 버킷 개수 리스트, 합계, 총 개수) """
+        n = len(self.buckets) + 1
+        counts = [0] * n
+        total, count = 0.0, 0
+        for shard in self._snapshot():
+            for i in range(n):
+                counts[i] += shard[i]
+            total += shard[-2]
+            count += shard[-1]
+        for i in range(1, n):
+            counts[i] += counts[i - 1]
+        return counts, total, count
+
+
+class _HistogramTimer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+
+class _Metric(ABC):
+    type_name = None
+
+    def __init__(self, name, help_text, labelnames=(), registry=None):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+        (registry if registry is not None else REGISTRY).register(self)
+
+    @abstractmethod
+    def _new_child(self):
+        """ 라벨 조합 하나에 해당하는 자식 지표 """
+
+    def labels(self, *values):
+        """ 라벨 값별 자식 지표 (처음 쓰는 조합만 잠금 사용) """
+        values = tuple(str(v) for v in values)
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name}: 라벨 {self.labelnames} 값이 필요합니다.")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _items(self):
+        with self._lock:
+            return list(self._children.items())
+
+    def collect(self):
+        """ 라벨 값 튜플 -> 현재 값 (다른 프로세스로 보낼 수 있는 기본 자료형) """
+        return {values: child.value for values, child in self._items()}
+
+    def _combine(self, local, remote):
+        """ 같은 라벨의 로컬 값과 다른 프로세스 값 합치기 (카운터: 합) """
+        return local + remote
+
+    def _merged(self, remote):
+        merged = self.collect()
+        for snapshot in remote:
+            for values, value in snapshot.items():
+                merged[values] = self._combine(merged[values], value) if values in merged else value
+        return merged
+
+    def render(self, remote=()):
+        """ remote: 다른 프로세스의 collect() 결과 목록 (Registry.merge 참고) """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        for values, value in self._merged(remote).items():
+            lines.append(f"{self.name}{_label_str(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """ 단조 증가 카운터. counter.inc() 또는 counter.labels("a").inc(2) """
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value):
+        self._default.set(value)
+
+    def inc(self, amount=1):
+        self._default.inc(amount)
+
+    def dec(self, amount=1):
+        self._default.dec(amount)
+
+    def _combine(self, local, remote):
+        # 게이지는 마지막 값만 의미가 있으므로 이 프로세스 값 우선 (로컬에 없는 라벨만 다른 프로세스 값)
+        return local
+
+
+class Histogram(_Metric):
+    """ 고정 버킷 히스토그램. histogram.observe(sec) 또는 with histogram.time(): ... """
+    type_name = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS, registry=None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+    def collect(self):
+        return {values: child.collect() for values, child in self._items()}
+
+    def _combine(self, local, remote):
+        return [a + b for a, b in zip(local[0], remote[0])], local[1] + remote[1], local[2] + remote[2]
+
+    def render(self, remote=()):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type_name}"]
+        for values, (counts, total, count) in self._merged(remote).items():
+            for edge, c in zip(self.buckets + (float("inf"),), counts):
+                le = f'le="{_format_value(float(edge))}"'
+                lines.append(f"{self.name}_bucket{_label_str(self.labelnames, values, le)} {c}")
+            labels = _label_str(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Registry:
+    """
+    지표 모음. 멀티프로세스 실행(main_mp.py)에서는 워커 프로세스가 snapshot() 을 보내고
+    /metrics 를 내보내는 프로세스가 merge() 해서 한 번에 노출함.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._remote = {}   # source -> snapshot()
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def snapshot(self):
+        """ {지표 이름: {라벨 값 튜플: 값}} (pickle 가능, 다른 프로세스의 merge 로 전달) """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.collect() for metric in metrics}
+
+    def merge(self, source, snapshot):
+        """
+        다른 프로세스의 snapshot() 을 render 에 합침. 같은 source 는 새 스냅샷으로 교체
+        (프로세스별 누적값이므로 더하지 않음). 카운터/히스토그램은 합, 게이지는 이 프로세스 값 우선
+        """
+        with self._lock:
+            self._remote[source] = snapshot
+
+    def render(self):
+        """ Prometheus 텍스트 노출 형식 (version 0.0.4) """
+        with self._lock:
+            metrics = list(self._metrics.values())
+            remote = list(self._remote.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render([r[metric.name] for r in remote if metric.name in r]))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+# ==========================================
+# 지게차 런타임 지표 (StatusServer 의 /metrics 로 노출)
+# ==========================================
+STATE = Gauge("forklift_state", "1 if the forklift is currently in this state", ["state"])
+STATE_TRANSITIONS = Counter("forklift_state_transitions_total", "State transitions by target state", ["state"])
+STATE_SECONDS = Counter("forklift_state_seconds_total", "Time spent in each state", ["state"])
+PIPELINE_FPS = Gauge("forklift_pipeline_fps", "Processed frames per second by mode", ["mode"])
+
+INFERENCE_SECONDS = Histogram("forklift_inference_seconds", "YOLOE cargo detection latency")
+DETECTIONS = Counter("forklift_cargo_detections_total", "Cargo boxes detected")
+TILT_VERDICTS = Counter("forklift_tilt_verdicts_total", "Per-track tilt verdicts", ["status"])
+TILT_ANALYSES = Counter("forklift_tilt_analyses_total", "Hough analyses run or skipped by the tracker", ["result"])
+
+DISTANCE_SECONDS = Histogram("forklift_distance_estimation_seconds", "Pose inference + distance estimation latency")
+PERSONS = Counter("forklift_persons_total", "Persons with an estimated distance by status", ["status"])
+DANGER_FRAMES = Counter("forklift_danger_frames_total", "MOVING frames with at least one person in DANGER")
+
+STALE_FRAMES = Counter("forklift_stale_frames_total", "Frames dropped because they exceeded a stage's max age", ["stage"])
+GLASS_TO_ALERT = Histogram("forklift_glass_to_alert_seconds", "Capture to published result/alert latency", ["mode"])
+
+GOVERNOR_LEVEL = Gauge("forklift_governor_level", "Thermal/load governor degradation level (0: full quality)")
+CPU_TEMPERATURE = Gauge("forklift_cpu_temperature_celsius", "CPU temperature read from sysfs")
+CPU_FREQ_RATIO = Gauge("forklift_cpu_freq_ratio", "Current / maximum CPU clock (informational, low when idle)")
+CPU_THROTTLED = Gauge("forklift_cpu_throttled", "1 while firmware reports frequency capping, throttling or soft temp limit")
@@ -0,0 +1,163 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# ==========================================
+# [설정] 워밍업 / 지표 파라미터
+# ==========================================
+WARMUP_INTERVAL_S = 5.0   # 유휴 모델 워밍업 주기 (초)
+LATENCY_HISTORY = 50      # 보관할 전환 지연 기록 개수
+
+# 작업 스레드가 받아가는 실행 권한 (상태 + 상태 세대 번호)
+Ticket = namedtuple("Ticket", ["state", "epoch"])
+
+
+class ModelScheduler:
+    """
+    pose(MOVING) / YOLOE(STOPPED) 두 모델을 소유하고 상태 전환을 관리하는 스케줄러.
+
+    - 상태가 바뀔 때마다 세대(epoch)를 올려, 이전 상태에서 시작된 추론 결과는 폐기
+    - 쉬고 있는 모델은 주기적으로 작은 추론을 돌려 캐시를 따뜻하게 유지
+    - 상태 전환 ~ 새 모드의 첫 유효 결과까지의 지연을 기록
+    """
+
+    def __init__(self, initial_state="STOPPED", warmup_interval=WARMUP_INTERVAL_S):
+        self._cond = threading.Condition()
+        self._state = initial_state
+        self._epoch = 0
+        self._changed_at = time.monotonic()
+        self._awaiting_result = False
+
+        self._models = {}       # state -> model
+        self._warmup_fns = {}   # state -> 워밍업 함수
+        self._locks = {}        # state -> 모델 사용 락 (워밍업과 실제 추론 충돌 방지)
+        self._last_used = {}    # state -> 마지막 사용 시각
+
+        self.warmup_interval = warmup_interval
+        self.warmup_paused = False   # True 면 유휴 모델 워밍업 생략 (발열 시 governor 가 설정)
+        self.transition_latencies = deque(maxlen=LATENCY_HISTORY)
+        self._warmup_thread = None
+        self._stop_event = threading.Event()
+
+    # ------------------------------------------
+    # 모델 등록 / 상태 관리
+    # ------------------------------------------
+    def register(self, state, model, warmup_fn=None):
+        """상태별 모델과 워밍업 함수(model 하나를 인자로 받음) 등록"""
+        self._models[state] = model
+        self._warmup_fns[state] = warmup_fn
+        self._locks[state] = threading.Lock()
+        self._last_used[state] = 0.0
+
+    def model(self, state):
+        return self._models[state]
+
+    @property
+    def state(self):
+        return self._state
+
+    def set_state(self, new_state):
+        """상태 변경. 실제로 바뀌었으면 True 반환 후 대기 중인 스레드를 깨움"""
+        with self._cond:
+            if new_state == self._state:
+                return False
+            self._state = new_state
+            self._epoch += 1
+            self._changed_at = time.monotonic()
+            self._awaiting_result = True
+            self._cond.notify_all()
+        return True
+
+    def wait_for(self, state, timeout=None):
+        """state 가 될 때까지 대기 후 Ticket 반환 (timeout 시 None)"""
+        with self._cond:
+            ok = self._cond.wait_for(lambda: self._state == state or self._stop_event.is_set(), timeout)
+            if not ok or self._stop_event.is_set():
+                return None
+            return Ticket(state, self._epoch)
+
+    def is_current(self, ticket):
+        return ticket is not None and ticket.epoch == self._epoch
+
+    # ------------------------------------------
+    # 추론 실행
+    # ------------------------------------------
+    def run(self, ticket, fn, *args, **kwargs):
+        """
+        Ticket 의 모델 락을 잡고 fn 실행.
+        실행 전/후에 상태가 바뀌었으면 결과를 버리고 (False, None) 반환.
+        """
+        if not self.is_current(ticket):
+            return False, None
+
+        with self._locks[ticket.state]:
+            result = fn(*args, **kwargs)
+            self._last_used[ticket.state] = time.monotonic()
+
+        if not self.is_current(ticket):
+            return False, None
+
+        self._mark_valid_result(ticket)
+        return True, result
+
+    def _mark_valid_result(self, ticket):
+        with self._cond:
+            if not self._awaiting_result or ticket.epoch != self._epoch:
+                return
+            self._awaiting_result = False
+            latency_ms = (time.monotonic() - self._changed_at) * 1000.0
+
+        self.transition_latencies.append((ticket.state, latency_ms))
+        print(f"[Scheduler] {ticket.state} 전환 지연: {latency_ms:.1f} ms")
+
+    def transition_stats(self):
+        """상태별 전환 지연 통계 (ms) 반환"""
+        stats = {}
+        for state, latency in list(self.transition_latencies):
+            stats.setdefault(state, []).append(latency)
+        return {
+            state: {
+                "count": len(values),
+                "last": values[-1],
+                "mean": sum(values) / len(values),
+                "max": max(values),
+            }
+            for state, values in stats.items()
+        }
+
+    # ------------------------------------------
+    # 유휴 모델 워밍업
+    # ------------------------------------------
+    def start_warmup(self):
+        if self._warmup_thread is not None:
+            return
+        self._warmup_thread = threading.Thread(target=self._warmup_loop, daemon=True)
+        self._warmup_thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _warmup_loop(self):
+        while not self._stop_event.wait(self.warmup_interval / 2):
+            if self.warmup_paused:
+                continue
+            now = time.monotonic()
+            for state, warmup_fn in self._warmup_fns.items():
+                if warmup_fn is None or state == self._state:
+                    continue
+                if now - self._last_used[state] < self.warmup_interval:
+                    continue
+
+                lock = self._locks[state]
+                # 전환 직후 실제 추론이 모델을 잡고 있으면 건너뜀
+                if not lock.acquire(blocking=False):
+                    continue
+                try:
+                    warmup_fn(self._models[state])
+                    self._last_used[state] = time.monotonic()
+                except Exception as e:
+                    print(f"[Scheduler] {state} 워밍업 실패: {e}")
+                finally:
+                    lock.release()
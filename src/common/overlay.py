@@ -0,0 +1,88 @@
+from functools import lru_cache
+
+import cv2
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+@lru_cache(maxsize=512)
+def text_size(text, scale, thickness):
+    """cv2.getTextSize 결과 캐시 (같은 라벨이 매 프레임 반복되므로). 라벨 크기 계산은 모두 여기로"""
+    return cv2.getTextSize(text, FONT, scale, thickness)
+
+
+class Overlay:
+    """
+    한 프레임의 주석(박스/라벨/점)을 모아 두었다가,
+    프레임을 표시 해상도로 줄인 뒤 그 위에 한 번에 그리는 렌더러.
+
+    - 좌표는 원본 프레임 기준으로 넣고, render 시 표시 크기에 맞춰 변환
+    - 텍스트는 표시 해상도에서 래스터화 (원본에 그린 뒤 줄이지 않음), 크기는 text_size 캐시로 계산
+    - enabled=False (헤드리스, 접속자 없음) 이면 수집/그리기를 모두 생략
+    - 작업 스레드/프로세스마다 하나를 두고 프레임마다 reset(enabled) 로 다시 씀
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.items = []
+
+    def reset(self, enabled=True):
+        """다음 프레임 준비: 주석을 비우고 렌더링 여부를 다시 정함"""
+        self.enabled = enabled
+        # 새 리스트로 바꿈 (이전 프레임의 items 를 큐로 넘겼어도 영향 없음)
+        self.items = []
+
+    # ------------------------------------------
+    # 주석 수집
+    # ------------------------------------------
+    def box(self, x1, y1, x2, y2, color, thickness=2):
+        if self.enabled:
+            self.items.append(("box", (x1, y1, x2, y2), color, thickness, None))
+
+    def label(self, text, x, y, color, scale=0.55, thickness=2, background=None):
+        """background 색을 주면 텍스트 뒤에 채운 사각형을 깔고 글자는 흰색으로 그림"""
+        if self.enabled:
+            self.items.append(("label", (x, y), color, thickness, (text, scale, background)))
+
+    def point(self, x, y, color, radius=5):
+        if self.enabled:
+            self.items.append(("point", (x, y), color, -1, radius))
+
+    # ------------------------------------------
+    # 렌더링
+    # ------------------------------------------
+    def render(self, frame, size=(640, 480)):
+        """
+        frame 을 size 로 줄이고 모은 주석을 그린 이미지를 반환 (enabled=False 면 None).
+        frame 이 이미 size 크기면 복사 없이 그 위에 그리므로 호출자가 소유한 프레임이어야 함.
+        """
+        if not self.enabled:
+            return None
+
+        h, w = frame.shape[:2]
+        out_w, out_h = size
+        if (w, h) == (out_w, out_h):
+            out = frame
+            sx = sy = 1.0
+        else:
+            out = cv2.resize(frame, (out_w, out_h))
+            sx, sy = out_w / w, out_h / h
+
+        for kind, pts, color, thickness, extra in self.items:
+            if kind == "box":
+                x1, y1, x2, y2 = pts
+                cv2.rectangle(out, (int(x1 * sx), int(y1 * sy)), (int(x2 * sx), int(y2 * sy)), color, thickness)
+            elif kind == "label":
+                text, scale, background = extra
+                # 표시 해상도에서 라벨이 화면 밖으로 잘리지 않도록 크기만큼 안쪽으로 당김
+                (tw, th), _ = text_size(text, scale, thickness)
+                pad = 5 if background is not None else 0
+                x = min(max(int(pts[0] * sx), 0), max(out_w - tw, 0))
+                y = min(max(int(pts[1] * sy), th + pad), max(out_h - pad, th + pad))
+                if background is not None:
+                    cv2.rectangle(out, (x, y - th - 5), (x + tw, y + 5), background, -1)
+                    color = (255, 255, 255)
+                cv2.putText(out, text, (x, y), FONT, scale, color, thickness)
+            elif kind == "point":
+                cv2.circle(out, (int(pts[0] * sx), int(pts[1] * sy)), extra, color, thickness)
+        return out
@@ -0,0 +1,84 @@
+"""
+main_mp.py / main_async.py 공용: 상태 이름, 프레임 소스, 모델 로드.
+
+카메라 대신 합성/녹화 영상, 실제 모델 대신 src.benchmark.stubs 대역을 고를 수 있어
+두 실행 버전 모두 장비 없이 같은 입력으로 돌려 비교할 수 있음.
+
+    frames = open_source("synthetic", source_shape("synthetic"), fps=30)   # (frame, t_capture) 제너레이터
+    detector = load_models(opts, "detect")          # opts.stub_models, opts.stub_latency_ms
+    pose, homography = load_models(opts, "pose")
+"""
+import time
+
+import cv2
+
+# ==========================================
+# [설정]
+# ==========================================
+STATES = ("MOVING", "STOPPED")
+FRAME_SHAPE = (1232, 1640, 3)   # camera_input 해상도
+SWITCH_EVERY_S = 5.0            # --state alternate 전환 주기
+SOURCE_MAX_FRAMES = 300         # 녹화 영상은 이만큼만 메모리에 올려 반복 재생
+
+
+def open_source(source, shape, fps):
+    """
+    (프레임, 캡처 시각) 제너레이터 (camera / synthetic / 녹화 경로). 녹화/합성은 반복 재생.
+    캡처 시각은 time.monotonic() 기준: 카메라는 센서 타임스탬프(get_frame_stamped), 녹화/합성은 내보낸 시각
+    """
+    if source == "camera":
+        from src.common.camera_input import init_camera, get_frame_stamped
+        picam2 = init_camera()
+        try:
+            while True:
+                yield get_frame_stamped(picam2)
+        finally:
+            picam2.stop()
+
+    if source == "synthetic":
+        from src.benchmark.stubs import synthetic_clip
+        frames = synthetic_clip(60, shape)
+    else:
+        from src.common.recorded_frames import iter_frames
+        frames = list(iter_frames(source, limit=SOURCE_MAX_FRAMES))
+        if not frames:
+            raise FileNotFoundError(f"프레임을 읽을 수 없습니다: {source}")
+    h, w = shape[:2]
+    frames = [f if f.shape == tuple(shape) else cv2.resize(f, (w, h)) for f in frames]
+
+    interval = 1.0 / fps if fps > 0 else 0.0
+    next_t = time.monotonic()
+    while True:
+        for frame in frames:
+            if interval:
+                next_t += interval
+                delay = next_t - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_t = time.monotonic()
+            yield frame, time.monotonic()
+
+
+def source_shape(source):
+    if source in ("camera", "synthetic"):
+        return FRAME_SHAPE
+    from src.common.recorded_frames import iter_frames
+    first = next(iter(iter_frames(source, limit=1)), None)
+    if first is None:
+        raise FileNotFoundError(f"프레임을 읽을 수 없습니다: {source}")
+    return first.shape
+
+
+def load_models(opts, which):
+    if opts.stub_models:
+        from src.benchmark.stubs import StubDetector, StubPose, stub_homography
+        if which == "detect":
+            return StubDetector(latency_ms=opts.stub_latency_ms)
+        return StubPose(latency_ms=opts.stub_latency_ms), stub_homography()
+    if which == "detect":
+        from src.models.yoloe_loader import load_yoloe_model
+        return load_yoloe_model()
+    from src.models.pose_loader import load_pose_model
+    from src.person_detection.distance_estimation import load_calibration_data
+    return load_pose_model(), load_calibration_data()
@@ -0,0 +1,187 @@
+"""
+main.py / main_async.py / main_mp.py 공용: 상태별 한 프레임 처리 단계.
+
+세 실행 버전이 같은 처리를 하도록 검출 래퍼(ROI 크롭, --tiles), governor 설정(추론 간격, imgsz,
+기울기 분석 방식), 추론 후 최대 나이(STOPPED/tilt), 단계 지연 기록(stage_timer, governor.observe)을
+여기서 한 번만 구현함. 캡처, 상태 전환, 출력(그리기/게시)은 실행 버전마다 다름.
+
+    detector, roi = build_detector(model, opts)        # opts.no_roi, opts.tiles, opts.tile_region
+    stopped = StoppedStage(model, detector, roi, mask_tilt=opts.mask_tilt, governor=governor)
+    knobs = stopped.begin(epoch)                       # 정차(epoch)마다 트래커를 새로 시작
+    result = stopped.detect(frame, knobs)              # YOLOE (ModelScheduler.run 으로 감쌀 수 있음)
+    detections = stopped.analyze(frame, t_capture, result, overlay)   # 추론 중 낡았으면 None
+
+    moving = MovingStage(pose, homography, governor=governor)
+    moving.begin()
+    result_frame, objects = moving.detect(frame, overlay)
+    distances = moving.report(objects)                 # 콘솔 로그 + 상태 서버용 목록
+
+governor 는 knobs 속성과 observe(단계, 초) 가 있는 객체 (src.common.governor.Governor 또는 대리자).
+None 이면 항상 0 단계 설정으로 실행.
+"""
+import time
+
+from src.common.frame_policy import frame_policy
+from src.common.governor import Governor, LEVELS
+from src.common.stage_timer import stage_timer
+from src.detection.object_detection import run_inference
+from src.detection.roi import RoiDetector, load_roi, roi_rect
+from src.detection.tiling import TiledDetector
+from src.models.yoloe_loader import to_canonical
+from src.person_detection.distance_estimation import process_distance_estimation
+from src.tilt.tilt_tracker import TiltTracker
+
+# ==========================================
+# [설정]
+# ==========================================
+ROI_COLOR = (160, 160, 160)
+
+
+def add_stage_arguments(parser):
+    """ 검출 래퍼 / 최대 나이 / governor 인자 (세 실행 버전에서 같은 이름과 의미) """
+    parser.add_argument("--mask-tilt", action="store_true", help="Hough 대신 YOLOE-seg 마스크 방향으로 기울기 판정")
+    parser.add_argument("--no-roi", action="store_true", help="저장된 화물 ROI(cargo_roi.npy)를 쓰지 않고 프레임 전체 검출")
+    parser.add_argument("--tiles", action="store_true", help="정차 중 검출을 겹치는 타일 배치 추론으로 실행")
+    parser.add_argument("--tile-region", type=float, nargs=4, default=None, metavar=("X1", "Y1", "X2", "Y2"),
+                        help="타일로 볼 영역 (0~1 비율, 예: 포크/적재 영역). 생략하면 프레임 전체")
+    parser.add_argument("--max-age", action="append", default=[], metavar="STAGE=SECONDS",
+                        help="단계별 최대 프레임 나이 변경 (예: STOPPED/tilt=2.0, 0 이면 검사 끔). 여러 번 지정 가능")
+    parser.add_argument("--no-governor", action="store_true", help="발열/부하 governor 끄기 (항상 최고 품질)")
+    parser.add_argument("--max-governor-level", type=int, default=None,
+                        help="governor 가 올라갈 수 있는 최대 단계 (기본: 마지막 단계, MOVING 간격 조정 포함)")
+
+
+def make_governor(opts):
+    return Governor(max_level=0 if opts.no_governor else opts.max_governor_level)
+
+
+def build_detector(model, opts):
+    """ ROI 크롭 / 타일 배치 추론 래퍼를 씌운 검출기와 화물 ROI 반환 (ROI 를 먼저 자르고 그 안에서 타일 분할) """
+    detector = TiledDetector(model, region=opts.tile_region) if opts.tiles else model
+    roi = None if opts.no_roi else load_roi()
+    if roi is not None:
+        detector = RoiDetector(detector, roi)
+        print(f"[ROI] 화물 ROI 사용: {roi.round(3).tolist()}")
+    return detector, roi
+
+
+class _Stage:
+    interval_knob = None   # Knobs 의 추론 간격 필드 이름
+
+    def __init__(self, governor):
+        self.governor = governor
+        self._started = None
+
+    @property
+    def knobs(self):
+        return self.governor.knobs if self.governor is not None else LEVELS[0]
+
+    def interval_left(self, now=None):
+        """ 마지막 begin() 이후 governor 추론 간격 중 남은 시간 (초, 0 이상) """
+        if self._started is None:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        return max(0.0, getattr(self.knobs, self.interval_knob) - (now - self._started))
+
+    def _observe(self, stage, seconds):
+        if self.governor is not None:
+            self.governor.observe(stage, seconds)
+
+
+class StoppedStage(_Stage):
+    """ STOPPED: YOLOE (ROI / 타일, governor imgsz) -> STOPPED/tilt 나이 확인 -> TiltTracker (트랙별 누적 판정) """
+    interval_knob = "stopped_interval"
+
+    def __init__(self, model, detector=None, roi=None, mask_tilt=False, governor=None, panel=None):
+        super().__init__(governor)
+        self.model = model            # 클래스 프로필 인덱스 변환용 원본 모델
+        self.detector = detector or model
+        self.roi = roi
+        self.mask_tilt = mask_tilt
+        self.panel = panel            # 기울기 각도 분포 그래프 (main.py --tilt-graph)
+        self.tracker = None
+        self._epoch = None
+        self.frame_count = 0
+
+    def begin(self, epoch):
+        """ 프레임 처리 시작. 정차할 때마다(epoch) 트래커를 새로 시작하고 현재 governor 설정 반환 """
+        if epoch != self._epoch:
+            # 이동 중 화물이 움직였을 수 있으므로 이전 정차의 누적 판정은 버림
+            self.tracker = TiltTracker(use_masks=self.mask_tilt, panel=self.panel)
+            if self.panel is not None:
+                self.panel.reset()
+            self._epoch = epoch
+        knobs = self.knobs
+        self.tracker.analyzer = knobs.tilt
+        self._started = time.monotonic()
+        return knobs
+
+    def detect(self, frame, knobs):
+        self.frame_count += 1
+        start = time.monotonic()
+        with stage_timer.stage("STOPPED/detect"):
+            result = run_inference(self.detector, frame, self.frame_count, self.mask_tilt, knobs.imgsz)
+        self._observe("STOPPED/detect", time.monotonic() - start)
+        return result
+
+    def analyze(self, frame, t_capture, result, overlay):
+        """
+        추론 결과 -> detections 목록 (주석은 overlay 에 모음).
+        추론이 밀려 프레임이 STOPPED/tilt 최대 나이를 넘었으면 분석 없이 None (다음 최신 프레임으로)
+        """
+        if not frame_policy.fresh("STOPPED/tilt", t_capture):
+            return None
+        if self.roi is not None:
+            rect = roi_rect(self.roi, frame.shape)
+            if rect:
+                overlay.box(*rect, ROI_COLOR, 1)
+        detections = []
+        if not result:
+            return detections
+
+        data = result.boxes.data.cpu().numpy()   # (N, 6) = xyxy, conf, cls 를 한 번에 host 로
+        boxes = data[:, :4].astype(int)
+        # 클래스 프로필 인덱스 -> 전체 names 기준 클래스 ID
+        classes = to_canonical(self.model, data[:, 5].astype(int))
+
+        # 트랙별 누적 판정 (수렴한 트랙은 박스가 움직이기 전까지 Hough 분석 생략)
+        with stage_timer.stage("STOPPED/tilt"):
+            verdicts = self.tracker.update(frame, boxes, result.masks if self.mask_tilt else None)
+        for (x1, y1, x2, y2), cls, (track_id, status, color, angle) in zip(boxes.tolist(), classes.tolist(), verdicts):
+            detections.append({"box": [x1, y1, x2, y2], "cls": int(cls), "track": track_id,
+                               "status": status, "angle": float(angle)})
+            # 원본 해상도에 그리지 않고 주석만 모아 표시 해상도에서 그림
+            overlay.box(x1, y1, x2, y2, color)
+            overlay.label(f"#{track_id} {cls} | {status} {angle:.1f}°", x1, max(10, y1 - 10), color)
+        return detections
+
+
+class MovingStage(_Stage):
+    """
+    MOVING: pose + 거리 추정 (주석 좌표는 640x480 기준).
+    처리하는 프레임이 이미 가장 최신이므로 나이로 버리지 않음 (늦어도 거리 경보는 냄)
+    """
+    interval_knob = "moving_interval"
+
+    def __init__(self, pose, homography, governor=None):
+        super().__init__(governor)
+        self.pose = pose
+        self.homography = homography
+
+    def begin(self):
+        self._started = time.monotonic()
+        return self.knobs
+
+    def detect(self, frame, overlay=None):
+        """ (640x480 결과 프레임, [(x, 거리, 상태), ...]) 반환 """
+        start = time.monotonic()
+        with stage_timer.stage("MOVING/distance"):
+            result_frame, objects = process_distance_estimation(self.pose, frame, self.homography, overlay=overlay)
+        self._observe("MOVING/distance", time.monotonic() - start)
+        return result_frame, objects
+
+    def report(self, objects):
+        """ 사람 감지 콘솔 로그 + 상태 서버 / 결과 메시지용 distances 목록 (상태가 바뀌어 버린 결과는 부르지 않음) """
+        if objects:
+            print(f"[MOVING] Person Detected: {', '.join(f'{d:.1f}m' for _, d, _ in objects)}")
+        return [{"x": float(x), "dist": float(d), "status": s} for x, d, s in objects]
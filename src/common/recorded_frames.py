@@ -0,0 +1,70 @@
+import glob
+import os
+
+import cv2
+import numpy as np
+
+# 녹화 프레임 형식
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".h264")
+SESSION_EXTS = (".npy", ".npz")
+
+
+def list_clips(source):
+    """ source(폴더 또는 파일) 안의 영상/세션 파일과 이미지 폴더 목록 (정렬된 순서) """
+    if not os.path.isdir(source):
+        return [source] if os.path.exists(source) else []
+    paths = sorted(glob.glob(os.path.join(source, "**", "*"), recursive=True))
+    clips = [p for p in paths if os.path.splitext(p)[1].lower() in VIDEO_EXTS + SESSION_EXTS]
+    image_dirs = sorted({os.path.dirname(p) for p in paths if os.path.splitext(p)[1].lower() in IMAGE_EXTS})
+    return clips + image_dirs
+
+
+def iter_frames(source, limit=None, step=1):
+    """
+    source: 이미지 폴더, 영상 파일, 또는 (N, H, W, 3) 배열을 담은 .npy/.npz 녹화 세션.
+    폴더 안에 영상/세션 파일이 섞여 있어도 모두 읽음. BGR 프레임을 yield.
+    step: 영상/세션에서 N 프레임마다 1장 사용
+    """
+    count = 0
+
+    def emit(frame):
+        nonlocal count
+        count += 1
+        return frame
+
+    if os.path.isdir(source):
+        paths = sorted(glob.glob(os.path.join(source, "**", "*"), recursive=True))
+    else:
+        paths = [source]
+
+    for path in paths:
+        if limit is not None and count >= limit:
+            return
+        ext = os.path.splitext(path)[1].lower()
+
+        if ext in IMAGE_EXTS:
+            frame = cv2.imread(path)
+            if frame is not None:
+                yield emit(frame)
+
+        elif ext in VIDEO_EXTS:
+            cap = cv2.VideoCapture(path)
+            index = 0
+            while limit is None or count < limit:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if index % step == 0:
+                    yield emit(frame)
+                index += 1
+            cap.release()
+
+        elif ext in SESSION_EXTS:
+            data = np.load(path, mmap_mode="r") if ext == ".npy" else np.load(path)
+            arrays = [data] if ext == ".npy" else [data[k] for k in data.files]
+            for frames in arrays:
+                for frame in frames[::step]:
+                    if limit is not None and count >= limit:
+                        return
+                    yield emit(np.ascontiguousarray(frame))
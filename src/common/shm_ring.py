@@ -0,0 +1,107 @@
+"""
+multiprocessing.shared_memory 기반 프레임 링 버퍼 (쓰는 쪽 1개, 읽는 쪽 여러 개).
+
+프레임 자체는 공유 메모리 슬롯에 한 번만 복사하고, 프로세스 사이에는 (seq, 시각) 같은
+작은 메타데이터만 큐로 주고받음. 읽는 쪽은 seq 로 슬롯을 찾아 복사해 가며,
+그 사이 쓰는 쪽이 슬롯을 덮어썼으면 (seq 불일치) None 을 받아 해당 프레임을 버림.
+
+    ring = FrameRing.create((1232, 1640, 3))      # 부모 프로세스
+    spec = ring.spec                              # 자식 프로세스로 넘김 (pickle 가능)
+    ring = FrameRing.attach(spec)                 # 자식 프로세스
+    seq = ring.write(frame)                       # 캡처
+    frame = ring.read(seq)                        # 소비 (덮어써졌으면 None)
+
+seq 는 큐(파이프)를 통해 전달되므로 읽는 쪽이 seq 를 받을 때는 이미 쓰기가 끝나 있음.
+슬롯 앞뒤의 seq 비교는 그 뒤에 같은 슬롯이 재사용되는 경우(읽기가 RING_SLOTS 프레임 이상 늦음)를 걸러냄.
+"""
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# ==========================================
+# [설정]
+# ==========================================
+RING_SLOTS = 8     # 슬롯 수 (읽는 쪽이 이만큼 늦어지면 프레임을 버림)
+_WRITING = -1
+
+
+def _attach(name):
+    """
+    만든 쪽이 unlink 를 담당하므로 붙는 쪽은 추적하지 않음 (Python 3.13+).
+    그 이전 버전은 spawn/fork 로 만든 자식이 부모의 resource_tracker 를 공유하므로
+    같은 이름이 한 번 더 등록될 뿐이고, 자식에서 unregister 하면 부모 등록까지 지워지므로 하지 않음.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+class FrameRing:
+    def __init__(self, shm, shape, dtype, slots, owner):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.owner = owner
+        # 헤더: 슬롯별 seq (slots 개) + 마지막으로 쓴 seq 1개
+        self._header = np.ndarray((slots + 1,), dtype=np.int64, buffer=shm.buf)
+        self._frames = np.ndarray((slots,) + self.shape, dtype=self.dtype, buffer=shm.buf, offset=self._header.nbytes)
+        self._next = int(self._header[-1]) + 1
+
+    @classmethod
+    def create(cls, shape, dtype=np.uint8, slots=RING_SLOTS):
+        header = (slots + 1) * np.dtype(np.int64).itemsize
+        size = header + slots * int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        ring = cls(shm, shape, dtype, slots, owner=True)
+        ring._header[:] = _WRITING
+        ring._next = 0
+        return ring
+
+    @classmethod
+    def attach(cls, spec):
+        name, shape, dtype, slots = spec
+        return cls(_attach(name), shape, dtype, slots, owner=False)
+
+    @property
+    def spec(self):
+        return (self.shm.name, self.shape, self.dtype.str, self.slots)
+
+    @property
+    def latest_seq(self):
+        return int(self._header[-1])
+
+    def write(self, frame):
+        """ 다음 슬롯에 frame 을 복사하고 seq 반환 (쓰는 프로세스는 하나여야 함) """
+        if frame.shape != self.shape:
+            raise ValueError(f"프레임 크기가 링 버퍼와 다릅니다: {frame.shape} != {self.shape}")
+        seq = self._next
+        slot = seq % self.slots
+        self._header[slot] = _WRITING
+        np.copyto(self._frames[slot], frame, casting="unsafe")
+        self._header[slot] = seq
+        self._header[-1] = seq
+        self._next = seq + 1
+        return seq
+
+    def read(self, seq, out=None):
+        """ seq 프레임의 복사본 (out 을 주면 그 버퍼에 복사). 이미 덮어써졌으면 None """
+        slot = seq % self.slots
+        if self._header[slot] != seq:
+            return None
+        if out is None:
+            out = np.empty(self.shape, dtype=self.dtype)
+        np.copyto(out, self._frames[slot])
+        if self._header[slot] != seq:   # 복사 중에 덮어써짐
+            return None
+        return out
+
+    def close(self):
+        self._header = self._frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,201 @@
+import bisect
+import functools
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+# ==========================================
+# [설정] 단계별 지연 측정
+# ==========================================
+STAGE_TIMING = os.environ.get("CARGO_STAGE_TIMING", "0") == "1"
+REPORT_INTERVAL_S = 10.0
+
+# 로그 간격 버킷 경계 (ms): 0.05 ms ~ 약 13 s, 버킷당 약 19% 폭 -> 백분위 오차 ±10% 이내
+BUCKET_EDGES_MS = [0.05 * 1.19 ** i for i in range(72)]
+PERCENTILES = (50, 95, 99)
+
+_NULL = nullcontext()
+
+
+class LatencyHistogram:
+    """
+    고정 크기 버킷 히스토그램 (샘플 수와 관계없이 메모리 일정).
+    백분위는 버킷 상단 값으로 근사.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_EDGES_MS) + 1)
+        self.clear()
+
+    def clear(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, ms):
+        self.counts[bisect.bisect_left(BUCKET_EDGES_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def merge(self, other):
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, q):
+        if self.count == 0:
+            return 0.0
+        target = self.count * q / 100.0
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return min(BUCKET_EDGES_MS[i], self.max_ms) if i < len(BUCKET_EDGES_MS) else self.max_ms
+        return self.max_ms
+
+    @property
+    def mean_ms(self):
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class _Timer:
+    __slots__ = ("_owner", "_name", "_start")
+
+    def __init__(self, owner, name):
+        self._owner = owner
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._owner.record(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class StageTimer:
+    """
+    파이프라인 단계별 지연(capture -> detect -> analyze -> display) 측정기.
+
+        with stage_timer.stage("STOPPED/detect"):
+            result = run_inference(...)
+        stage_timer.frame("STOPPED")       # 모드별 FPS 집계
+        stage_timer.maybe_report()         # REPORT_INTERVAL_S 마다 출력
+
+        @stage_timer.timed("STOPPED/tilt")   # 함수 전체를 한 단계로 측정
+        def analyze(...): ...
+
+    enabled=False 이면 stage() 는 공용 nullcontext 를 돌려주므로 측정 비용이 없음.
+    timed() 는 호출할 때마다 enabled 를 확인하므로 나중에 켜도 (--timing) 적용됨.
+    단계 이름마다 기록하는 스레드가 하나라는 가정으로 잠금 없이 기록하고, 새 단계 이름이 처음 등장할 때만
+    잠금을 사용. report() 는 구간 히스토그램을 비우지 않고 잠금 안에서 새 dict 로 바꿔 끼우므로
+    기록 중인 스레드와 같은 히스토그램을 동시에 고치지 않음 (교체 순간 기록 중이던 샘플 하나는 빠질 수 있음).
+    모드별 프레임 수는 report() 가 구간 값을 0 으로 되돌리므로 항상 잠금 안에서 올림.
+    """
+
+    def __init__(self, enabled=STAGE_TIMING, interval=REPORT_INTERVAL_S):
+        self.enabled = enabled
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._window = {}    # 이번 보고 구간
+        self._total = {}     # 실행 전체
+        self._frames = {}    # mode -> [구간 프레임 수, 전체 프레임 수]
+        self._window_start = self._start = time.monotonic()
+
+    # ------------------------------------------
+    # 기록
+    # ------------------------------------------
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL
+        return _Timer(self, name)
+
+    def timed(self, name):
+        """ 함수 데코레이터. 비활성 상태에서는 시간 측정 없이 원래 함수만 호출 """
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, time.perf_counter() - start)
+            return wrapper
+        return decorator
+
+    def record(self, name, seconds):
+        hist = self._window.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._window.setdefault(name, LatencyHistogram())
+                self._total.setdefault(name, LatencyHistogram())
+        hist.add(seconds * 1000.0)
+
+    def frame(self, mode):
+        if not self.enabled:
+            return
+        with self._lock:
+            counts = self._frames.setdefault(mode, [0, 0])
+            counts[0] += 1
+            counts[1] += 1
+
+    # ------------------------------------------
+    # 보고
+    # ------------------------------------------
+    def maybe_report(self):
+        if self.enabled and time.monotonic() - self._window_start >= self.interval:
+            self.report()
+
+    def report(self, final=False):
+        """ 현재 구간(final=True 면 전체 실행) 통계를 출력하고 구간을 초기화 """
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            elapsed = max(now - (self._start if final else self._window_start), 1e-9)
+            window, self._window = self._window, {}
+            self._window_start = now
+            for name, hist in window.items():
+                self._total[name].merge(hist)
+            stages = self._total if final else window
+            lines = [f"[Timing] {'전체' if final else '최근'} {elapsed:.1f}s"]
+            for mode, counts in sorted(self._frames.items()):
+                lines.append(f"  {mode:<10} {(counts[1] if final else counts[0]) / elapsed:6.1f} FPS")
+                counts[0] = 0
+            for name in sorted(stages):
+                hist = stages[name]
+                if hist.count == 0:
+                    continue
+                p = "  ".join(f"p{q} {hist.percentile(q):7.1f}" for q in PERCENTILES)
+                lines.append(f"  {name:<20} n={hist.count:<6} mean {hist.mean_ms:7.1f}  {p}  max {hist.max_ms:7.1f} ms")
+        print("\n".join(lines))
+
+    def snapshot(self):
+        """ 전체 실행 기준 단계별 통계 dict (ms) """
+        with self._lock:
+            result = {}
+            for name, total in self._total.items():
+                hist = LatencyHistogram()
+                hist.merge(total)
+                window = self._window.get(name)
+                if window is not None:
+                    hist.merge(window)
+                result[name] = {"count": hist.count, "mean": hist.mean_ms, "max": hist.max_ms,
+                                **{f"p{q}": hist.percentile(q) for q in PERCENTILES}}
+            return result
+
+
+# 프로세스 공용 인스턴스
+stage_timer = StageTimer()
@@ -15,7 +15,9 @@ def show_image(image, window_name='Image', wait=True):
 def preview_dataset(dataset):
     for item in dataset:
         print(f"Label: {item['label']}")
-        plt.imshow(item["image"])
+        image = item["image"]
+        # detect_and_crop 의 기본 크롭은 BGR ndarray
+        plt.imshow(image[..., ::-1] if isinstance(image, np.ndarray) else image)
         plt.title(item["label"])
         plt.axis('off')
         plt.show()
@@ -35,12 +37,11 @@ def draw_label(frame, text, x, y, color):
     )
 
 
-def show_frame(frame):
-    """320x240으로 축소하여 표시"""
-<<<<<<< HEAD
-    display_frame = cv2.resize(frame, (640, 480))
-=======
-    display_frame = cv2.resize(frame, (320, 240))
->>>>>>> 5c679181eb29a809374a90eaf64f4ab305708726
+def show_frame(frame, size=(640, 480)):
+    """size(기본 640x480)로 축소하여 표시 (이미 같은 크기면 resize 생략)"""
+    if (frame.shape[1], frame.shape[0]) != size:
+        display_frame = cv2.resize(frame, size)
+    else:
+        display_frame = frame
     cv2.imshow("YOLOE + Fast Tilt Analyzer", display_frame)
     return cv2.waitKey(1) & 0xFF
\ No newline at end of file
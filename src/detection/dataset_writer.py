@@ -0,0 +1,249 @@
+"""
+detect_and_crop 결과를 메모리에 모으지 않고 디스크에 바로 쌓는 데이터셋 작성기.
+
+    root/
+      shard_00000/
+        000000.jpg, 000001.jpg, ...
+        index.jsonl      # 한 줄에 크롭 하나: file, label, box, conf, frame, hash, time
+      shard_00001/ ...
+
+- 프레임 -> 크롭은 제너레이터로 흘려보내고, 인코딩/파일 쓰기는 백그라운드 스레드가 담당
+  (큐 크기가 정해져 있어 쓰기가 밀리면 호출 쪽이 잠시 기다림)
+- 같은 라벨의 최근 크롭과 dHash 가 거의 같으면 건너뜀 -> 오래 정차한 구간이 데이터셋을 채우지 않음
+- 이미 있는 root 에 이어서 쓰면 다음 번호의 shard 부터 시작
+
+사용법 (프로젝트 루트에서):
+    python -m src.detection.dataset_writer --source data/testData --out dataset
+"""
+import argparse
+import glob
+import json
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# ==========================================
+# [설정]
+# ==========================================
+SHARD_SIZE = 1000          # shard 하나에 저장할 크롭 수
+QUEUE_SIZE = 256           # 쓰기 대기 크롭 수 (넘으면 호출 쪽이 대기)
+IMAGE_FORMAT = ".jpg"      # ".jpg" 또는 ".png"
+JPEG_QUALITY = 95
+HASH_SIZE = 8              # dHash 8x8 = 64bit
+DEDUP_DISTANCE = 4         # 해밍 거리 이하이면 같은 크롭으로 간주 (0 이면 중복 제거 끔)
+DEDUP_HISTORY = 32         # 라벨별로 비교할 최근 크롭 수
+INDEX_FILE = "index.jsonl"
+
+_STOP = object()
+
+
+def dhash(image, size=HASH_SIZE):
+    """ 가로 방향 밝기 차이 기반 perceptual hash (int). image: BGR ndarray 또는 PIL """
+    if isinstance(image, Image.Image):
+        gray = np.asarray(image.convert("L"))
+    else:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def iter_crops(frames, model=None, **detect_kwargs):
+    """ 프레임 이터러블 -> (frame_index, dataset 항목) 제너레이터 """
+    from src.detection.object_detection import detect_and_crop
+
+    for index, frame in enumerate(frames):
+        for item in detect_and_crop(frame, model=model, **detect_kwargs)["dataset"]:
+            yield index, item
+
+
+class DatasetWriter:
+    """
+    with DatasetWriter("dataset") as writer:
+        for frame_index, item in iter_crops(frames):
+            writer.write(item, frame=frame_index)
+
+    write() 는 중복 검사만 하고 큐에 넣은 뒤 바로 반환 (큐에 넣으면 True, 중복이면 False).
+    written 은 쓰기 스레드가 실제로 저장을 마친 크롭 수 (close() 후 확정).
+    크롭이 프레임의 view 일 수 있으므로 큐에 넣기 전에 복사함.
+    쓰기 스레드는 크롭 하나가 실패해도 멈추지 않고 큐를 계속 비움 (실패 수는 failed).
+    첫 실패는 다음 write() 또는 close() 에서 RuntimeError 로 올라옴.
+    """
+
+    def __init__(self, root, shard_size=SHARD_SIZE, queue_size=QUEUE_SIZE, image_format=IMAGE_FORMAT,
+                 dedup_distance=DEDUP_DISTANCE, dedup_history=DEDUP_HISTORY):
+        if image_format not in (".jpg", ".png"):
+            raise ValueError(f"지원하지 않는 이미지 형식: {image_format}")
+        self.root = root
+        self.shard_size = shard_size
+        self.image_format = image_format
+        self.dedup_distance = dedup_distance
+        self.dedup_history = dedup_history
+
+        self.written = 0
+        self.duplicates = 0
+        self.failed = 0
+        self._recent = {}    # label -> deque(최근 hash)
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._error = None
+        self._thread = None
+
+        os.makedirs(root, exist_ok=True)
+        existing = sorted(glob.glob(os.path.join(root, "shard_*")))
+        self._shard = int(os.path.basename(existing[-1])[6:]) + 1 if existing else 0
+        self._shard_count = 0
+        self._index = None
+
+    # ------------------------------------------
+    # 시작 / 종료
+    # ------------------------------------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._raise_error()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    # ------------------------------------------
+    # 기록 (호출 스레드)
+    # ------------------------------------------
+    def write(self, item, **meta):
+        self._raise_error()
+        if self._thread is None:
+            raise RuntimeError("DatasetWriter 가 시작되지 않았습니다 (start() 또는 with 사용).")
+
+        image, label = item["image"], item["label"]
+        h = dhash(image)
+        if self._is_duplicate(label, h):
+            self.duplicates += 1
+            return False
+
+        if isinstance(image, np.ndarray):
+            image = image.copy()
+        record = {"label": label, "hash": f"{h:016x}", "time": round(time.time(), 3), **meta}
+        for key in ("box", "conf"):
+            if key in item:
+                record[key] = item[key]
+        self._queue.put((image, record))
+        return True
+
+    def _is_duplicate(self, label, h):
+        if self.dedup_distance <= 0:
+            return False
+        recent = self._recent.setdefault(label, deque(maxlen=self.dedup_history))
+        if any(hamming(h, prev) <= self.dedup_distance for prev in recent):
+            return True
+        recent.append(h)
+        return False
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError(f"데이터셋 쓰기 실패: {error}") from error
+
+    # ------------------------------------------
+    # 쓰기 스레드
+    # ------------------------------------------
+    def _run(self):
+        # 작업마다 예외를 잡아 스레드가 죽지 않게 함 (죽으면 가득 찬 큐에서 write()/close() 가 멈춤)
+        try:
+            while True:
+                job = self._queue.get()
+                if job is _STOP:
+                    break
+                try:
+                    self._save(*job)
+                except Exception as e:
+                    self.failed += 1
+                    if self._error is None:
+                        self._error = e
+                else:
+                    self.written += 1
+        finally:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def _save(self, image, record):
+        if self._index is None or self._shard_count >= self.shard_size:
+            self._open_shard()
+
+        name = f"{self._shard_count:06d}{self.image_format}"
+        path = os.path.join(self.root, f"shard_{self._shard:05d}", name)
+        if isinstance(image, Image.Image):
+            image = cv2.cvtColor(np.asarray(image.convert("RGB")), cv2.COLOR_RGB2BGR)
+        params = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY] if self.image_format == ".jpg" else []
+        ok, buf = cv2.imencode(self.image_format, image, params)
+        if not ok:
+            raise IOError(f"이미지 인코딩 실패: {path}")
+        with open(path, "wb") as f:
+            f.write(buf.tobytes())
+
+        self._index.write(json.dumps({"file": name, **record}, ensure_ascii=False, default=float) + "\n")
+        self._shard_count += 1
+
+    def _open_shard(self):
+        if self._index is not None:
+            self._index.close()
+            self._shard += 1
+        shard_dir = os.path.join(self.root, f"shard_{self._shard:05d}")
+        os.makedirs(shard_dir, exist_ok=True)
+        self._index = open(os.path.join(shard_dir, INDEX_FILE), "a", encoding="utf-8", buffering=1)
+        self._shard_count = 0
+
+
+def write_dataset(frames, root, model=None, **detect_kwargs):
+    """ 프레임 이터러블을 검출/크롭해서 root 에 저장. (저장 수, 중복 수) 반환 """
+    with DatasetWriter(root) as writer:
+        for frame_index, item in iter_crops(frames, model=model, **detect_kwargs):
+            writer.write(item, frame=frame_index)
+    return writer.written, writer.duplicates
+
+
+def iter_dataset(root):
+    """ 저장된 데이터셋을 {"image": BGR ndarray, "label", ...} 형태로 순서대로 읽음 (preview_dataset 호환) """
+    for shard_dir in sorted(glob.glob(os.path.join(root, "shard_*"))):
+        index_path = os.path.join(shard_dir, INDEX_FILE)
+        if not os.path.exists(index_path):
+            continue
+        with open(index_path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                record["image"] = cv2.imread(os.path.join(shard_dir, record["file"]))
+                yield record
+
+
+if __name__ == "__main__":
+    from src.common.recorded_frames import iter_frames
+
+    parser = argparse.ArgumentParser(description="Stream detect_and_crop output into a sharded dataset")
+    parser.add_argument("--source", required=True, help="이미지 폴더 / 영상 / .npy·.npz 녹화 세션")
+    parser.add_argument("--out", required=True, help="데이터셋 저장 폴더")
+    parser.add_argument("--step", type=int, default=1, help="N 프레임마다 1장 사용")
+    parser.add_argument("--conf", type=float, default=0.1)
+    args = parser.parse_args()
+
+    written, duplicates = write_dataset(iter_frames(args.source, step=args.step), args.out, conf=args.conf)
+    print(f"[Dataset] {written} crops saved to {args.out} ({duplicates} near-duplicates skipped)")
@@ -2,64 +2,84 @@ import cv2
 import numpy as np
 from PIL import Image
 
-from src.models.yoloe_loader import load_yoloe_model, names
+from src.models.yoloe_loader import load_yoloe_model, names, to_canonical
+from src.common.metrics import INFERENCE_SECONDS, DETECTIONS
 
 CONF_THRESHOLD = 0.25
 SKIP_FRAMES = 10
+IMGSZ = 256   # 정차 중 YOLOE 입력 크기 (governor 가 낮출 수 있음)
 
-def run_inference(model, frame, frame_count):
+def run_inference(model, frame, frame_count, masks=False, imgsz=IMGSZ):
+    """
+    YOLOE 추론. masks=True 이면 seg 헤드의 인스턴스 마스크도 유지 (result.masks.xy 폴리곤,
+    mask_tilt 용). 기본은 기존처럼 task="detect" 로 박스만 사용.
+    imgsz: 입력 크기 (ONNX 백엔드는 고정 입력이라 무시)
+    """
     should_infer = 1#(frame_count % SKIP_FRAMES == 0)
 
     if not should_infer:
         return None
 
-    result = model.predict(
-        frame,
-        imgsz=256,
-        verbose=False,
-        conf=CONF_THRESHOLD,
-        task="detect"
-    )[0]
+    with INFERENCE_SECONDS.time():
+        result = model.predict(
+            frame,
+            imgsz=imgsz,
+            verbose=False,
+            conf=CONF_THRESHOLD,
+            task="segment" if masks else "detect"
+        )[0]
+    DETECTIONS.inc(len(result.boxes))
 
     return result
 
-def detect_and_crop(frame, conf=0.1, iou=0.5, imgsz=640, area_threshold=10000, padding=20):
-    model = load_yoloe_model()
+# detect_and_crop 기본 모델 (호출마다 다시 로드하지 않도록 한 번만 로드)
+_crop_model = None
 
-    img = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-    results = model.predict(img, conf=conf, iou=iou, imgsz=imgsz)
-    detections = results[0]
+def _get_crop_model():
+    global _crop_model
+    if _crop_model is None:
+        _crop_model = load_yoloe_model()
+    return _crop_model
+
+def detect_and_crop(frame, conf=0.1, iou=0.5, imgsz=640, area_threshold=10000, padding=20,
+                    model=None, as_pil=False):
+    """
+    frame(BGR) 에서 화물을 검출하고 박스별 크롭 + 라벨을 만듦 (데이터셋 구축용).
+
+    결과 박스는 xyxy / cls / conf 를 한 번에 배열로 가져와 면적 필터링, 패딩, 클리핑을 벡터 연산으로 처리.
+    크롭은 frame 의 NumPy view(BGR, 복사 없음)이므로 frame 을 수정하기 전에 사용하거나 복사해야 함.
+    as_pil=True 이면 기존처럼 RGB PIL 이미지로 변환해서 반환.
+    model 을 주지 않으면 기본 YOLOE 모델을 한 번만 로드해 재사용.
+
+    반환: {"boxes": 면적 area_threshold 미만 박스 (N, 4),
+           "dataset": [{"image", "label", "box", "conf"}, ...],
+           "annotated_image": RGB 시각화 이미지}
+    """
+    model = model or _get_crop_model()
+    detections = model.predict(frame, conf=conf, iou=iou, imgsz=imgsz, verbose=False)[0]
+
+    # 결과를 한 번에 host 로 가져옴 (data: (N, 6) = xyxy, conf, cls)
+    data = detections.boxes.data.cpu().numpy().reshape(-1, 6)
+    xyxy = data[:, :4]
+    confs = data[:, 4]
+    classes = to_canonical(model, data[:, 5].astype(int))
 
     # 면적 필터링
-    filtered_boxes = []
-    for det in detections.boxes:
-        xyxy = det.xyxy[0].cpu().numpy()
-        width = xyxy[2] - xyxy[0]
-        height = xyxy[3] - xyxy[1]
-        area = width * height
-        if area < area_threshold:
-            filtered_boxes.append(xyxy)
-
-    # 크롭 이미지 추출
-    img_width, img_height = img.size
-    cropped_images = []
-    for det in detections.boxes:
-        x1_orig, y1_orig, x2_orig, y2_orig = det.xyxy[0].cpu().numpy().astype(int)
-
-        x1 = max(0, x1_orig - padding)
-        y1 = max(0, y1_orig - padding)
-        x2 = min(img_width, x2_orig + padding)
-        y2 = min(img_height, y2_orig + padding)
-
-        crop = img.crop((x1, y1, x2, y2))
-        cropped_images.append(crop)
-
-    # Dataset 구성
+    areas = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1])
+    filtered_boxes = xyxy[areas < area_threshold]
+
+    # 패딩 + 이미지 경계로 클리핑
+    img_height, img_width = frame.shape[:2]
+    padded = xyxy.astype(int) + np.array([-padding, -padding, padding, padding])
+    np.clip(padded, 0, [img_width, img_height, img_width, img_height], out=padded)
+
+    # Dataset 구성 (크롭은 view)
     dataset = []
-    for det, crop in zip(detections.boxes, cropped_images):
-        class_id = int(det.cls.cpu().numpy()[0]) if det.cls.numel() > 0 else 0
-        class_name = names[class_id]
-        dataset.append({"image": crop, "label": class_name})
+    for (x1, y1, x2, y2), class_id, score in zip(padded.tolist(), classes.tolist(), confs.tolist()):
+        crop = frame[y1:y2, x1:x2]
+        if as_pil:
+            crop = Image.fromarray(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        dataset.append({"image": crop, "label": names[class_id], "box": (x1, y1, x2, y2), "conf": score})
 
     return {
         "boxes": filtered_boxes,
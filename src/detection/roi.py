@@ -0,0 +1,176 @@
+"""
+정차 중 화물 검출용 고정 ROI (포크 앞 적재 영역).
+
+ROI 는 camera_config.npy 와 같은 폴더의 cargo_roi.npy 에 (x1, y1, x2, y2) 0~1 비율로 저장
+(해상도가 바뀌어도 그대로 사용). RoiDetector 가 프레임을 ROI 로 잘라 추론하고
+박스/마스크를 원본 프레임 좌표로 되돌리므로, 같은 imgsz 에서 화물의 해상도는 올라가고
+추론할 영역은 줄어듦.
+
+ROI 설정 (프로젝트 루트에서):
+    python -m src.detection.roi --select                     # 카메라 프레임에서 마우스로 지정
+    python -m src.detection.roi --select --image frame.jpg   # 저장된 이미지에서 지정
+    python -m src.detection.roi --rect 0.2 0.45 0.8 1.0      # 비율로 직접 지정 (1 보다 크면 픽셀)
+    python -m src.detection.roi --show / --clear
+"""
+import argparse
+import os
+
+import cv2
+import numpy as np
+
+from src.models.result_types import Boxes, Masks, Results
+from src.person_detection.distance_estimation import CONFIG_FILE
+
+# ==========================================
+# [설정]
+# ==========================================
+ROI_FILE = os.path.join(os.path.dirname(CONFIG_FILE), "cargo_roi.npy")
+FRAME_SIZE = (1640, 1232)   # 픽셀로 지정할 때 기준 해상도 (camera_input 기본값)
+MIN_ROI_PX = 32             # 이보다 작은 ROI 는 무시
+
+
+def load_roi(path=ROI_FILE):
+    """ 저장된 ROI (0~1 비율 xyxy) 반환, 없거나 잘못되면 None """
+    if not os.path.exists(path):
+        return None
+    try:
+        roi = np.load(path).astype(np.float64).reshape(4)
+    except Exception as e:
+        print(f"[ROI] {path} 로드 실패: {e}")
+        return None
+    if not (0 <= roi[0] < roi[2] <= 1 and 0 <= roi[1] < roi[3] <= 1):
+        print(f"[ROI] 잘못된 ROI 값 {roi.tolist()} - 무시합니다.")
+        return None
+    return roi
+
+
+def save_roi(roi, path=ROI_FILE):
+    roi = np.clip(np.asarray(roi, dtype=np.float64).reshape(4), 0.0, 1.0)
+    np.save(path, roi)
+    print(f"[ROI] saved {path}: {np.round(roi, 4).tolist()}")
+    return roi
+
+
+def roi_rect(roi, shape):
+    """ 비율 ROI -> 프레임 픽셀 (x1, y1, x2, y2) int. 너무 작으면 None (프레임 전체 사용) """
+    h, w = shape[:2]
+    x1, y1, x2, y2 = (np.asarray(roi, dtype=np.float64) * [w, h, w, h]).round().astype(int).tolist()
+    x1, x2 = max(0, x1), min(w, x2)
+    y1, y2 = max(0, y1), min(h, y2)
+    if x2 - x1 < MIN_ROI_PX or y2 - y1 < MIN_ROI_PX:
+        return None
+    return x1, y1, x2, y2
+
+
+class RoiDetector:
+    """
+    model 을 감싸 predict(frame) 에서 ROI 만 추론하고 결과를 프레임 좌표로 되돌림.
+    (크롭은 복사 없는 view, Results.orig_img 는 원본 프레임)
+    """
+
+    def __init__(self, model, roi):
+        self.model = model
+        self.roi = np.asarray(roi, dtype=np.float64).reshape(4)
+        self._rects = {}    # 프레임 shape -> 픽셀 ROI
+
+    def __getattr__(self, name):
+        # names, class_ids, profile 등은 원래 모델 속성을 그대로 사용
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def rect(self, shape):
+        key = tuple(shape[:2])
+        if key not in self._rects:
+            self._rects[key] = roi_rect(self.roi, shape)
+        return self._rects[key]
+
+    def predict(self, source, **kwargs):
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        rects = [self.rect(f.shape) for f in frames]
+        crops = [f if r is None else f[r[1]:r[3], r[0]:r[2]] for f, r in zip(frames, rects)]
+        results = self.model.predict(crops, **kwargs)
+        return [self._to_frame(res, f, r) for res, f, r in zip(results, frames, rects)]
+
+    __call__ = predict
+
+    @staticmethod
+    def _to_frame(result, frame, rect):
+        ox, oy = (0, 0) if rect is None else rect[:2]
+        data = result.boxes.data.cpu().numpy().reshape(-1, 6)   # xyxy, conf, cls
+        xyxy = data[:, :4] + [ox, oy, ox, oy]
+        masks = None
+        if result.masks is not None:
+            masks = Masks([np.asarray(p).reshape(-1, 2) + [ox, oy] for p in result.masks.xy], frame.shape)
+        return Results(frame, result.names, Boxes(xyxy, data[:, 4], data[:, 5]),
+                       masks=masks)
+
+
+# ==========================================
+# ROI 설정 도구
+# ==========================================
+def _capture_frame():
+    from src.common.camera_input import init_camera, get_frame
+
+    picam2 = init_camera()
+    try:
+        return get_frame(picam2)
+    finally:
+        picam2.stop()
+
+
+def select_roi(frame, current=None):
+    """ cv2.selectROI 로 드래그해서 지정 (Enter/Space 확정, c 취소). 비율 ROI 또는 None 반환 """
+    h, w = frame.shape[:2]
+    view = frame.copy()
+    if current is not None and roi_rect(current, frame.shape):
+        x1, y1, x2, y2 = roi_rect(current, frame.shape)
+        cv2.rectangle(view, (x1, y1), (x2, y2), (0, 255, 255), 2)
+    scale = min(1.0, 1280 / w, 960 / h)   # 화면에 들어가도록 축소해서 표시
+    small = cv2.resize(view, (int(w * scale), int(h * scale))) if scale < 1 else view
+    x, y, rw, rh = cv2.selectROI("Select cargo ROI (Enter: OK, c: cancel)", small, showCrosshair=True)
+    cv2.destroyAllWindows()
+    if rw == 0 or rh == 0:
+        return None
+    return np.array([x, y, x + rw, y + rh], dtype=np.float64) / scale / [w, h, w, h]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Define the fixed cargo ROI used in STOPPED mode")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--select", action="store_true", help="마우스로 ROI 지정")
+    group.add_argument("--rect", type=float, nargs=4, metavar=("X1", "Y1", "X2", "Y2"),
+                       help="ROI 직접 지정 (0~1 비율, 1 보다 크면 FRAME_SIZE 기준 픽셀)")
+    group.add_argument("--show", action="store_true", help="현재 ROI 출력")
+    group.add_argument("--clear", action="store_true", help="ROI 삭제 (프레임 전체 사용)")
+    parser.add_argument("--image", default=None, help="--select 에서 카메라 대신 사용할 이미지")
+    parser.add_argument("--file", default=ROI_FILE, help="ROI 저장 경로")
+    args = parser.parse_args()
+
+    if args.show:
+        roi = load_roi(args.file)
+        if roi is None:
+            print("[ROI] 설정된 ROI 없음 (프레임 전체 사용)")
+        else:
+            px = roi_rect(roi, (FRAME_SIZE[1], FRAME_SIZE[0]))
+            print(f"[ROI] {np.round(roi, 4).tolist()} -> {FRAME_SIZE[0]}x{FRAME_SIZE[1]} 기준 {px}")
+    elif args.clear:
+        if os.path.exists(args.file):
+            os.remove(args.file)
+        print("[ROI] 삭제됨 (프레임 전체 사용)")
+    elif args.rect:
+        rect = np.array(args.rect, dtype=np.float64)
+        if rect.max() > 1.0:
+            rect = rect / [FRAME_SIZE[0], FRAME_SIZE[1], FRAME_SIZE[0], FRAME_SIZE[1]]
+        if not (rect[0] < rect[2] and rect[1] < rect[3]):
+            parser.error("x1 < x2, y1 < y2 여야 합니다.")
+        save_roi(rect, args.file)
+    else:
+        frame = cv2.imread(args.image) if args.image else _capture_frame()
+        if frame is None:
+            parser.error(f"이미지를 읽을 수 없습니다: {args.image}")
+        roi = select_roi(frame, load_roi(args.file))
+        if roi is None:
+            print("[ROI] 취소됨 - 기존 설정 유지")
+        else:
+            save_roi(roi, args.file)
@@ -0,0 +1,225 @@
+"""
+고해상도 프레임을 겹치는 타일로 나눠 한 번의 배치로 추론하는 검출기 래퍼.
+
+1640x1232 전체를 imgsz=256 으로 줄이면 랙 끝의 먼 팔레트가 몇 픽셀로 뭉개지므로,
+타일(기본 640px, 20% 겹침)마다 같은 imgsz 로 추론해 작은 물체의 해상도를 높임.
+
+  - 타일들은 모델에 리스트 하나로 넘겨 배치 추론 (ultralytics / OnnxModel / StubDetector 공통)
+  - 결과 박스를 원본 좌표로 옮긴 뒤 클래스별 NMS + 타일 경계에서 잘린 조각 제거
+  - region 으로 포크/적재 영역 등 일부 타일만 사용 -> 타일 수로 연산량을 조절
+  - include_full=True 이면 전체 프레임(축소) 도 배치에 넣어 타일보다 큰 물체를 놓치지 않음
+
+TiledDetector 는 predict() 가 Results 리스트를 반환하므로 run_inference 에 모델 대신 넣어 사용:
+    detector = TiledDetector(model, region=(0.25, 0.4, 0.75, 1.0))
+    result = run_inference(detector, frame, frame_count)
+
+사용법 (프로젝트 루트에서, 합성 영상 + 모델 대역으로 타일 구성별 지연/재현율 비교):
+    python -m src.detection.tiling
+    python -m src.detection.tiling --real-models --data data/testData
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.models.postprocess import nms
+from src.models.result_types import Boxes, Masks, Results
+
+# ==========================================
+# [설정]
+# ==========================================
+TILE_SIZE = 640          # 원본 기준 타일 한 변 (px)
+TILE_OVERLAP = 0.2       # 이웃 타일과 겹치는 비율 (타일 경계의 물체가 어느 한 타일에는 온전히 들어가도록)
+TILE_IMGSZ = 256         # 타일마다 모델 입력 크기
+MERGE_IOU = 0.5          # 타일 간 중복 박스 NMS IoU
+MERGE_IOS = 0.8          # 작은 박스가 이 비율 이상 큰 박스 안에 있으면 잘린 조각으로 보고 제거
+INCLUDE_FULL = True      # 전체 프레임 추론 결과도 함께 병합
+TILE_REGION = None       # 사용할 영역 (x1, y1, x2, y2, 0~1 비율). None 이면 프레임 전체
+
+
+def make_tiles(shape, tile_size=TILE_SIZE, overlap=TILE_OVERLAP, region=None):
+    """
+    (h, w) 프레임을 덮는 겹치는 타일 xyxy 목록 (N, 4) int. 모든 타일 크기가 같음.
+    region(0~1 비율 xyxy) 을 주면 그 영역만 덮도록 타일을 배치 (영역이 타일보다 작으면 영역 중심의 타일 1장).
+    """
+    h, w = shape[:2]
+    tile_w, tile_h = min(tile_size, w), min(tile_size, h)
+    rx1, ry1, rx2, ry2 = (np.asarray(region, dtype=np.float64) * [w, h, w, h]) if region is not None else (0, 0, w, h)
+
+    def starts(lo, hi, tile, length):
+        span = hi - lo
+        if tile >= span:
+            return [int(np.clip(round((lo + hi - tile) / 2), 0, length - tile))]
+        stride = max(1, int(tile * (1 - overlap)))
+        n = int(np.ceil((span - tile) / stride)) + 1
+        # 마지막 타일은 영역 끝에 맞춤
+        return np.linspace(lo, hi - tile, n).round().astype(int).tolist()
+
+    return np.array([[x, y, x + tile_w, y + tile_h]
+                     for y in starts(ry1, ry2, tile_h, h) for x in starts(rx1, rx2, tile_w, w)])
+
+
+def merge_detections(xyxy, conf, cls, iou=MERGE_IOU, ios=MERGE_IOS):
+    """
+    타일별 결과를 합친 박스들의 중복 제거. 남길 인덱스 (점수 내림차순) 반환.
+    1) 클래스별 NMS (겹침 영역의 같은 물체)
+    2) 같은 클래스의 더 큰 박스 안에 대부분 들어가는 박스 제거 (타일 경계에서 잘린 조각,
+       잘린 조각의 점수가 더 높을 수도 있으므로 점수가 아니라 크기로 판단)
+    """
+    keep = nms(xyxy, conf, iou, classes=cls)
+    if len(keep) < 2 or ios >= 1.0:
+        return keep
+
+    b = xyxy[keep]
+    x1 = np.maximum(b[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(b[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(b[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(b[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = np.maximum((b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1]), 1e-9)
+    # covered[i, j]: i 가 더 큰 같은 클래스 박스 j 안에 ios 이상 들어감
+    covered = (inter / area[:, None] >= ios) & (cls[keep][:, None] == cls[keep][None, :])
+    covered &= area[None, :] > area[:, None]
+    return keep[~covered.any(axis=1)]
+
+
+def _to_numpy(values):
+    return values.cpu().numpy() if hasattr(values, "cpu") else np.asarray(values)
+
+
+class TiledDetector:
+    """
+    model 을 감싸 predict(frame) 한 번에 타일 배치 추론 + 병합을 수행.
+    결과는 원본 프레임 좌표의 Results 하나 (task="segment" 면 마스크 폴리곤도 병합).
+    """
+
+    def __init__(self, model, tile_size=TILE_SIZE, overlap=TILE_OVERLAP, imgsz=TILE_IMGSZ,
+                 region=TILE_REGION, include_full=INCLUDE_FULL, iou=MERGE_IOU, ios=MERGE_IOS):
+        self.model = model
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.imgsz = imgsz
+        self.region = region
+        self.include_full = include_full
+        self.iou = iou
+        self.ios = ios
+        self._tiles = {}    # 프레임 shape -> 타일 좌표 (매 프레임 다시 계산하지 않음)
+
+    def __getattr__(self, name):
+        # names, class_ids, profile 등은 원래 모델 속성을 그대로 사용
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def tiles(self, shape):
+        key = tuple(shape[:2])
+        if key not in self._tiles:
+            self._tiles[key] = make_tiles(shape, self.tile_size, self.overlap, self.region)
+        return self._tiles[key]
+
+    def predict(self, source, conf=0.25, imgsz=None, verbose=False, task="detect", **kwargs):
+        """ imgsz 는 무시하고 타일마다 self.imgsz 사용 (전체 프레임은 호출 쪽 imgsz) """
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        return [self._predict_one(f, conf, imgsz or self.imgsz, task, kwargs) for f in frames]
+
+    __call__ = predict
+
+    def _predict_one(self, frame, conf, full_imgsz, task, kwargs):
+        tiles = self.tiles(frame.shape)
+        crops = [frame[y1:y2, x1:x2] for x1, y1, x2, y2 in tiles.tolist()]
+        results = self.model.predict(crops, imgsz=self.imgsz, conf=conf, verbose=False, task=task, **kwargs)
+        offsets = tiles[:, :2].tolist()
+        if self.include_full:
+            results = list(results) + list(self.model.predict(frame, imgsz=full_imgsz, conf=conf, verbose=False,
+                                                              task=task, **kwargs))
+            offsets.append([0, 0])
+
+        xyxy, scores, classes, polygons = [], [], [], []
+        for result, (ox, oy) in zip(results, offsets):
+            boxes = result.boxes
+            xyxy.append(_to_numpy(boxes.xyxy).reshape(-1, 4) + [ox, oy, ox, oy])
+            scores.append(_to_numpy(boxes.conf).reshape(-1))
+            classes.append(_to_numpy(boxes.cls).reshape(-1))
+            if result.masks is not None:
+                polygons.extend(np.asarray(p).reshape(-1, 2) + [ox, oy] for p in result.masks.xy)
+            elif task == "segment":
+                polygons.extend(np.zeros((0, 2)) for _ in range(len(boxes)))
+
+        xyxy = np.concatenate(xyxy).astype(np.float32)
+        scores = np.concatenate(scores).astype(np.float32)
+        classes = np.concatenate(classes).astype(np.int64)
+        keep = merge_detections(xyxy, scores, classes, self.iou, self.ios)
+
+        masks = Masks([polygons[i] for i in keep.tolist()], frame.shape) if polygons else None
+        names = results[0].names if results else getattr(self.model, "names", None)
+        return Results(frame, names, Boxes(xyxy[keep], scores[keep], classes[keep]), masks=masks)
+
+
+# ==========================================
+# 타일 구성별 비교 (합성 영상 + 모델 대역)
+# ==========================================
+def _far_pallet_frames(n, seed=0):
+    """ 큰 팔레트 1개 + 멀리 있는 작은 팔레트 여러 개 (정답 박스 포함) """
+    from src.benchmark.stubs import FRAME_SHAPE, draw_pallet
+
+    rng = np.random.default_rng(seed)
+    h, w = FRAME_SHAPE[:2]
+    base = np.full(FRAME_SHAPE, 110, dtype=np.uint8)
+    base += rng.integers(0, 20, FRAME_SHAPE, dtype=np.uint8)
+    for _ in range(n):
+        frame = base.copy()
+        truth = []
+        draw_pallet(frame, (w * 0.5, h * 0.8), (w * 0.35, h * 0.2), rng.normal(0, 2))
+        for _ in range(6):
+            size = (rng.uniform(40, 70), rng.uniform(25, 40))
+            center = (rng.uniform(80, w - 80), rng.uniform(80, h * 0.55))
+            draw_pallet(frame, center, size, rng.normal(0, 2), slats=2)
+            truth.append([center[0] - size[0] / 2, center[1] - size[1] / 2,
+                          center[0] + size[0] / 2, center[1] + size[1] / 2])
+        yield frame, np.array(truth)
+
+
+if __name__ == "__main__":
+    from src.benchmark.stubs import StubDetector
+    from src.common.recorded_frames import iter_frames
+    from src.detection.object_detection import run_inference
+    from src.tilt.tilt_tracker import box_iou
+
+    parser = argparse.ArgumentParser(description="Compare tiled inference configurations")
+    parser.add_argument("--real-models", action="store_true", help="YOLOE + 녹화 영상 (정답 없음, 검출 수만 비교)")
+    parser.add_argument("--data", default="data/testData")
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE)
+    parser.add_argument("--region", type=float, nargs=4, default=(0.0, 0.0, 1.0, 0.45),
+                        help="부분 타일 구성에 쓸 영역 (x1 y1 x2 y2, 0~1)")
+    args = parser.parse_args()
+
+    if args.real_models:
+        from src.models.yoloe_loader import load_yoloe_model
+        model = load_yoloe_model()
+        samples = [(f, None) for f in iter_frames(args.data, limit=args.frames)]
+    else:
+        model = StubDetector(max_boxes=20, min_area_ratio=0.002)
+        samples = list(_far_pallet_frames(args.frames))
+
+    configs = {
+        "full (imgsz 256)": model,
+        "tiles (all)": TiledDetector(model, tile_size=args.tile_size),
+        "tiles (region)": TiledDetector(model, tile_size=args.tile_size, region=args.region),
+    }
+    print(f"{'config':<20}{'tiles':>6}{'ms/frame':>10}{'detections':>12}{'small recall':>14}")
+    for name, detector in configs.items():
+        n_tiles = len(detector.tiles(samples[0][0].shape)) + detector.include_full if isinstance(detector, TiledDetector) else 1
+        run_inference(detector, samples[0][0], 0)   # 워밍업
+        elapsed, found, hit, total = 0.0, 0, 0, 0
+        for i, (frame, truth) in enumerate(samples):
+            t0 = time.perf_counter()
+            result = run_inference(detector, frame, i)
+            elapsed += time.perf_counter() - t0
+            boxes = result.boxes.xyxy.cpu().numpy()
+            found += len(boxes)
+            if truth is not None:
+                total += len(truth)
+                hit += int((box_iou(truth, boxes).max(axis=1) >= 0.3).sum()) if len(boxes) else 0
+        recall = f"{hit / total * 100:.0f}%" if total else "-"
+        print(f"{name:<20}{n_tiles:>6}{elapsed / len(samples) * 1000:>10.1f}{found / len(samples):>12.1f}{recall:>14}")
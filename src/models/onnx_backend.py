@@ -0,0 +1,174 @@
+import ast
+import os
+
+import cv2
+import numpy as np
+
+from src.models.postprocess import letterbox, xywh_to_xyxy, nms, unletterbox
+from src.models.result_types import Boxes, Keypoints, Masks, Results
+
+# ==========================================
+# [설정] ONNX Runtime (CPU)
+# ==========================================
+# 라즈베리파이 4코어 기준. 다른 스레드(카메라, 표시)와 나눠 쓰려면 줄여서 사용
+ONNX_THREADS = int(os.environ.get("CARGO_ONNX_THREADS", "4"))
+MAX_DET = 300
+MASK_THRESHOLD = 0.5   # seg 모델 마스크 확률 임계값
+
+
+def _parse_meta(value):
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return value
+
+
+class OnnxModel:
+    """
+    ultralytics 에서 export 한 ONNX 모델(YOLOE detect/seg, YOLO pose)을 ONNX Runtime CPU 로 실행.
+    predict() / __call__() 은 ultralytics 와 같은 형태(Results 리스트)를 반환하므로
+    run_inference, process_distance_estimation 등에서 그대로 사용 가능.
+
+    클래스 이름, 입력 크기, task, kpt_shape 는 export 시 ONNX 메타데이터에 저장된 값을 사용.
+    """
+
+    def __init__(self, path, task=None, names=None, threads=ONNX_THREADS):
+        import onnxruntime as ort
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        opts.inter_op_num_threads = 1
+        opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self.path = path
+
+        meta = {k: _parse_meta(v) for k, v in self.session.get_modelmeta().custom_metadata_map.items()}
+        inp = self.session.get_inputs()[0]
+        self.input_name = inp.name
+        self.output_names = [o.name for o in self.session.get_outputs()]
+
+        # 입력 크기: 고정 shape 이면 그대로, 아니면 메타데이터의 imgsz
+        _, _, h, w = inp.shape
+        if isinstance(h, int) and isinstance(w, int):
+            self.imgsz = (h, w)
+        else:
+            imgsz = meta.get("imgsz", 640)
+            self.imgsz = tuple(imgsz) if isinstance(imgsz, (list, tuple)) else (imgsz, imgsz)
+        self.dynamic_batch = not isinstance(inp.shape[0], int)
+
+        self.task = task or meta.get("task", "detect")
+        meta_names = meta.get("names", {})
+        if names is not None:
+            self.names = list(names)
+        elif isinstance(meta_names, dict):
+            self.names = [meta_names[k] for k in sorted(meta_names)]
+        else:
+            self.names = list(meta_names)
+        self.kpt_shape = tuple(meta.get("kpt_shape", (17, 3)))
+        self.has_masks = self.task == "segment" and len(self.output_names) > 1
+        self._warned_no_masks = False
+
+    # ------------------------------------------
+    # ultralytics 호환 인터페이스
+    # ------------------------------------------
+    def predict(self, source, conf=0.25, iou=0.45, imgsz=None, verbose=False, max_det=MAX_DET, **kwargs):
+        """
+        source: BGR ndarray 또는 그 리스트. imgsz 는 ONNX 입력이 고정이므로 무시.
+        seg 모델에 task="segment" 를 주면 마스크 폴리곤(Results.masks)도 계산하고,
+        그 외에는 마스크 계수를 무시함 (나머지 ultralytics 인자는 호환을 위해 받기만 함)
+        """
+        images = source if isinstance(source, (list, tuple)) else [source]
+        prepared = [self._preprocess(img) for img in images]
+        want_masks = kwargs.get("task") == "segment" and self.has_masks
+        if kwargs.get("task") == "segment" and not self.has_masks and not self._warned_no_masks:
+            self._warned_no_masks = True
+            print(f"[ONNX] 마스크 출력이 없는 모델입니다 (task={self.task}, outputs={len(self.output_names)}): "
+                  f"박스만 반환 ({self.path})")
+        output_names = self.output_names[:2] if want_masks else self.output_names[:1]
+
+        if self.dynamic_batch and len(prepared) > 1:
+            batch = np.concatenate([p[0] for p in prepared], axis=0)
+            runs = [self.session.run(output_names, {self.input_name: batch})]
+        else:
+            runs = [self.session.run(output_names, {self.input_name: p[0]}) for p in prepared]
+        outputs = np.concatenate([r[0] for r in runs], axis=0)
+        protos = np.concatenate([r[1] for r in runs], axis=0) if want_masks else None
+
+        return [
+            self._postprocess(outputs[i], img, scale, pad, conf, iou, max_det,
+                              protos=protos[i] if protos is not None else None)
+            for i, (img, (_, scale, pad)) in enumerate(zip(images, prepared))
+        ]
+
+    __call__ = predict
+
+    # ------------------------------------------
+    # 전처리 / 후처리
+    # ------------------------------------------
+    def _preprocess(self, image):
+        padded, scale, pad = letterbox(image, self.imgsz)
+        blob = cv2.cvtColor(padded, cv2.COLOR_BGR2RGB).transpose(2, 0, 1)[None]
+        return np.ascontiguousarray(blob, dtype=np.float32) / 255.0, scale, pad
+
+    def _postprocess(self, pred, image, scale, pad, conf, iou, max_det, protos=None):
+        # (4 + nc [+ nm] 또는 4 + 1 + K*D, anchors) -> (anchors, C)
+        pred = pred.T
+        xyxy = xywh_to_xyxy(pred[:, :4])
+
+        if self.task == "pose":
+            scores = pred[:, 4]
+            classes = np.zeros(len(pred), dtype=np.int64)
+            k, d = self.kpt_shape
+            kpts = pred[:, 5:5 + k * d].reshape(-1, k, d)
+        else:
+            nc = len(self.names) if self.names else pred.shape[1] - 4
+            cls_scores = pred[:, 4:4 + nc]   # seg 모델의 마스크 계수(nm)는 protos 가 있을 때만 사용
+            classes = cls_scores.argmax(axis=1)
+            scores = cls_scores[np.arange(len(pred)), classes]
+            kpts = None
+
+        mask = scores >= conf
+        xyxy, scores, classes = xyxy[mask], scores[mask], classes[mask]
+        keep = nms(xyxy, scores, iou, classes=classes if self.task != "pose" else None)[:max_det]
+        masks = None
+        if protos is not None:
+            coeffs = pred[mask][keep, 4 + nc:]
+            masks = Masks(self._mask_polygons(coeffs, protos, xyxy[keep], scale, pad, image.shape), image.shape)
+        xyxy = unletterbox(xyxy[keep], scale, pad, image.shape)
+
+        keypoints = None
+        if kpts is not None:
+            kpts = kpts[mask][keep]
+            if len(kpts):
+                xy = unletterbox(kpts[..., :2].reshape(len(kpts), -1), scale, pad, image.shape)
+                kpts[..., :2] = xy.reshape(len(kpts), -1, 2)
+            keypoints = Keypoints(kpts)
+
+        return Results(image, self.names, Boxes(xyxy, scores[keep], classes[keep]), keypoints=keypoints, masks=masks)
+
+    def _mask_polygons(self, coeffs, protos, boxes, scale, pad, orig_shape):
+        """
+        마스크 계수 (K, nm) x protos (nm, mh, mw) -> 객체별 가장 큰 외곽선 폴리곤 (원본 좌표).
+        proto 해상도에서 박스 밖을 지우고 윤곽선만 원본 좌표로 옮김 (원본 크기 마스크는 만들지 않음)
+        """
+        nm, mh, mw = protos.shape
+        if len(coeffs) == 0:
+            return []
+        logits = (coeffs @ protos.reshape(nm, -1)).reshape(-1, mh, mw)
+        binary = (logits > np.log(MASK_THRESHOLD / (1 - MASK_THRESHOLD))).astype(np.uint8)   # sigmoid > 임계값
+        gain = np.array([mw / self.imgsz[1], mh / self.imgsz[0]], dtype=np.float32)
+
+        polygons = []
+        for m, box in zip(binary, boxes):
+            x1, y1 = np.floor(box[:2] * gain).astype(int).clip(0)
+            x2, y2 = np.ceil(box[2:] * gain).astype(int)
+            roi = m[y1:y2, x1:x2]
+            contours, _ = cv2.findContours(roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            if not contours:
+                polygons.append(np.zeros((0, 2), dtype=np.float32))
+                continue
+            pts = max(contours, key=cv2.contourArea).reshape(-1, 2).astype(np.float32) + (x1, y1)
+            pts = (pts + 0.5) / gain   # proto 픽셀 중심 -> letterbox 좌표
+            polygons.append(unletterbox(pts.reshape(1, -1), scale, pad, orig_shape).reshape(-1, 2))
+        return polygons
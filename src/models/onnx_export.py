@@ -0,0 +1,58 @@
+"""
+PyTorch(ultralytics) 모델을 ONNX 로 변환하는 스크립트.
+
+YOLOE 는 클래스 프로필(기본 yoloe_loader.names 전체)의 텍스트 임베딩을 set_classes 로 넣은 뒤
+export 하므로, 생성된 ONNX 에는 클래스 헤드가 고정되어 들어감 (실행 시 CLIP 불필요).
+
+사용법 (프로젝트 루트에서):
+    python -m src.models.onnx_export --model all
+    python -m src.models.onnx_export --model yoloe --yoloe-imgsz 256
+    python -m src.models.onnx_export --model yoloe --profile boxes_pallets
+"""
+import argparse
+import os
+import shutil
+
+from src.models import yoloe_loader, pose_loader
+
+# run_inference / process_distance_estimation 에서 사용하는 입력 크기와 맞춤
+YOLOE_IMGSZ = 256
+POSE_IMGSZ = 640
+OPSET = 12
+
+
+def _export(model, out_path, imgsz):
+    exported = model.export(format="onnx", imgsz=imgsz, opset=OPSET, simplify=True, dynamic=False)
+    if os.path.abspath(exported) != os.path.abspath(out_path):
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+        shutil.move(exported, out_path)
+    print(f"Exported: {out_path}")
+    return out_path
+
+
+def export_yoloe(out_path=None, imgsz=YOLOE_IMGSZ, profile=None):
+    """ profile 의 클래스만 헤드에 넣어 export (프로필마다 별도 ONNX 파일) """
+    out_path = out_path or yoloe_loader.onnx_model_path(profile)
+    model = yoloe_loader.load_yoloe_model(backend="torch", profile=profile)
+    return _export(model, out_path, imgsz)
+
+
+def export_pose(out_path=pose_loader.ONNX_MODEL_PATH, imgsz=POSE_IMGSZ):
+    model = pose_loader.load_pose_model(backend="torch")
+    if model is None:
+        raise RuntimeError("Pose 모델을 불러오지 못했습니다.")
+    return _export(model, out_path, imgsz)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export YOLOE / pose models to ONNX")
+    parser.add_argument("--model", choices=["yoloe", "pose", "all"], default="all")
+    parser.add_argument("--yoloe-imgsz", type=int, default=YOLOE_IMGSZ)
+    parser.add_argument("--pose-imgsz", type=int, default=POSE_IMGSZ)
+    parser.add_argument("--profile", default=None, help="YOLOE 클래스 프로필 (class_profiles.json, 기본 CARGO_CLASS_PROFILE)")
+    args = parser.parse_args()
+
+    if args.model in ("yoloe", "all"):
+        export_yoloe(imgsz=args.yoloe_imgsz, profile=args.profile)
+    if args.model in ("pose", "all"):
+        export_pose(imgsz=args.pose_imgsz)
@@ -1,17 +1,31 @@
-from ultralytics import YOLO
+import os
 
 # 모델 파일 경로 (프로젝트 루트 기준 혹은 절대 경로)
 MODEL_PATH = "figure_pose.pt"
+# onnx_export.py 로 만든 CPU 추론용 모델
+ONNX_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".onnx"
+# quantize.py 로 만든 INT8 정적 양자화 모델
+ONNX_INT8_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".int8.onnx"
 
-def load_pose_model():
+# 추론 백엔드: "torch" (ultralytics), "onnx" (ONNX Runtime CPU) 또는 "onnx-int8"
+BACKEND = os.environ.get("CARGO_BACKEND", "torch")
+
+def load_pose_model(backend=None):
     """
     거리 추정용 YOLO Pose 모델을 로드합니다.
     """
-    print(f"Loading Pose Model: {MODEL_PATH}")
+    backend = backend or BACKEND
+    path = {"onnx": ONNX_MODEL_PATH, "onnx-int8": ONNX_INT8_MODEL_PATH}.get(backend, MODEL_PATH)
+    print(f"Loading Pose Model: {path}")
     try:
-        model = YOLO(MODEL_PATH)
+        if backend in ("onnx", "onnx-int8"):
+            from src.models.onnx_backend import OnnxModel
+            model = OnnxModel(path, task="pose")
+        else:
+            from ultralytics import YOLO
+            model = YOLO(path)
         print("Pose model loaded successfully.")
         return model
     except Exception as e:
         print(f"Error loading Pose model: {e}")
-        return None
\ No newline at end of file
+        return None
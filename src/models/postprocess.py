@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+
+
+def letterbox(image, size, color=(114, 114, 114)):
+    """
+    비율을 유지하며 size(정사각형 또는 (h, w))에 맞추고 남는 곳은 패딩.
+    반환: (패딩된 이미지, scale, (pad_x, pad_y))
+    """
+    out_h, out_w = (size, size) if isinstance(size, int) else size
+    h, w = image.shape[:2]
+    scale = min(out_h / h, out_w / w)
+    new_w, new_h = int(round(w * scale)), int(round(h * scale))
+    pad_x, pad_y = (out_w - new_w) // 2, (out_h - new_h) // 2
+
+    resized = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR) if (new_w, new_h) != (w, h) else image
+    canvas = np.full((out_h, out_w, 3), color, dtype=np.uint8)
+    canvas[pad_y:pad_y + new_h, pad_x:pad_x + new_w] = resized
+    return canvas, scale, (pad_x, pad_y)
+
+
+def xywh_to_xyxy(xywh):
+    xyxy = np.empty_like(xywh)
+    half_w, half_h = xywh[:, 2] / 2, xywh[:, 3] / 2
+    xyxy[:, 0] = xywh[:, 0] - half_w
+    xyxy[:, 1] = xywh[:, 1] - half_h
+    xyxy[:, 2] = xywh[:, 0] + half_w
+    xyxy[:, 3] = xywh[:, 1] + half_h
+    return xyxy
+
+
+def nms(boxes, scores, iou_threshold=0.45, classes=None):
+    """
+    xyxy 박스 NMS. classes 를 주면 클래스별로 따로 억제.
+    남은 박스 인덱스를 점수 내림차순으로 반환.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if classes is not None:
+        # 클래스마다 좌표를 멀리 떨어뜨려 한 번에 처리
+        offset = np.asarray(classes, dtype=np.float32).reshape(-1, 1) * (boxes.max() + 1.0)
+        boxes = boxes + offset
+
+    x1, y1, x2, y2 = boxes.T
+    areas = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    order = np.argsort(-scores, kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        xx1 = np.maximum(x1[i], x1[rest])
+        yy1 = np.maximum(y1[i], y1[rest])
+        xx2 = np.minimum(x2[i], x2[rest])
+        yy2 = np.minimum(y2[i], y2[rest])
+        inter = np.clip(xx2 - xx1, 0, None) * np.clip(yy2 - yy1, 0, None)
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def unletterbox(coords, scale, pad, orig_shape):
+    """ letterbox 좌표 (x, y 쌍이 반복되는 배열) 를 원본 이미지 좌표로 되돌림 """
+    coords = coords.astype(np.float32, copy=True)
+    coords[..., 0::2] = (coords[..., 0::2] - pad[0]) / scale
+    coords[..., 1::2] = (coords[..., 1::2] - pad[1]) / scale
+    h, w = orig_shape[:2]
+    coords[..., 0::2] = np.clip(coords[..., 0::2], 0, w)
+    coords[..., 1::2] = np.clip(coords[..., 1::2], 0, h)
+    return coords
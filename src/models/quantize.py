@@ -0,0 +1,231 @@
+"""
+ONNX 모델 INT8 정적 양자화 + FP32 대비 정확도 검증 스크립트.
+
+창고에서 녹화한 프레임(data/testData 또는 녹화 세션)으로 activation 범위를 보정(calibration)하고,
+같은 프레임에서 FP32 / INT8 결과를 비교해 기준을 넘으면 실패(exit 1)로 처리.
+  - YOLOE: 박스 매칭률, 평균 IoU, 매칭된 박스의 기울기 판정 일치율
+  - Pose : 거리 오차, DANGER 판정 불일치 프레임 수 (기본 0 개 허용)
+
+사용법 (프로젝트 루트에서, onnx_export.py 로 FP32 ONNX 를 먼저 생성):
+    python -m src.models.quantize --model all --data data/testData
+    python -m src.models.quantize --model pose --data session.npz --check-only
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from src.common.recorded_frames import iter_frames
+from src.models import yoloe_loader, pose_loader
+from src.models.onnx_backend import OnnxModel
+from src.tilt.tilt_tracker import box_iou
+from src.tilt.tilt_detection import analyze_tilt_hough
+from src.person_detection.distance_estimation import load_calibration_data, process_distance_estimation
+from src.detection.object_detection import CONF_THRESHOLD
+
+# ==========================================
+# [설정] 보정 데이터 / 합격 기준
+# ==========================================
+DEFAULT_DATA = "data/testData"
+CALIBRATION_FRAMES = 200      # 보정에 사용할 최대 프레임 수
+CHECK_FRAMES = 200            # 정확도 검증에 사용할 최대 프레임 수
+FRAME_STEP = 5                # 영상/세션에서 N 프레임마다 1장 사용 (비슷한 장면 중복 방지)
+
+MATCH_IOU = 0.5
+MIN_BOX_RECALL = 0.90         # FP32 박스 중 INT8 에서 찾은 비율
+MIN_MEAN_IOU = 0.80
+MAX_TILT_DISAGREE = 0.05      # 매칭된 박스 중 기울기 판정이 달라진 비율
+MAX_DISTANCE_ERROR_M = 0.30   # 매칭된 사람의 평균 거리 오차
+MAX_DANGER_MISMATCH = 0       # DANGER 여부가 달라진 프레임 수
+
+# ==========================================
+# [1] 보정/검증용 프레임 읽기
+# ==========================================
+def load_frames(source, limit):
+    frames = list(iter_frames(source, limit, step=FRAME_STEP))
+    if not frames:
+        raise SystemExit(f"[Quantize] '{source}' 에서 프레임을 찾지 못했습니다 (이미지 폴더 / 영상 / .npy·.npz 세션 필요).")
+    print(f"[Quantize] {len(frames)} frames loaded from {source}")
+    return frames
+
+
+# ==========================================
+# [2] INT8 정적 양자화
+# ==========================================
+def quantize_model(fp32_path, int8_path, frames, exclude=()):
+    from onnxruntime.quantization import (
+        CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static,
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    fp32 = OnnxModel(fp32_path)
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._iter = iter(frames)
+
+        def get_next(self):
+            frame = next(self._iter, None)
+            if frame is None:
+                return None
+            blob, _, _ = fp32._preprocess(frame)
+            return {fp32.input_name: blob}
+
+    # 제외할 노드 (예: 검출 헤드 마지막 부분은 FP32 로 유지)
+    import onnx
+    graph = onnx.load(fp32_path).graph
+    nodes_to_exclude = [n.name for n in graph.node if any(p in n.name for p in exclude)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        prepped = os.path.join(tmp, "prepped.onnx")
+        # export 모델은 입력 shape 가 고정이라 symbolic shape 추론(sympy)은 생략
+        quant_pre_process(fp32_path, prepped, skip_symbolic_shape=True)
+        quantize_static(
+            prepped, int8_path, FrameReader(),
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            weight_type=QuantType.QInt8,
+            activation_type=QuantType.QUInt8,
+            calibrate_method=CalibrationMethod.MinMax,
+            nodes_to_exclude=nodes_to_exclude,
+        )
+    print(f"[Quantize] INT8 model saved: {int8_path} (excluded {len(nodes_to_exclude)} nodes)")
+    return int8_path
+
+
+# ==========================================
+# [3] FP32 대비 정확도 검증
+# ==========================================
+def _match(boxes_a, boxes_b, cls_a=None, cls_b=None):
+    """ IoU 가 큰 순서대로 1:1 매칭, [(i, j, iou)] 반환 """
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return []
+    iou = box_iou(boxes_a, boxes_b)
+    if cls_a is not None:
+        iou = np.where(np.asarray(cls_a)[:, None] == np.asarray(cls_b)[None, :], iou, 0.0)
+    pairs, used_a, used_b = [], set(), set()
+    for flat in np.argsort(-iou, axis=None):
+        i, j = np.unravel_index(flat, iou.shape)
+        if iou[i, j] < MATCH_IOU:
+            break
+        if i in used_a or j in used_b:
+            continue
+        pairs.append((int(i), int(j), float(iou[i, j])))
+        used_a.add(i)
+        used_b.add(j)
+    return pairs
+
+
+def check_detection(fp32, int8, frames, conf=CONF_THRESHOLD):
+    total = matched = tilt_total = tilt_diff = 0
+    ious = []
+    for frame in frames:
+        ra = fp32.predict(frame, conf=conf)[0]
+        rb = int8.predict(frame, conf=conf)[0]
+        boxes_a = ra.boxes.xyxy.cpu().numpy()
+        boxes_b = rb.boxes.xyxy.cpu().numpy()
+        pairs = _match(boxes_a, boxes_b, ra.boxes.cls.cpu().numpy(), rb.boxes.cls.cpu().numpy())
+
+        total += len(boxes_a)
+        matched += len(pairs)
+        for i, j, iou in pairs:
+            ious.append(iou)
+            xa1, ya1, xa2, ya2 = boxes_a[i].astype(int)
+            xb1, yb1, xb2, yb2 = boxes_b[j].astype(int)
+            crop_a, crop_b = frame[ya1:ya2, xa1:xa2], frame[yb1:yb2, xb1:xb2]
+            if crop_a.size == 0 or crop_b.size == 0:
+                continue
+            tilt_total += 1
+            tilt_diff += analyze_tilt_hough(crop_a)[0] != analyze_tilt_hough(crop_b)[0]
+
+    report = {
+        "boxes_fp32": total,
+        "box_recall": matched / total if total else 1.0,
+        "mean_iou": float(np.mean(ious)) if ious else 1.0,
+        "tilt_disagree": tilt_diff / tilt_total if tilt_total else 0.0,
+    }
+    report["passed"] = (report["box_recall"] >= MIN_BOX_RECALL and report["mean_iou"] >= MIN_MEAN_IOU
+                        and report["tilt_disagree"] <= MAX_TILT_DISAGREE)
+    return report
+
+
+def check_pose(fp32, int8, frames):
+    H = load_calibration_data()
+    errors = []
+    danger_mismatch = persons = matched = 0
+    for frame in frames:
+        _, objs_a = process_distance_estimation(fp32, frame, H, draw=False)
+        _, objs_b = process_distance_estimation(int8, frame, H, draw=False)
+
+        # 프레임 단위 DANGER 판정 비교 (안전 경보에 직접 영향)
+        danger_a = any(status == "DANGER" for _, _, status in objs_a)
+        danger_b = any(status == "DANGER" for _, _, status in objs_b)
+        danger_mismatch += danger_a != danger_b
+
+        # 사람별 거리 비교: (x, 거리) 가 가장 가까운 것끼리 매칭
+        persons += len(objs_a)
+        used = set()
+        for xa, da, _ in objs_a:
+            candidates = [(abs(xa - xb) + abs(da - db), k, db) for k, (xb, db, _) in enumerate(objs_b) if k not in used]
+            if not candidates:
+                continue
+            _, k, db = min(candidates)
+            used.add(k)
+            matched += 1
+            errors.append(abs(da - db))
+
+    report = {
+        "persons_fp32": persons,
+        "person_recall": matched / persons if persons else 1.0,
+        "mean_distance_error_m": float(np.mean(errors)) if errors else 0.0,
+        "max_distance_error_m": float(np.max(errors)) if errors else 0.0,
+        "danger_mismatch_frames": int(danger_mismatch),
+    }
+    report["passed"] = (report["danger_mismatch_frames"] <= MAX_DANGER_MISMATCH
+                        and report["mean_distance_error_m"] <= MAX_DISTANCE_ERROR_M
+                        and report["person_recall"] >= MIN_BOX_RECALL)
+    return report
+
+
+# ==========================================
+# 메인 진입점
+# ==========================================
+def _target(target, profile=None):
+    if target == "yoloe":
+        profile_names, _ = yoloe_loader.load_class_profile(profile)
+        return (yoloe_loader.onnx_model_path(profile), yoloe_loader.onnx_model_path(profile, int8=True),
+                "detect", profile_names)
+    return pose_loader.ONNX_MODEL_PATH, pose_loader.ONNX_INT8_MODEL_PATH, "pose", None
+
+
+def run(target, data, check_only=False, exclude=(), profile=None):
+    fp32_path, int8_path, task, names = _target(target, profile)
+    if not check_only:
+        quantize_model(fp32_path, int8_path, load_frames(data, CALIBRATION_FRAMES), exclude)
+
+    frames = load_frames(data, CHECK_FRAMES)
+    fp32 = OnnxModel(fp32_path, task=task, names=names)
+    int8 = OnnxModel(int8_path, task=task, names=names)
+    report = check_detection(fp32, int8, frames) if task == "detect" else check_pose(fp32, int8, frames)
+    report["model"] = target
+    print(json.dumps(report, indent=2))
+    if not report["passed"]:
+        print(f"[Quantize] {target}: INT8 정확도 기준 미달 - 배포하지 마세요.")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="INT8 post-training quantization with FP32 accuracy check")
+    parser.add_argument("--model", choices=["yoloe", "pose", "all"], default="all")
+    parser.add_argument("--data", default=DEFAULT_DATA, help="이미지 폴더 / 영상 / .npy·.npz 녹화 세션")
+    parser.add_argument("--check-only", action="store_true", help="양자화 없이 기존 INT8 모델만 검증")
+    parser.add_argument("--exclude", nargs="*", default=[], help="FP32 로 남길 노드 이름 패턴 (예: /model.22/)")
+    parser.add_argument("--profile", default=None, help="YOLOE 클래스 프로필 (class_profiles.json)")
+    args = parser.parse_args()
+
+    targets = ["yoloe", "pose"] if args.model == "all" else [args.model]
+    reports = [run(t, args.data, args.check_only, args.exclude, args.profile) for t in targets]
+    sys.exit(0 if all(r["passed"] for r in reports) else 1)
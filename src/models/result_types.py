@@ -0,0 +1,135 @@
+import cv2
+import numpy as np
+
+
+class HostArray(np.ndarray):
+    """
+    torch.Tensor 처럼 .cpu() / .numpy() / .numel() 을 호출할 수 있는 ndarray.
+    ultralytics 결과를 쓰던 코드(main.py, distance_estimation 등)를 그대로 쓰기 위함.
+    """
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.view(np.ndarray)
+
+    def numel(self):
+        return self.size
+
+
+def host_array(values, dtype=np.float32):
+    return np.asarray(values, dtype=dtype).view(HostArray)
+
+
+class Boxes:
+    """ ultralytics Boxes 호환 (xyxy, conf, cls) """
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = host_array(np.asarray(xyxy).reshape(-1, 4))
+        self.conf = host_array(np.asarray(conf).reshape(-1))
+        self.cls = host_array(np.asarray(cls).reshape(-1))
+
+    @property
+    def data(self):
+        return host_array(np.column_stack([self.xyxy, self.conf, self.cls]))
+
+    @property
+    def xywh(self):
+        xy = self.xyxy
+        return host_array(np.column_stack([(xy[:, 0] + xy[:, 2]) / 2, (xy[:, 1] + xy[:, 3]) / 2,
+                                           xy[:, 2] - xy[:, 0], xy[:, 3] - xy[:, 1]]))
+
+    def __len__(self):
+        return len(self.conf)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            idx = slice(idx, idx + 1)
+        return Boxes(self.xyxy[idx], self.conf[idx], self.cls[idx])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+class Keypoints:
+    """ ultralytics Keypoints 호환 (data: (N, K, 3) = x, y, conf) """
+
+    def __init__(self, data):
+        self.data = host_array(data)
+
+    @property
+    def xy(self):
+        return host_array(self.data[..., :2])
+
+    @property
+    def conf(self):
+        return host_array(self.data[..., 2])
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            idx = slice(idx, idx + 1)
+        return Keypoints(self.data[idx])
+
+
+class Masks:
+    """
+    ultralytics Masks 호환 (xy: 원본 좌표 폴리곤 리스트, data: (N, h, w) 마스크).
+    폴리곤만 보관하고 data 는 필요할 때 원본 해상도로 채워서 만듦.
+    """
+
+    def __init__(self, polygons, orig_shape):
+        self.xy = [np.asarray(p, dtype=np.float32).reshape(-1, 2) for p in polygons]
+        self.orig_shape = tuple(orig_shape[:2])
+
+    @property
+    def data(self):
+        h, w = self.orig_shape
+        data = np.zeros((len(self.xy), h, w), dtype=np.uint8)
+        for mask, poly in zip(data, self.xy):
+            if len(poly) >= 3:
+                cv2.fillPoly(mask, [poly.round().astype(np.int32)], 1)
+        return host_array(data, dtype=np.uint8)
+
+    def __len__(self):
+        return len(self.xy)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, (int, np.integer)):
+            idx = slice(idx, idx + 1)
+        return Masks(self.xy[idx], self.orig_shape)
+
+
+class Results:
+    """ ultralytics Results 중 이 프로젝트가 사용하는 부분만 구현한 결과 객체 """
+
+    def __init__(self, orig_img, names, boxes, keypoints=None, masks=None):
+        self.orig_img = orig_img
+        self.orig_shape = orig_img.shape[:2]
+        self.names = names
+        self.boxes = boxes
+        self.keypoints = keypoints
+        self.masks = masks
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def plot(self):
+        """ 박스 + 클래스 이름을 그린 BGR 이미지 반환 """
+        img = self.orig_img.copy()
+        for (x1, y1, x2, y2), c, s in zip(self.boxes.xyxy.astype(int).tolist(),
+                                           self.boxes.cls.astype(int).tolist(),
+                                           self.boxes.conf.tolist()):
+            name = self.names[c] if self.names and c < len(self.names) else str(c)
+            cv2.rectangle(img, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.putText(img, f"{name} {s:.2f}", (x1, max(10, y1 - 5)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+        if self.keypoints is not None:
+            for x, y, kc in self.keypoints.data.reshape(-1, 3).tolist():
+                if kc > 0.5:
+                    cv2.circle(img, (int(x), int(y)), 3, (0, 255, 255), -1)
+        return img
@@ -1,8 +1,23 @@
+import json
 import os
-from ultralytics import YOLOE
+
+import numpy as np
 
 # YOLOE 모델 경로
 MODEL_PATH = "/home/devjang/Cap/CargoSafety_CapstoneDesign/yoloe-v8s-seg.pt"
+# onnx_export.py 로 만든 CPU 추론용 모델
+ONNX_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".onnx"
+# quantize.py 로 만든 INT8 정적 양자화 모델
+ONNX_INT8_MODEL_PATH = os.path.splitext(MODEL_PATH)[0] + ".int8.onnx"
+
+# 추론 백엔드: "torch" (ultralytics), "onnx" (ONNX Runtime CPU) 또는 "onnx-int8"
+BACKEND = os.environ.get("CARGO_BACKEND", "torch")
+
+# 클래스 프롬프트 프로필 (현장에서 다루는 화물만 남겨 헤드 연산/오검출을 줄임)
+CLASS_PROFILES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "class_profiles.json")
+CLASS_PROFILE = os.environ.get("CARGO_CLASS_PROFILE", "all")
+# 프로필별 텍스트 임베딩 캐시 (CLIP 텍스트 인코더를 매번 돌리지 않도록)
+PE_CACHE_DIR = os.path.join(os.path.dirname(MODEL_PATH), "pe_cache")
 
 names = [
     "cardboard_box_front", "cardboard_box_diagonal", "cardboard_box_tilted",
@@ -17,12 +32,86 @@ names = [
     "other_cargo"
 ]
 
+
+def load_class_profile(profile=None):
+    """
+    프로필 이름 -> (프로필 클래스 이름 리스트, 원래 names 기준 클래스 ID 배열).
+    모델 출력 인덱스 i 는 class_ids[i] 로 바꾸면 기존 클래스 ID 가 됨.
+    """
+    profile = profile or CLASS_PROFILE
+    if profile == "all":
+        return list(names), np.arange(len(names))
+
+    with open(CLASS_PROFILES_PATH, encoding="utf-8") as f:
+        profiles = json.load(f)
+    if profile not in profiles or profile.startswith("_"):
+        available = ["all"] + [k for k in profiles if not k.startswith("_")]
+        raise ValueError(f"알 수 없는 클래스 프로필 '{profile}' (사용 가능: {', '.join(available)})")
+
+    profile_names = profiles[profile]
+    unknown = [n for n in profile_names if n not in names]
+    if unknown:
+        raise ValueError(f"클래스 프로필 '{profile}' 에 없는 클래스: {unknown}")
+    return list(profile_names), np.array([names.index(n) for n in profile_names])
+
+
+def onnx_model_path(profile=None, int8=False):
+    """ 프로필별 ONNX 경로 (ONNX 는 클래스 헤드가 고정되므로 프로필마다 따로 export) """
+    profile = profile or CLASS_PROFILE
+    stem = os.path.splitext(MODEL_PATH)[0]
+    if profile != "all":
+        stem += f".{profile}"
+    return stem + (".int8.onnx" if int8 else ".onnx")
+
+
+def to_canonical(model, cls):
+    """ 모델 출력 클래스 인덱스(배열 또는 int) -> names 기준 클래스 ID """
+    class_ids = getattr(model, "class_ids", None)
+    if class_ids is None:
+        return cls
+    return class_ids[np.asarray(cls, dtype=int)] if not isinstance(cls, int) else int(class_ids[cls])
+
+
+def _text_pe(model, profile, profile_names):
+    """ 프로필 텍스트 임베딩을 캐시에서 읽거나, 없으면 계산 후 저장 """
+    import torch
+
+    path = os.path.join(PE_CACHE_DIR, f"{os.path.splitext(os.path.basename(MODEL_PATH))[0]}.{profile}.pt")
+    if os.path.exists(path):
+        cached = torch.load(path, map_location="cpu")
+        if cached.get("names") == profile_names:
+            return cached["pe"]
+        print(f"[YOLOE] 프로필 '{profile}' 클래스가 바뀌어 임베딩을 다시 계산합니다.")
+
+    pe = model.get_text_pe(profile_names)
+    try:
+        os.makedirs(PE_CACHE_DIR, exist_ok=True)
+        torch.save({"names": profile_names, "pe": pe.cpu()}, path)
+    except OSError as e:
+        print(f"[YOLOE] 임베딩 캐시 저장 실패: {e}")
+    return pe
+
+
 # 모델 로드 함수
-def load_yoloe_model():
-    print(f"Loading YOLOE Model: {MODEL_PATH}")
+def load_yoloe_model(backend=None, profile=None):
+    backend = backend or BACKEND
+    profile = profile or CLASS_PROFILE
+    profile_names, class_ids = load_class_profile(profile)
+
+    if backend in ("onnx", "onnx-int8"):
+        from src.models.onnx_backend import OnnxModel
+        path = onnx_model_path(profile, int8=backend == "onnx-int8")
+        print(f"Loading YOLOE Model ({backend.upper()}, profile={profile}): {path}")
+        # task 는 ONNX 메타데이터를 따름 (seg export 면 "segment" -> --mask-tilt 용 마스크 디코딩 가능)
+        model = OnnxModel(path, names=profile_names)
+    else:
+        from ultralytics import YOLOE
+        print(f"Loading YOLOE Model (profile={profile}): {MODEL_PATH}")
 
-    model = YOLOE(MODEL_PATH)
-    model.set_classes(names, model.get_text_pe(names))
+        model = YOLOE(MODEL_PATH)
+        model.set_classes(profile_names, _text_pe(model, profile, profile_names))
 
-    print("YOLOE model loaded.")
-    return model
\ No newline at end of file
+    model.profile = profile
+    model.class_ids = class_ids
+    print(f"YOLOE model loaded. ({len(profile_names)}/{len(names)} classes)")
+    return model
@@ -1,6 +1,9 @@
 import cv2
 import numpy as np
 import os
+import time
+
+from src.common.metrics import DISTANCE_SECONDS, PERSONS, DANGER_FRAMES
 
 # ==========================================
 # [설정] 새로 구한 파라미터 적용
@@ -141,7 +144,14 @@ def get_status_info(dist):
     else:
         return "Safe", (0, 255, 0)      # Green
 
-def process_distance_estimation(model, frame, H):
+def process_distance_estimation(model, frame, H, draw=True, overlay=None):
+    """
+    사람 검출 + 거리 추정.
+    draw=False 이면 (헤드리스 모드 등) 박스/텍스트 그리기를 생략하고 계산만 수행.
+    overlay(src.common.overlay.Overlay)를 주면 프레임에 바로 그리지 않고 주석만 모음
+    (좌표는 640x480 기준).
+    """
+    start = time.perf_counter()
     # [중요] 640x480 리사이즈 유지
     frame = cv2.resize(frame, (640, 480))
     h, w = frame.shape[:2]
@@ -164,16 +174,34 @@ def process_distance_estimation(model, frame, H):
                     status, color = get_status_info(dist)
                     
                     detected_objects.append((real_x, dist, status))
+
+                    label = f"{status} {dist:.1f}m ({method})"
+                    foot_visible = 0 <= foot_pt[0] < w and 0 <= foot_pt[1] < h
+
+                    if overlay is not None:
+                        overlay.box(x1, y1, x2, y2, color)
+                        overlay.label(label, x1, y1 - 10, color, scale=0.6)
+                        if foot_visible:
+                            overlay.point(foot_pt[0], foot_pt[1], (0, 255, 255))
+                        continue
+
+                    if not draw:
+                        continue
                     
                     # 박스 그리기
                     cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
                     
                     # 텍스트 표시 (음수도 그대로 표시됨, 예: -0.5m)
-                    label = f"{status} {dist:.1f}m ({method})"
                     cv2.putText(frame, label, (x1, y1 - 10), 
                                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
                     
-                    if 0 <= foot_pt[0] < w and 0 <= foot_pt[1] < h:
+                    if foot_visible:
                         cv2.circle(frame, (int(foot_pt[0]), int(foot_pt[1])), 5, (0, 255, 255), -1)
 
+    DISTANCE_SECONDS.observe(time.perf_counter() - start)
+    for _, _, status in detected_objects:
+        PERSONS.labels(status).inc()
+    if any(status == "DANGER" for _, _, status in detected_objects):
+        DANGER_FRAMES.inc()
+
     return frame, detected_objects
\ No newline at end of file
@@ -1,16 +1,24 @@
 import time
 import os
+import sys
+import argparse
 import cv2
 import numpy as np
 import subprocess 
-from ultralytics import YOLO
+
+# 프로젝트 루트(src 패키지)를 경로에 추가 (이 파일을 직접 실행하는 경우)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from src.common.frame_slot import FrameSlot
+from src.common.overlay import text_size
+from src.common.http_stream import StatusServer, RateMeter, DEFAULT_PORT
+from src.common.stage_timer import stage_timer
 
 # Picamera2 로드
+# (draw_radar 등을 카메라 없이 벤치마크할 수 있도록 실제 사용 시점에 확인)
 try:
     from picamera2 import Picamera2
 except ImportError:
-    print("picamera2 라이브러리가 필요합니다.")
-    exit()
+    Picamera2 = None
 
 # ==========================================
 # [1] 설정: 상수 및 파라미터
@@ -45,6 +53,9 @@ def check_calibration():
         print("설정 파일 로드됨.")
 
 def init_camera():
+    if Picamera2 is None:
+        print("picamera2 라이브러리가 필요합니다.")
+        exit()
     print("📷 메인 시스템 카메라 초기화 (Wide View)...")
     picam2 = Picamera2()
     config = picam2.create_preview_configuration(main={"size": (1640, 1232), "format": "BGR888"})
@@ -156,16 +167,22 @@ def draw_bounding_box(frame, box, dist, status, color, method):
     
     # 2. 정보 표시
     label = f"{status} {dist:.1f}m ({method})"
-    (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.6, 1)
+    (w, h), _ = text_size(label, 0.6, 1)
     cv2.rectangle(frame, (x1, y1 - 20), (x1 + w, y1), color, -1)
     cv2.putText(frame, label, (x1, y1 - 5), 
                 cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
 
-def draw_radar(objects, width=400, height=400, current_alert="Safe"):
+# 레이더 정적 배경 / 출력 버퍼 캐시 ((width, height) 별)
+RADAR_MARKER_RADIUS = 10
+RADAR_PALETTE = [(0, 0, 255), (0, 165, 255), (0, 255, 0)] # DANGER, WARNING, Safe
+_radar_cache = {}
+
+def _render_radar_background(width, height):
+    """ 격자, 거리 라벨, 지게차 표시 등 변하지 않는 배경 (크기별 1회만 생성) """
     radar = np.zeros((height, width, 3), dtype=np.uint8)
     scale_z = height / 5.0
     cx = width // 2
-    
+
     # 격자
     for i in range(1, 6):
         y = height - int(i * scale_z)
@@ -173,16 +190,40 @@ def draw_radar(objects, width=400, height=400, current_alert="Safe"):
         if i == 2: col = (0, 0, 150)
         cv2.line(radar, (0, y), (width, y), col, 1)
         cv2.putText(radar, f"{i}m", (10, y-5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150,150,150))
-    
+
     cv2.circle(radar, (cx, height), 15, (255, 255, 255), -1) # 지게차
+    return radar
+
+def _get_radar_cache(width, height):
+    key = (width, height)
+    cache = _radar_cache.get(key)
+    if cache is None:
+        background = _render_radar_background(width, height)
+        cache = _radar_cache[key] = (background, np.empty_like(background))
+    return cache
+
+def draw_radar(objects, width=400, height=400, current_alert="Safe"):
+    """
+    레이더 화면 그리기. 정적 배경은 캐시에서 복사하고 객체 마커만 그림.
+    반환 이미지는 재사용 버퍼이므로 다음 호출 전에 표시/복사해야 함.
+    """
+    background, radar = _get_radar_cache(width, height)
+    np.copyto(radar, background)
+
+    scale_z = height / 5.0
+    cx = width // 2
     
-    # 객체 표시
-    for (x, z, status) in objects:
-        px = np.clip(int(cx + (x * (width / 4.0))), 0, width)
-        py = np.clip(int(height - (z * scale_z)), 0, height)
-        
-        _, color = get_status_info(z)
-        cv2.circle(radar, (px, py), 10, color, -1)
+    # 객체 표시: 좌표/색상은 한 번에 계산하고 마커만 그림
+    if objects:
+        xz = np.array([obj[:2] for obj in objects], dtype=np.float64)
+        z = xz[:, 1]
+        px = np.clip((cx + xz[:, 0] * (width / 4.0)).astype(np.intp), 0, width)
+        py = np.clip((height - z * scale_z).astype(np.intp), 0, height)
+        # get_status_info 와 같은 기준 (DANGER < 1.5m <= WARNING < 2.5m <= Safe)
+        level = (z >= 1.5).astype(np.intp) + (z >= 2.5)
+
+        for x, y, lv in zip(px.tolist(), py.tolist(), level.tolist()):
+            cv2.circle(radar, (x, y), RADAR_MARKER_RADIUS, RADAR_PALETTE[lv], -1)
 
     # 경고 테두리
     if current_alert == "DANGER":
@@ -196,15 +237,22 @@ def draw_radar(objects, width=400, height=400, current_alert="Safe"):
 # ==========================================
 # [모듈 3] 메인 실행 루프
 # ==========================================
-def run_system(picam2, H):
-    print("\n시스템 가동! (종료: q, 리셋: r)")
+def run_system(picam2, H, headless=False, server=None):
+    print("\n시스템 가동! (종료: q, 리셋: r)" if not headless else "\n시스템 가동! (헤드리스, 종료: Ctrl+C)")
+    from ultralytics import YOLO
     model = YOLO(MODEL_PATH) 
+    fps_meter = RateMeter()
 
     while True:
-        frame = picam2.capture_array()
+        # 모니터 출력 중이거나 스트림 접속자가 있을 때만 그리기
+        render = (not headless) or (server is not None and server.has_clients)
+
+        with stage_timer.stage("capture"):
+            frame = picam2.capture_array()
         h, w = frame.shape[:2]
 
-        results = model(frame, verbose=False, conf=0.5)
+        with stage_timer.stage("predict"):
+            results = model(frame, verbose=False, conf=0.5)
         detected_objects = []
         max_alert = "Safe"
 
@@ -224,7 +272,8 @@ def run_system(picam2, H):
                     
                     if foot_pt is not None:
                         # 3. 거리 계산
-                        real_x, dist, method = calculate_ensemble_distance(foot_pt, torso_len, h, H)
+                        with stage_timer.stage("distance"):
+                            real_x, dist, method = calculate_ensemble_distance(foot_pt, torso_len, h, H)
                         
                         # 4. 상태 판단
                         status, color = get_status_info(dist)
@@ -240,17 +289,36 @@ def run_system(picam2, H):
                         detected_objects.append((real_x, dist, status))
 
                         # 8. 메인 화면 시각화 (출력된 값 기반으로 그림)
+                        if not render:
+                            continue
                         draw_bounding_box(frame, (x1, y1, x2, y2), dist, status, color, method)
                         
                         # 발 위치 점 (옵션)
                         if 0 <= foot_pt[0] < w and 0 <= foot_pt[1] < h:
                             cv2.circle(frame, (int(foot_pt[0]), int(foot_pt[1])), 5, (0, 255, 255), -1)
 
+        stage_timer.frame("MOVING")
+        stage_timer.maybe_report()
+
+        fps = fps_meter.tick()
+        if server is not None:
+            server.update_status(
+                state="MOVING", fps=round(fps, 1), alert=max_alert,
+                distances=[{"x": float(x), "dist": float(d), "status": st} for x, d, st in detected_objects],
+            )
+            if render:
+                server.frame_slot.publish(frame)
+
+        if headless:
+            continue
+
         # 9. 레이더 시각화
-        radar_img = draw_radar(detected_objects, current_alert=max_alert)
+        with stage_timer.stage("radar"):
+            radar_img = draw_radar(detected_objects, current_alert=max_alert)
 
-        cv2.imshow('Main Camera', frame)
-        cv2.imshow('Radar View', radar_img)
+        with stage_timer.stage("display"):
+            cv2.imshow('Main Camera', frame)
+            cv2.imshow('Radar View', radar_img)
 
         key = cv2.waitKey(1) & 0xFF
         if key == ord('q'): return "EXIT"
@@ -268,15 +336,35 @@ def run_system(picam2, H):
 # 메인 진입점
 # ==========================================
 def main():
+    parser = argparse.ArgumentParser(description="Person distance estimation system")
+    parser.add_argument("--headless", action="store_true", help="cv2.imshow 없이 실행 (HTTP 스트림으로만 확인)")
+    parser.add_argument("--host", default="127.0.0.1", help="상태 서버 주소")
+    parser.add_argument("--port", type=int, default=None,
+                        help="상태 서버 포트 (기본: --headless 이면 8080, 화면 모드는 서버 끔 / 0: 서버 끔)")
+    parser.add_argument("--timing", action="store_true", help="단계별 지연(p50/p95/p99) 및 FPS 주기적 출력")
+    args = parser.parse_args()
+    stage_timer.enabled = stage_timer.enabled or args.timing
+    if args.port is None:
+        args.port = DEFAULT_PORT if args.headless else 0
+
     check_calibration()
     pixel_points = np.load(CONFIG_FILE)
     H = compute_homography(pixel_points)
     picam2 = init_camera()
+
+    server = None
+    if args.port:
+        server = StatusServer(FrameSlot(), host=args.host, port=args.port).start()
     
     try:
-        status = run_system(picam2, H)
+        status = run_system(picam2, H, headless=args.headless, server=server)
         if status == "EXIT": pass
+    except KeyboardInterrupt:
+        pass
     finally:
+        stage_timer.report(final=True)
+        if server is not None:
+            server.stop()
         picam2.stop()
         cv2.destroyAllWindows()
         print("프로그램 종료")
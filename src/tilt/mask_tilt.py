@@ -0,0 +1,67 @@
+"""
+YOLOE-seg 인스턴스 마스크로 바로 기울기를 구하는 분석기.
+
+박스 크롭에서 Otsu / Canny + Hough 로 가장자리를 다시 찾는 대신, 모델이 이미 계산한
+마스크 윤곽(폴리곤)의 방향을 사용함 -> 크롭, 리사이즈, 에지 검출이 모두 빠짐.
+
+  - "rect"   : cv2.minAreaRect 의 회전각 (기본, 사각형 화물에 안정적)
+  - "moments": 2차 중심 모멘트의 주축 방향 (정사각형에 가까우면 주축이 불안정하므로
+               종횡비가 MIN_ELONGATION 보다 작으면 rect 로 대체)
+
+각도는 analyze_tilt_hough 와 같은 기준 (수직에서 벗어난 정도의 절대값, 0~45도).
+"""
+import cv2
+import numpy as np
+
+from src.tilt.tilt_detection import classify_tilt
+
+# ==========================================
+# [설정]
+# ==========================================
+METHOD = "rect"          # "rect" 또는 "moments"
+MIN_POINTS = 3           # 폴리곤 최소 꼭짓점 수 (미만이면 마스크 없음으로 처리)
+MIN_ELONGATION = 1.2     # moments 방식에서 주축을 믿을 최소 고유값 비 (sqrt)
+
+
+def _fold(angle):
+    """ 임의의 각도(도) -> 가장 가까운 수직/수평 축과의 차이 (0~45) """
+    angle = abs(angle) % 90.0
+    return 90.0 - angle if angle > 45.0 else angle
+
+
+def polygon_angle(polygon, method=METHOD):
+    """ 마스크 폴리곤 (N, 2) 의 기울기(도). 꼭짓점이 부족하면 None """
+    pts = np.asarray(polygon, dtype=np.float32).reshape(-1, 2)
+    if len(pts) < MIN_POINTS:
+        return None
+
+    if method == "moments":
+        m = cv2.moments(pts)
+        if m["m00"] > 0:
+            mu20, mu02, mu11 = m["mu20"], m["mu02"], m["mu11"]
+            spread = np.hypot(mu20 - mu02, 2 * mu11)
+            major, minor = mu20 + mu02 + spread, mu20 + mu02 - spread
+            if minor > 0 and np.sqrt(major / minor) >= MIN_ELONGATION:
+                return _fold(np.degrees(0.5 * np.arctan2(2 * mu11, mu20 - mu02)))
+    elif method != "rect":
+        raise ValueError(f"지원하지 않는 방식: {method}")
+
+    return _fold(cv2.minAreaRect(pts)[-1])
+
+
+def mask_angles(masks, method=METHOD):
+    """ Results.masks (또는 폴리곤 리스트) -> 객체별 각도 리스트 (마스크가 비면 None) """
+    polygons = masks.xy if hasattr(masks, "xy") else masks
+    return [polygon_angle(p, method) for p in polygons]
+
+
+def analyze_tilt_mask(polygon, tilt_threshold=3.0, method=METHOD):
+    """
+    analyze_tilt_hough 와 같은 (status, color, angle) 반환.
+    마스크 하나에서는 각도가 하나뿐이라 흔들림(std) 판정은 하지 않음 (TiltTracker 가 프레임 간 누적).
+    """
+    angle = polygon_angle(polygon, method)
+    if angle is None:
+        return "NORMAL (No mask)", (0, 255, 0), 0.0
+    status, color = classify_tilt(angle, 0.0, tilt_threshold)
+    return status, color, angle
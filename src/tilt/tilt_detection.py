@@ -3,26 +3,144 @@ import numpy as np
 from PIL import Image
 from math import ceil
 
-def detect_pallet_tilt(image_input, mean_threshold=3.0, std_threshold=2.0):
+# ==========================================
+# [그래프] 각도 분포 히스토그램 (OpenCV 네이티브)
+# ==========================================
+HIST_BINS = 15
+HIST_RANGE = (0.0, 45.0)   # analyze_tilt_hough 가 사용하는 각도 범위
+
+class HistogramPanel:
+    """
+    기울기 각도 분포 그래프를 미리 할당한 이미지에 직접 그리는 패널.
+    (matplotlib figure -> PNG -> imdecode 과정 없이 np.histogram + cv2 도형만 사용)
+
+    - update(angles): 새 각도를 누적 (decay < 1 이면 이전 프레임 기여를 점점 줄임)
+    - render(): 막대, 평균선, ±표준편차 구간을 그린 이미지 반환 (매번 같은 버퍼 재사용)
+    """
+
+    BAR_COLOR = (235, 206, 135)    # skyblue (BGR)
+    BAND_COLOR = (215, 240, 215)   # 연한 초록 (±std)
+    MEAN_COLOR = (0, 0, 255)
+
+    def __init__(self, height=400, width=None, bins=HIST_BINS, angle_range=HIST_RANGE, decay=1.0):
+        self.height = height
+        self.width = width if width is not None else int(height * 5 / 4)
+        self.edges = np.linspace(angle_range[0], angle_range[1], bins + 1)
+        self.decay = decay
+        self.image = np.empty((self.height, self.width, 3), dtype=np.uint8)
+
+        # 그래프 영역 (여백: 제목/축 라벨)
+        self._left, self._right = 40, self.width - 15
+        self._top, self._bottom = 35, self.height - 35
+        self._background = self._render_background()
+        self.reset()
+
+    def reset(self):
+        self.counts = np.zeros(len(self.edges) - 1, dtype=np.float64)
+        self._n = 0.0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def update(self, angles):
+        angles = np.asarray(angles, dtype=np.float64)
+        if self.decay < 1.0:
+            self.counts *= self.decay
+            self._n *= self.decay
+            self._sum *= self.decay
+            self._sum_sq *= self.decay
+        if angles.size:
+            self.counts += np.histogram(angles, bins=self.edges)[0]
+            self._n += angles.size
+            self._sum += angles.sum()
+            self._sum_sq += np.dot(angles, angles)
+        return self
+
+    @property
+    def mean(self):
+        return self._sum / self._n if self._n > 0 else 0.0
+
+    @property
+    def std(self):
+        if self._n <= 0:
+            return 0.0
+        return float(np.sqrt(max(self._sum_sq / self._n - self.mean ** 2, 0.0)))
+
+    def _x(self, angle):
+        lo, hi = self.edges[0], self.edges[-1]
+        return int(self._left + (angle - lo) / (hi - lo) * (self._right - self._left))
+
+    def _render_background(self):
+        """ 제목, 축, 눈금 등 변하지 않는 부분 (1회만 생성) """
+        bg = np.full((self.height, self.width, 3), 255, dtype=np.uint8)
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        cv2.putText(bg, "Tilt Angle Distribution", (self._left, 22), font, 0.55, (0, 0, 0), 1, cv2.LINE_AA)
+        cv2.line(bg, (self._left, self._bottom), (self._right, self._bottom), (0, 0, 0), 1)
+        cv2.line(bg, (self._left, self._top), (self._left, self._bottom), (0, 0, 0), 1)
+        lo, hi = self.edges[0], self.edges[-1]
+        for tick in np.linspace(lo, hi, 4):
+            x = self._x(tick)
+            cv2.line(bg, (x, self._bottom), (x, self._bottom + 4), (0, 0, 0), 1)
+            cv2.putText(bg, f"{tick:.0f}", (x - 8, self._bottom + 18), font, 0.4, (0, 0, 0), 1, cv2.LINE_AA)
+        cv2.putText(bg, "Angle (deg)", ((self._left + self._right) // 2 - 40, self.height - 5),
+                    font, 0.45, (0, 0, 0), 1, cv2.LINE_AA)
+        return bg
+
+    def render(self):
+        img = self.image
+        np.copyto(img, self._background)
+        mean, std = self.mean, self.std
+        plot_h = self._bottom - self._top
+
+        if self._n > 0:
+            # ±std 구간
+            x0 = max(self._left + 1, self._x(mean - std))
+            x1 = min(self._right, self._x(mean + std))
+            if x1 > x0:
+                img[self._top:self._bottom, x0:x1] = self.BAND_COLOR
+
+            # 막대
+            peak = self.counts.max()
+            if peak > 0:
+                heights = (self.counts / peak * plot_h).astype(np.int64)
+                xs = [self._x(e) for e in self.edges]
+                for i, bar_h in enumerate(heights.tolist()):
+                    if bar_h <= 0:
+                        continue
+                    top = self._bottom - bar_h
+                    cv2.rectangle(img, (xs[i], top), (xs[i + 1], self._bottom), self.BAR_COLOR, -1)
+                    cv2.rectangle(img, (xs[i], top), (xs[i + 1], self._bottom), (0, 0, 0), 1)
+
+            # 평균 (점선)
+            xm = self._x(mean)
+            for y in range(self._top, self._bottom, 10):
+                cv2.line(img, (xm, y), (xm, min(y + 6, self._bottom)), self.MEAN_COLOR, 2)
+
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        cv2.putText(img, f"Mean: {mean:.2f}", (self._right - 110, self._top + 15), font, 0.45, self.MEAN_COLOR, 1, cv2.LINE_AA)
+        cv2.putText(img, f"Std: {std:.2f}", (self._right - 110, self._top + 33), font, 0.45, (0, 128, 0), 1, cv2.LINE_AA)
+        return img
+
+def detect_pallet_tilt(image_input, mean_threshold=3.0, std_threshold=2.0, height=400, panel=None):
     """
-    실시간용 빠른 기울기 계산 함수 (그래프 없음).
+    Hough 기울기 분석 + 각도 분포 그래프 생성 (디버그 화면용).
+    panel(HistogramPanel)을 넘기면 프레임 간 누적해서 갱신하므로 실시간으로 사용 가능.
+    반환: (status, color, angle, graph_img) - graph_img 는 panel 의 버퍼를 재사용
     """
-    fig, ax = plt.subplots(figsize=(5, 4))
-    ax.hist(data_list, bins=15, color='skyblue', edgecolor='black', alpha=0.7)
-    ax.axvline(mean_val, color='red', linestyle='dashed', linewidth=2, label=f'Mean: {mean_val:.2f}')
-    ax.axvspan(mean_val - std_val, mean_val + std_val, color='green', alpha=0.1, label=f'Std: {std_val:.2f}')
-    ax.set_title('Tilt Angle Distribution')
-    ax.set_xlabel('Angle (deg)')
-    ax.legend()
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-    buf.seek(0)
-    plot_img = cv2.imdecode(np.frombuffer(buf.getvalue(), dtype=np.uint8), 1)
-    plt.close(fig)
-    h_plot, w_plot = plot_img.shape[:2]
-    scale = height / h_plot
-    plot_img_resized = cv2.resize(plot_img, (int(w_plot * scale), height))
-    return plot_img_resized
+    image = _to_bgr(image_input)
+    if image is None or image.size == 0:
+        return "Error: Invalid Input", (0, 0, 0), 0.0, None
+
+    angles = extract_hough_angles(image)
+    if panel is None:
+        panel = HistogramPanel(height=height)
+    panel.update(angles)
+
+    if not angles:
+        status, color, angle = "NORMAL (No lines)", (0, 255, 0), 0.0
+    else:
+        angle = float(np.mean(angles))
+        status, color = classify_tilt(angle, float(np.std(angles)), mean_threshold, std_threshold)
+    return status, color, angle, panel.render()
 
 # 기울기 분석 함수
 def analyze_tilt_fast(roi_img, tilt_threshold=10):
@@ -46,34 +164,23 @@ def analyze_tilt_fast(roi_img, tilt_threshold=10):
 
     return "NORMAL", (0, 255, 0), angle
 
-def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
-    """
-    기존의 Hough Line 변환 방식을 사용하여 기울기를 정밀하게 분석합니다.
-    최신 코드 포맷에 맞춰 (status, color, angle) 3개의 값을 반환합니다.
-    """
-    
-    # 1. 입력 예외 처리 (반환값 3개 유지)
+def _to_bgr(roi_img):
+    """ 경로 / PIL / ndarray 입력을 BGR ndarray 로 변환 (지원하지 않으면 None) """
     if isinstance(roi_img, str):
-        image = cv2.imread(roi_img)
-    elif isinstance(roi_img, Image.Image):
-        image = np.array(roi_img)
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-    elif isinstance(roi_img, np.ndarray):
-        image = roi_img
-    else:
-        return "Error: Invalid Input", (0, 0, 0), 0.0
+        return cv2.imread(roi_img)
+    if isinstance(roi_img, Image.Image):
+        return cv2.cvtColor(np.array(roi_img), cv2.COLOR_RGB2BGR)
+    if isinstance(roi_img, np.ndarray):
+        return roi_img
+    return None
 
-    if image is None:
-        return "Error: Image None", (0, 0, 0), 0.0
-
-    # 2. 전처리 (Resize -> Canny)
-    target_height = 800
+def extract_hough_angles(image, target_height=800):
+    """
+    Canny + HoughLinesP 로 수직에 가까운 선들의 기울기(절대값, 도) 목록 반환.
+    가로선과 45도 이상인 선은 노이즈로 보고 제외.
+    """
+    # 전처리 (Resize -> Canny)
     h, w = image.shape[:2]
-    
-    # 이미지가 너무 작거나 비어있는 경우 방지
-    if h == 0 or w == 0:
-        return "Error: Empty Frame", (0, 0, 0), 0.0
-
     scale = target_height / h
     image_resized = cv2.resize(image, (int(w * scale), target_height))
     
@@ -81,7 +188,7 @@ def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
     blur = cv2.GaussianBlur(gray, (5, 5), 0)
     edges = cv2.Canny(blur, 50, 150)
 
-    # 3. 선 검출 (HoughLinesP)
+    # 선 검출 (HoughLinesP)
     lines = cv2.HoughLinesP(
         edges,
         rho=1,
@@ -94,8 +201,7 @@ def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
     angles = []
     
     if lines is not None:
-        for line in lines:
-            x1, y1, x2, y2 = line[0]
+        for x1, y1, x2, y2 in lines.reshape(-1, 4):
             dx = float(x2 - x1)
             dy = float(y2 - y1)
             
@@ -114,6 +220,42 @@ def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
                 
             angles.append(abs_angle)
 
+    return angles
+
+def classify_tilt(avg_angle, std_dev_angle, tilt_threshold=3.0, std_threshold=2.0):
+    """ 평균/표준편차로 (status, color) 판정 """
+    if avg_angle > tilt_threshold:
+        # 기울어짐 (빨강)
+        return "WARNING: TILTED", (0, 0, 255)
+    elif std_dev_angle > std_threshold:
+        # 흔들림/불안정 (주황)
+        return "WARNING: UNSTABLE", (0, 165, 255)
+    else:
+        # 정상 (초록)
+        return "NORMAL", (0, 255, 0)
+
+def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
+    """
+    기존의 Hough Line 변환 방식을 사용하여 기울기를 정밀하게 분석합니다.
+    최신 코드 포맷에 맞춰 (status, color, angle) 3개의 값을 반환합니다.
+    """
+    
+    # 1. 입력 예외 처리 (반환값 3개 유지)
+    if not isinstance(roi_img, (str, Image.Image, np.ndarray)):
+        return "Error: Invalid Input", (0, 0, 0), 0.0
+
+    image = _to_bgr(roi_img)
+    if image is None:
+        return "Error: Image None", (0, 0, 0), 0.0
+
+    # 이미지가 너무 작거나 비어있는 경우 방지
+    h, w = image.shape[:2]
+    if h == 0 or w == 0:
+        return "Error: Empty Frame", (0, 0, 0), 0.0
+
+    # 2~3. 전처리 + 선 검출
+    angles = extract_hough_angles(image)
+
     # 4. 결과 분석 및 반환 (항상 3개 값 반환)
     if not angles:
         # 선이 검출되지 않음 -> 정상으로 간주하거나 별도 처리
@@ -123,15 +265,5 @@ def analyze_tilt_hough(roi_img, tilt_threshold=3.0, std_threshold=2.0):
     std_dev_angle = np.std(angles)
 
     # 논리 판단
-    is_tilted = avg_angle > tilt_threshold
-    is_unstable = std_dev_angle > std_threshold
-
-    if is_tilted:
-        # 기울어짐 (빨강)
-        return "WARNING: TILTED", (0, 0, 255), avg_angle
-    elif is_unstable:
-        # 흔들림/불안정 (주황)
-        return "WARNING: UNSTABLE", (0, 165, 255), avg_angle
-    else:
-        # 정상 (초록)
-        return "NORMAL", (0, 255, 0), avg_angle
\ No newline at end of file
+    status, color = classify_tilt(avg_angle, std_dev_angle, tilt_threshold, std_threshold)
+    return status, color, avg_angle
@@ -0,0 +1,195 @@
+import numpy as np
+
+# ==========================================
+# [설정] 윈도우 / 변화 감지 파라미터
+# ==========================================
+WINDOW_SIZE = 256          # 객체별로 보관하는 최근 각도 개수 (고정 메모리)
+HIST_BIN_WIDTH = 0.25      # 중앙값/MAD 계산용 히스토그램 해상도 (도)
+ANGLE_RANGE = (0.0, 45.0)  # analyze_tilt_hough 각도 범위
+
+CUSUM_DRIFT = 0.5          # 허용 드리프트 (sigma 단위)
+CUSUM_THRESHOLD = 5.0      # 누적합이 이 값을 넘으면 변화로 판정 (sigma 단위)
+CUSUM_WARMUP = 5           # 기준값을 잡기 전 최소 프레임 수
+MIN_SIGMA = 0.5            # MAD 가 너무 작을 때 쓰는 최소 표준편차 (도)
+MAD_TO_SIGMA = 1.4826
+
+
+class AngleWindow:
+    """
+    최근 N개 각도를 담는 고정 크기 링버퍼.
+
+    - 평균/분산: 추가·제거 시 합/제곱합만 갱신 (값 1개당 O(1))
+    - 중앙값/MAD: 고정 구간 히스토그램에서 계산 (윈도우 크기와 무관하게 bin 수만큼)
+    """
+
+    def __init__(self, capacity=WINDOW_SIZE, bin_width=HIST_BIN_WIDTH, angle_range=ANGLE_RANGE):
+        self.capacity = capacity
+        self.values = np.zeros(capacity, dtype=np.float64)
+        self.lo, self.hi = angle_range
+        self.bin_width = bin_width
+        n_bins = int(np.ceil((self.hi - self.lo) / bin_width))
+        self.hist = np.zeros(n_bins, dtype=np.int64)
+        self._centers = self.lo + (np.arange(n_bins) + 0.5) * bin_width
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self._head = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._pushes = 0
+        self.hist[:] = 0
+
+    def __len__(self):
+        return self.count
+
+    def _bins(self, values):
+        idx = ((values - self.lo) / self.bin_width).astype(np.int64)
+        return np.clip(idx, 0, len(self.hist) - 1)
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        k = values.size
+        if k == 0:
+            return
+        if k > self.capacity:
+            values = values[-self.capacity:]
+            k = self.capacity
+
+        idx = (self._head + np.arange(k)) % self.capacity
+        # 덮어쓰는 위치 중 이미 값이 있던 곳 (가득 찼거나 한 바퀴 돈 위치)
+        evict = np.ones(k, dtype=bool) if self.count == self.capacity else idx < self._head
+        old = self.values[idx[evict]]
+        if old.size:
+            self._sum -= old.sum()
+            self._sum_sq -= np.dot(old, old)
+            np.subtract.at(self.hist, self._bins(old), 1)
+
+        self.values[idx] = values
+        self._sum += values.sum()
+        self._sum_sq += np.dot(values, values)
+        np.add.at(self.hist, self._bins(values), 1)
+
+        self._head = (self._head + k) % self.capacity
+        self.count = min(self.count + k, self.capacity)
+
+        # 부동소수 오차 누적 방지 (용량만큼 넣을 때마다 한 번 재계산)
+        self._pushes += k
+        if self._pushes >= self.capacity:
+            self._pushes = 0
+            current = self.window()
+            self._sum = current.sum()
+            self._sum_sq = np.dot(current, current)
+
+    def push(self, value):
+        self.extend((value,))
+
+    def window(self):
+        """ 현재 윈도우 값 (오래된 순서 무관) """
+        return self.values if self.count == self.capacity else self.values[:self.count]
+
+    @property
+    def mean(self):
+        return self._sum / self.count if self.count else 0.0
+
+    @property
+    def variance(self):
+        if not self.count:
+            return 0.0
+        return max(self._sum_sq / self.count - self.mean ** 2, 0.0)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+    def median(self):
+        """ 히스토그램 기반 중앙값 (bin 내부는 선형 보간) """
+        if not self.count:
+            return 0.0
+        cum = np.cumsum(self.hist)
+        half = self.count / 2.0
+        i = int(np.searchsorted(cum, half))
+        before = cum[i - 1] if i > 0 else 0
+        frac = (half - before) / self.hist[i] if self.hist[i] else 0.5
+        return float(self.lo + (i + frac) * self.bin_width)
+
+    def mad(self):
+        """ 중앙값 절대 편차 (bin 중심 기준 근사) """
+        if not self.count:
+            return 0.0
+        dev = np.abs(self._centers - self.median())
+        order = np.argsort(dev)
+        cum = np.cumsum(self.hist[order])
+        i = int(np.searchsorted(cum, self.count / 2.0))
+        return float(dev[order[i]])
+
+
+class ChangeDetector:
+    """
+    양방향 CUSUM 변화점 감지.
+    기준값(reference)과 sigma 로 정규화한 편차를 누적해, 한 방향으로 계속 벗어나면 신호.
+    """
+
+    def __init__(self, drift=CUSUM_DRIFT, threshold=CUSUM_THRESHOLD):
+        self.drift = drift
+        self.threshold = threshold
+        self.reset()
+
+    def reset(self):
+        self.pos = 0.0
+        self.neg = 0.0
+
+    def update(self, value, reference, sigma):
+        z = (value - reference) / max(sigma, 1e-9)
+        self.pos = max(0.0, self.pos + z - self.drift)
+        self.neg = max(0.0, self.neg - z - self.drift)
+        if self.pos > self.threshold or self.neg > self.threshold:
+            direction = 1 if self.pos > self.threshold else -1
+            self.reset()
+            return direction
+        return 0
+
+
+class TiltStats:
+    """
+    객체(트랙) 하나의 각도 통계.
+    프레임마다 update(angles) 로 그 프레임의 선 각도들을 넣으면,
+    윈도우 통계를 갱신하고 하중이 움직이기 시작했는지(변화점) 여부를 반환.
+    """
+
+    def __init__(self, capacity=WINDOW_SIZE, warmup=CUSUM_WARMUP):
+        self.window = AngleWindow(capacity)
+        self.detector = ChangeDetector()
+        self.warmup = warmup
+        self.frames = 0
+        self.last_shift = 0
+
+    def update(self, angles):
+        """ 변화 감지 시 +1(기울기 증가) / -1(감소), 아니면 0 """
+        angles = np.asarray(angles, dtype=np.float64)
+        if angles.size == 0:
+            return 0
+
+        shift = 0
+        if self.frames >= self.warmup:
+            reference = self.window.median()
+            sigma = max(MAD_TO_SIGMA * self.window.mad(), MIN_SIGMA)
+            shift = self.detector.update(float(np.median(angles)), reference, sigma)
+
+        if shift:
+            # 새 자세를 기준으로 다시 학습
+            self.window.clear()
+            self.frames = 0
+        self.window.extend(angles)
+        self.frames += 1
+        self.last_shift = shift
+        return shift
+
+    def summary(self):
+        return {
+            "n": len(self.window),
+            "mean": self.window.mean,
+            "std": self.window.std,
+            "median": self.window.median(),
+            "mad": self.window.mad(),
+        }
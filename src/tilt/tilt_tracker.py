@@ -0,0 +1,239 @@
+import numpy as np
+
+from src.tilt.tilt_detection import extract_hough_angles, classify_tilt
+from src.tilt.tilt_stats import TiltStats
+from src.tilt.mask_tilt import mask_angles
+from src.common.metrics import TILT_VERDICTS, TILT_ANALYSES
+
+# ==========================================
+# [설정] 트래킹 / 수렴 파라미터
+# ==========================================
+MATCH_IOU = 0.3        # 이전 프레임 박스와 같은 팔레트로 볼 최소 IoU
+MOVE_IOU = 0.85        # 수렴 후 기준 박스와의 IoU 가 이보다 낮으면 '이동'으로 보고 재분석
+MIN_SAMPLES = 20       # 수렴 판정에 필요한 최소 각도 개수
+MASK_MIN_SAMPLES = 5   # 마스크 모드 (프레임당 각도 1개) 의 최소 각도 개수
+MIN_FRAMES = 3         # 수렴 판정에 필요한 최소 분석 프레임 수
+CONVERGE_SEM = 0.5     # 평균 각도의 표준오차(도)가 이 값 이하일 때 수렴
+NO_LINE_FRAMES = 10    # 선이 계속 안 보이면 이 프레임 수 후 NORMAL (No lines) 로 수렴
+MAX_MISSED = 10        # 이 프레임 수 동안 매칭이 안 되면 트랙 삭제
+RECHECK_INTERVAL = 15  # 수렴한 트랙도 이 프레임마다 한 번씩 재분석 (하중 이동 감지용)
+SHIFT_HOLD_FRAMES = 10 # 하중 이동 감지 후 경고를 유지할 프레임 수
+SHIFT_STATUS = ("WARNING: SHIFTING", (0, 255, 255))
+
+# 크롭 기울기 분석 방식 -> Hough 리사이즈 높이. 발열/부하가 심할 때 governor 가 낮춤
+# (합성 팔레트 기준 800/400/240 오차 0.13/0.09/0.12°, 시간 약 8/3/1.5 ms.
+#  analyze_tilt_fast 는 0.5 ms 지만 오차 5° 이상이라 사용하지 않음)
+TILT_ANALYZERS = {"hough": 800, "hough-lite": 400, "hough-min": 240}
+
+
+def box_iou(boxes_a, boxes_b):
+    """ (N,4) x (M,4) xyxy 박스 IoU 행렬 """
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class RunningStats:
+    """ Welford 방식 누적 평균/분산 (값 묶음 단위로 병합) """
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size == 0:
+            return
+        n_b = values.size
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+
+    @property
+    def variance(self):
+        return self._m2 / self.n if self.n > 0 else 0.0
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+
+class PalletTrack:
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box
+        self.anchor_box = None   # 수렴 시점의 박스 (이동 판단 기준)
+        self.stats = RunningStats()
+        self.tilt_stats = TiltStats()  # 최근 각도 윈도우 + 변화점 감지
+        self.frames = 0          # 분석한 프레임 수
+        self.missed = 0
+        self.idle = 0            # 수렴 후 분석을 건너뛴 연속 프레임 수
+        self.shift_hold = 0      # 하중 이동 경고 남은 프레임 수
+        self.converged = False
+        self.verdict = ("NORMAL (No lines)", (0, 255, 0), 0.0)
+
+    def reset(self, keep_window=False):
+        self.anchor_box = None
+        self.stats = RunningStats()
+        if not keep_window:
+            self.tilt_stats = TiltStats()
+        self.frames = 0
+        self.idle = 0
+        self.converged = False
+
+
+class TiltTracker:
+    """
+    팔레트를 IoU 로 프레임 간 추적하면서 트랙별 각도를 누적해 판정하는 트래커.
+
+    - 트랙마다 Hough 선 각도를 Welford 통계로 누적 -> 프레임별 판정보다 안정적
+    - 판정이 충분히 수렴하면 박스가 움직이기 전까지 Hough 분석을 건너뜀
+      (RECHECK_INTERVAL 프레임마다 한 번은 재분석)
+    - 최근 각도 윈도우에서 변화점이 감지되면 절대값과 무관하게 SHIFTING 경고
+    - use_masks=True 이면 update() 에 넘긴 seg 마스크 폴리곤의 방향(mask_tilt)을 각도로 사용하고,
+      마스크가 비어 있는 박스만 Hough 로 분석
+    - analyzer (TILT_ANALYZERS) 는 실행 중에 바꿀 수 있음 (누적 통계는 유지)
+    - panel (HistogramPanel) 을 주면 프레임마다 분석한 각도를 누적 (기울기 디버그 그래프용)
+    """
+
+    def __init__(self, tilt_threshold=3.0, std_threshold=2.0, use_masks=False, analyzer="hough", panel=None):
+        self.tilt_threshold = tilt_threshold
+        self.std_threshold = std_threshold
+        self.use_masks = use_masks
+        self.analyzer = analyzer
+        self.panel = panel
+        self.min_samples = MASK_MIN_SAMPLES if use_masks else MIN_SAMPLES
+        self.tracks = []
+        self._next_id = 0
+        self.analyzed = 0   # 실제 Hough 분석 횟수 (통계용)
+        self.skipped = 0    # 수렴으로 건너뛴 횟수
+
+    def update(self, frame, boxes, masks=None):
+        """
+        frame 과 이번 프레임의 xyxy 박스들을 받아 박스 순서대로
+        (track_id, status, color, angle) 목록 반환.
+        masks: boxes 와 같은 순서의 Results.masks 또는 폴리곤 리스트 (use_masks=True 일 때 사용)
+        """
+        boxes = [tuple(int(v) for v in box) for box in boxes]
+        matches = self._match(boxes)
+        analyzed, skipped = self.analyzed, self.skipped
+        polygon_angles = mask_angles(masks) if self.use_masks and masks is not None else []
+        # 마스크가 박스보다 적으면 (seg 출력이 비었거나 잘림) 남는 박스는 Hough 로 분석 (zip 으로 잘리지 않도록)
+        polygon_angles = (list(polygon_angles) + [None] * len(boxes))[:len(boxes)]
+
+        results = []
+        frame_angles = []
+        for box, track, mask_angle in zip(boxes, matches, polygon_angles):
+            track.box = box
+            track.missed = 0
+            if track.shift_hold > 0:
+                track.shift_hold -= 1
+
+            if track.converged:
+                if box_iou([box], [track.anchor_box])[0, 0] >= MOVE_IOU:
+                    track.idle += 1
+                    if track.idle < RECHECK_INTERVAL:
+                        self.skipped += 1
+                        results.append((track.id,) + track.verdict)
+                        continue
+                    # 주기적 재확인 (수렴 상태는 유지)
+                    track.idle = 0
+                else:
+                    # 박스가 움직임 -> 누적 통계를 버리고 다시 분석
+                    track.reset()
+
+            if mask_angle is not None:
+                angles = [mask_angle]
+            else:
+                x1, y1, x2, y2 = box
+                crop = frame[max(y1, 0):y2, max(x1, 0):x2]
+                if crop.size == 0:
+                    results.append((track.id,) + track.verdict)
+                    continue
+                angles = extract_hough_angles(crop, TILT_ANALYZERS[self.analyzer])
+
+            self.analyzed += 1
+            frame_angles.extend(angles)
+            if track.tilt_stats.update(angles):
+                # 하중이 움직이기 시작함 -> 누적 판정을 새로 시작하고 경고 유지
+                track.reset(keep_window=True)
+                track.shift_hold = SHIFT_HOLD_FRAMES
+            track.stats.update(angles)
+            track.frames += 1
+            track.verdict = self._verdict(track)
+            if not track.converged and self._is_converged(track):
+                track.converged = True
+                track.anchor_box = box
+            results.append((track.id,) + track.verdict)
+
+        # 매칭되지 않은 트랙 정리
+        for track in self.tracks:
+            if track not in matches:
+                track.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= MAX_MISSED]
+        if self.panel is not None:
+            self.panel.update(frame_angles)
+
+        TILT_ANALYSES.labels("analyzed").inc(self.analyzed - analyzed)
+        TILT_ANALYSES.labels("skipped").inc(self.skipped - skipped)
+        for _, status, _, _ in results:
+            TILT_VERDICTS.labels(status).inc()
+        return results
+
+    def _match(self, boxes):
+        """ IoU 가 큰 순서대로 탐욕 매칭, 매칭 안 된 박스는 새 트랙 생성 """
+        matches = [None] * len(boxes)
+        if boxes and self.tracks:
+            iou = box_iou(boxes, [t.box for t in self.tracks])
+            order = np.dstack(np.unravel_index(np.argsort(-iou, axis=None), iou.shape))[0]
+            used_tracks = set()
+            for bi, ti in order:
+                if iou[bi, ti] < MATCH_IOU:
+                    break
+                if matches[bi] is not None or ti in used_tracks:
+                    continue
+                matches[bi] = self.tracks[ti]
+                used_tracks.add(ti)
+
+        for i, box in enumerate(boxes):
+            if matches[i] is None:
+                track = PalletTrack(self._next_id, box)
+                self._next_id += 1
+                self.tracks.append(track)
+                matches[i] = track
+        return matches
+
+    def _verdict(self, track):
+        stats = track.stats
+        if track.shift_hold > 0:
+            return SHIFT_STATUS + (stats.mean,)
+        if stats.n == 0:
+            return ("NORMAL (No lines)", (0, 255, 0), 0.0)
+        status, color = classify_tilt(stats.mean, stats.std, self.tilt_threshold, self.std_threshold)
+        return (status, color, stats.mean)
+
+    def _is_converged(self, track):
+        stats = track.stats
+        if track.shift_hold > 0:
+            return False
+        if stats.n == 0:
+            return track.frames >= NO_LINE_FRAMES
+        if stats.n < self.min_samples or track.frames < MIN_FRAMES:
+            return False
+        sem = stats.std / np.sqrt(stats.n)
+        # 평균이 임계값 근처에서 흔들리는 경우는 수렴으로 보지 않음
+        return sem <= CONVERGE_SEM and abs(stats.mean - self.tilt_threshold) > 2 * sem